@@ -66,13 +66,14 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     # Third-party apps
-    "django_cotton",
+    "django_cotton.apps.SimpleAppConfig",  # loaders/builtins are set in TEMPLATES below
     "import_export",
     # "rest_framework",
     # Local apps
     "core.apps.CoreConfig",
     "users.apps.UsersConfig",
     "profiles.apps.ProfilesConfig",
+    "tasks.apps.TasksConfig",
 ]
 
 if DEBUG:
@@ -113,6 +114,30 @@ except Exception:
 # Use our custom user model (added below)
 AUTH_USER_MODEL = "users.User"
 
+# Opt-in: serve request.user from the shared cache instead of one SELECT per request
+# (users.backends.CachedModelBackend). Switching it on or off logs everyone out once.
+# Needs the shared cache (CACHE_URL): with the per-process default, other workers keep
+# a changed or deactivated user until USERS_CACHE_USER_TIMEOUT (check users.W001).
+USERS_CACHE_AUTH_USER = os.getenv("USERS_CACHE_AUTH_USER", "0") == "1"
+USERS_CACHE_USER_TIMEOUT = int(os.getenv("USERS_CACHE_USER_TIMEOUT", "300"))
+USERS_CACHE_PROFILE = os.getenv("USERS_CACHE_PROFILE", "1") == "1"  # cache user.profile too
+# Opt-in: share permission sets across requests and workers (users.backends
+# .PermissionCacheBackend) instead of rebuilding them from the auth tables on every
+# request. Revocations are seen through a counter in the default cache, so this needs
+# the shared cache (CACHE_URL): with the per-process default, a group or permission
+# removed in one worker stays granted in the others for USERS_CACHE_PERMS_TIMEOUT
+# (check users.W002).
+USERS_CACHE_PERMS = os.getenv("USERS_CACHE_PERMS", "0") == "1"
+USERS_CACHE_PERMS_TIMEOUT = int(os.getenv("USERS_CACHE_PERMS_TIMEOUT", "3600"))
+# Sessions store the path of the backend that logged them in: changing the backend
+# below (either option above) logs out every existing session.
+if USERS_CACHE_AUTH_USER:
+    AUTHENTICATION_BACKENDS = ["users.backends.CachedModelBackend"]
+elif USERS_CACHE_PERMS:
+    AUTHENTICATION_BACKENDS = ["users.backends.PermissionCacheBackend"]
+else:
+    AUTHENTICATION_BACKENDS = ["django.contrib.auth.backends.ModelBackend"]
+
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
@@ -129,6 +154,27 @@ if DEBUG:
 
 ROOT_URLCONF = "config.urls"
 
+# Production: wrap the loaders in Django's cached loader, so templates (and cotton
+# components) are read and compiled once per process instead of on every render.
+# TEMPLATES_WARM_ON_BOOT compiles them all when a worker starts (core.warmup), so
+# the first requests don't pay for it. Dev keeps uncached loaders (edits show up).
+TEMPLATES_CACHED = os.getenv("TEMPLATES_CACHED", "0" if DEBUG else "1") == "1"
+TEMPLATES_WARM_ON_BOOT = os.getenv("TEMPLATES_WARM_ON_BOOT", "1") == "1"
+
+# Cotton components compiled once per deploy, not once per worker (core.cotton_cache).
+# Entries are executed as templates, so point it at a private directory owned by the
+# app user (outside the source tree and shared tmp dirs), shared by the workers to
+# compile once per host. Empty (the default) keeps compiled components in memory.
+COTTON_COMPILE_CACHE_DIR = os.getenv("COTTON_COMPILE_CACHE_DIR", "")
+
+_TEMPLATE_LOADERS = [
+    "core.cotton_cache.Loader",  # <- must be first (cotton loader + on-disk cache)
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+if TEMPLATES_CACHED:
+    _TEMPLATE_LOADERS = [("django.template.loaders.cached.Loader", _TEMPLATE_LOADERS)]
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -138,11 +184,8 @@ TEMPLATES = [
         ],
         "APP_DIRS": False,  # <- use loaders explicitly
         "OPTIONS": {
-            "loaders": [
-                "django_cotton.cotton_loader.Loader",  # <- must be first
-                "django.template.loaders.filesystem.Loader",
-                "django.template.loaders.app_directories.Loader",
-            ],
+            "loaders": _TEMPLATE_LOADERS,
+            "builtins": ["django_cotton.templatetags.cotton"],
             "context_processors": [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
@@ -154,17 +197,6 @@ TEMPLATES = [
 ]
 
 
-# Only in production
-# Wrap loaders with Django’s cached loader in prod to speed up template lookups:
-# "loaders": [(
-#     "django.template.loaders.cached.Loader",
-#     [
-#         "django_cotton.cotton_loader.Loader",
-#         "django.template.loaders.filesystem.Loader",
-#         "django.template.loaders.app_directories.Loader",
-#     ],
-# )],
-
 WSGI_APPLICATION = "config.wsgi.application"
 
 
@@ -233,6 +265,12 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / "staticfiles"  # for collectstatic in prod
 
+# {% icon %} as <use> references into one cached SVG sprite instead of inline SVG.
+# Build it with `manage.py build_icon_sprite` after collectstatic (it writes into
+# STATIC_ROOT, not the source tree); icons are inlined as before until the sprite
+# exists. See core.icons.
+ICONS_SPRITE = os.getenv("ICONS_SPRITE", "0") == "1"
+
 try:
     if SITE_ORIGIN:
         _host = urlparse(SITE_ORIGIN).netloc.split(":")[0]
@@ -248,6 +286,46 @@ except Exception:
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+# --- Cache -----------------------------------------------------------------
+# Throttle counters (users.throttle) must be shared by every app process, so
+# production should point CACHE_URL at Redis (redis://host:6379/1, needs the `redis`
+# package). Without it each process keeps its own in-memory cache (fine for dev).
+CACHE_URL = os.getenv("CACHE_URL", "")
+if CACHE_URL.startswith(("redis://", "rediss://", "unix://")):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": "langcon",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "langcon",
+        }
+    }
+
+
+# Layout fragments ({% cachefragment %}: navbar, footer) per role + active view.
+# Bump FRAGMENT_CACHE_VERSION (e.g. the release tag) on every deploy so changed
+# templates are not served from the cache. 0 = off (dev default).
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv("FRAGMENT_CACHE_TIMEOUT", "0" if DEBUG else "3600"))
+FRAGMENT_CACHE_VERSION = os.getenv("DEPLOY_VERSION", "")
+
+
+# --- Sessions ----------------------------------------------------------------
+# SESSION_CACHED_DB=1: read sessions from the cache and write through to the DB
+# (django's cached_db engine), so authenticated requests stop reading django_session.
+# Needs the shared cache (CACHE_URL) once more than one process serves requests.
+# Expired rows: run `manage.py clear_expired_sessions` (batched) instead of
+# `clearsessions`.
+SESSION_CACHED_DB = os.getenv("SESSION_CACHED_DB", "0") == "1"
+if SESSION_CACHED_DB:
+    SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
+
 # --- Email (dev vs prod) ----------------------------------------------------
 # Dev: write emails to files (e.g., for password reset testing)
 # Prod: switch to SMTP via environment variables
@@ -261,6 +339,13 @@ PASSWORD_RESET_TIMEOUT = int(timedelta(hours=24).total_seconds())
 
 TEACHER_ADMIN_FULL_PERMS = True
 
+# Messages sent per connection session by core.mail.BatchMailer (bulk invites/welcomes).
+# Keep below your provider's per-connection message limit.
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "100"))
+# Provider quotas for bulk sends (send_set_password_bulk); 0 = unlimited.
+EMAIL_RATE_PER_SECOND = float(os.getenv("EMAIL_RATE_PER_SECOND", "10"))
+EMAIL_RATE_PER_HOUR = float(os.getenv("EMAIL_RATE_PER_HOUR", "0"))
+
 if ENV == "dev":
     EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.filebased.EmailBackend")
     # Let .env override the default tmp_emails path:
@@ -290,6 +375,47 @@ USERS_ROLE_REDIRECTS = {
 
 LOGOUT_REDIRECT_URL = None
 
+# --- Users: login / password-reset throttling (users.throttle) ----------------
+# name -> (attempts, window in seconds). Login counts failures only; password reset
+# counts every submission. Reaching a limit locks that IP/account for
+# USERS_THROTTLE_LOCKOUT seconds, doubling on each repeat up to the max.
+USERS_THROTTLE = {
+    "login_ip": (30, 300),
+    "login_account": (5, 900),
+    "reset_ip": (10, 3600),
+    "reset_account": (3, 3600),
+}
+USERS_THROTTLE_LOCKOUT = int(os.getenv("USERS_THROTTLE_LOCKOUT", "60"))
+USERS_THROTTLE_LOCKOUT_MAX = int(os.getenv("USERS_THROTTLE_LOCKOUT_MAX", "86400"))
+# Behind a reverse proxy, the request.META key holding the real client IP
+# (e.g. "HTTP_X_REAL_IP"); empty = REMOTE_ADDR. Only set it if the proxy overwrites it.
+USERS_THROTTLE_IP_HEADER = os.getenv("USERS_THROTTLE_IP_HEADER", "")
+
+# --- Users: deferred last_login writes (users.last_login) ---------------------
+# Buffer login timestamps and write them with one bulk UPDATE per batch, at most
+# FLUSH_SECONDS late (and on exit) instead of one UPDATE per login.
+USERS_DEFER_LAST_LOGIN = os.getenv("USERS_DEFER_LAST_LOGIN", "0") == "1"
+USERS_LAST_LOGIN_FLUSH_SECONDS = int(os.getenv("USERS_LAST_LOGIN_FLUSH_SECONDS", "30"))
+USERS_LAST_LOGIN_BATCH = int(os.getenv("USERS_LAST_LOGIN_BATCH", "500"))
+
+# --- Users: bulk provisioning ------------------------------------------------
+# Worker processes used to hash passwords during admin CSV imports (UserResource).
+# 0/1 = hash inline. `seed_students --bulk` takes its own --workers option.
+USERS_HASH_WORKERS = int(os.getenv("USERS_HASH_WORKERS", "0"))
+# Let an admin import's 'password' column set the password of the student
+# accounts it creates (never of existing or staff accounts). Off by default.
+USERS_IMPORT_PASSWORDS = os.getenv("USERS_IMPORT_PASSWORDS", "0") == "1"
+
+# --- Background tasks (tasks app) ---------------------------------------------
+# Slow side effects (invite emails, ...) are queued in the DB and processed by
+# `manage.py run_worker`. Eager mode runs them in-process after commit instead,
+# so dev needs no worker; production should leave it off and run a worker.
+TASKS_EAGER = os.getenv("TASKS_EAGER", "1" if ENV == "dev" else "0") == "1"
+TASKS_MAX_ATTEMPTS = int(os.getenv("TASKS_MAX_ATTEMPTS", "5"))
+TASKS_RETRY_BACKOFF = int(os.getenv("TASKS_RETRY_BACKOFF", "30"))  # seconds, doubles per retry
+TASKS_RETRY_BACKOFF_MAX = int(os.getenv("TASKS_RETRY_BACKOFF_MAX", "3600"))
+TASKS_LOCK_TIMEOUT = int(os.getenv("TASKS_LOCK_TIMEOUT", "600"))  # reclaim after a dead worker
+
 # --- django-import-export ----------------------------------------------------
 IMPORT_EXPORT_USE_TRANSACTIONS = True
 IMPORT_EXPORT_SKIP_ADMIN_LOG = False
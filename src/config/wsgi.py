@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# Compile templates now rather than on this worker's first requests (core.warmup)
+from core.warmup import warm_on_boot  # noqa: E402
+
+warm_on_boot()
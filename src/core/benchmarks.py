@@ -0,0 +1,188 @@
+# src/core/benchmarks.py
+#
+# Tiny benchmark registry for `manage.py benchmark`.
+#
+# Apps declare benchmarks in `<app>/benchmarks.py` (discovered by the command).
+# A benchmark does its setup and returns {variant label: zero-arg callable}; the
+# runner times each callable `number` times and reports operations per second,
+# so variants (e.g. "per message" vs "compiled once") are compared side by side.
+#
+# A callable that processes many items per call (e.g. "send 1k emails") returns
+# the item count, and the rate is reported per item. A benchmark that needs
+# teardown (a server, a rolled-back transaction) yields the dict instead of
+# returning it. Pass warmup=False for benchmarks too slow to run twice.
+#
+#     from core.benchmarks import benchmark
+#
+#     @benchmark("email.invite", "Render invite emails")
+#     def invite_render():
+#         compiled = compile_invite(...)
+#         return {"compiled": lambda: compiled.message(user)}
+
+from collections.abc import Callable
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+import inspect
+import time
+
+_registry: dict[str, "Benchmark"] = {}
+
+
+@dataclass
+class Benchmark:
+    name: str
+    description: str
+    setup: Callable[[], dict[str, Callable[[], object]]]
+    warmup: bool = True
+
+
+@dataclass
+class Result:
+    benchmark: str
+    variant: str
+    number: int
+    seconds: float
+    items: int | None = None  # per-item rate when the callable reports a count
+
+    @property
+    def per_second(self) -> float:
+        count = self.items if self.items is not None else self.number
+        return count / self.seconds if self.seconds else float("inf")
+
+
+def benchmark(name: str, description: str = "", *, warmup: bool = True):
+    def decorator(setup):
+        description_ = description or (setup.__doc__ or "").strip()
+        _registry[name] = Benchmark(name, description_, setup, warmup)
+        return setup
+
+    return decorator
+
+
+def registry() -> dict[str, Benchmark]:
+    return dict(sorted(_registry.items()))
+
+
+def run(bench: Benchmark, number: int, variants: list[str] | None = None) -> list[Result]:
+    """Run every variant (or those whose label contains one of `variants`)."""
+    if inspect.isgeneratorfunction(bench.setup):
+        scope = contextmanager(bench.setup)()
+    else:
+        scope = nullcontext(bench.setup())
+
+    results = []
+    with scope as funcs:
+        for variant, func in funcs.items():
+            if variants and not any(v in variant for v in variants):
+                continue
+            if bench.warmup:
+                func()  # warm-up: imports, template loading, first-call caches
+            items = None
+            started = time.perf_counter()
+            for _ in range(number):
+                count = func()
+                if isinstance(count, int):
+                    items = (items or 0) + count
+            seconds = time.perf_counter() - started
+            results.append(Result(bench.name, variant, number, seconds, items))
+    return results
+
+
+# --- core benchmarks ----------------------------------------------------------
+
+# A page's worth of {% icon %} calls (navbar + footer + a landing page)
+PAGE_ICONS = [
+    ("home", "h-5 w-5 align-middle shrink-0", None),
+    ("dashboard", "h-5 w-5 align-middle shrink-0", None),
+    ("assignment_ind", "h-5 w-5 align-middle shrink-0", None),
+    ("admin", "h-5 w-5 align-middle shrink-0", None),
+    ("user_plus", "h-5 w-5 align-middle shrink-0", None),
+    ("info", "h-5 w-5 align-middle shrink-0", None),
+    ("login", "h-5 w-5 align-middle shrink-0", None),
+    ("logout", "h-5 w-5 align-middle shrink-0", None),
+    ("menu", "h-5 w-5", "Toggle navigation"),
+    ("light_mode", "h-4 w-4", None),
+    ("dark_mode", "h-4 w-4", None),
+    ("computer", "h-4 w-4", None),
+    ("light_mode", "h-5 w-5", None),
+    ("dark_mode", "h-5 w-5", None),
+    ("school", "h-7 w-7 text-foreground/80", None),
+    ("person_alert", "h-7 w-7 text-foreground/80", None),
+    ("verified_user", "h-5 w-5 align-middle shrink-0", None),
+    ("arrow_right", "h-5 w-5 relative right-0 transition-all group-hover:-right-1", None),
+    ("info", "h-4 w-4", None),
+    ("login", "h-4 w-4", None),
+]
+
+
+@benchmark("icons.page", f"Render the {len(PAGE_ICONS)} icons of a typical page")
+def icons_page():
+    from uuid import uuid4
+
+    from django.template.loader import get_template, TemplateDoesNotExist
+
+    from core.icons import ICON_SEARCH_ORDER, registry
+
+    def loader_per_call():
+        # The {% icon %} implementation before core.icons
+        for name, class_, label in PAGE_ICONS:
+            for prefix in ICON_SEARCH_ORDER:
+                try:
+                    tpl = get_template(f"{prefix}/{name}.html")
+                    break
+                except TemplateDoesNotExist:
+                    continue
+            else:
+                continue
+            tpl.render(
+                {
+                    "class": class_,
+                    "label": label,
+                    "title_id": f"icon-{name}-{uuid4().hex[:6]}",
+                    "stroke_width": 2,
+                    "fill": None,
+                }
+            )
+
+    def compiled_registry():
+        for name, class_, label in PAGE_ICONS:
+            registry.render(name, class_, label)
+
+    return {"get_template + render per icon": loader_per_call, "icon registry": compiled_registry}
+
+
+@benchmark("cotton.cold_start", "Load every cotton component in a fresh template engine")
+def cotton_cold_start():
+    import tempfile
+
+    from django.template import Engine, engines
+
+    from core.warmup import template_names
+
+    main = engines["django"].engine
+    names = [n for n in template_names(app_dirs=False) if n.startswith("cotton/")]
+
+    def new_engine(loader):
+        # What a new worker starts with: no compiled templates in memory
+        return Engine(
+            dirs=main.dirs,
+            loaders=[loader],
+            libraries=main.libraries,
+            builtins=[b for b in main.builtins if b not in Engine.default_builtins],
+        )
+
+    def load_all(engine):
+        for name in names:
+            engine.get_template(name)
+        return len(names)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        load_all(new_engine(("core.cotton_cache.Loader", None, cache_dir)))  # fill the cache
+        yield {
+            "compile from source": lambda: load_all(
+                new_engine("django_cotton.cotton_loader.Loader")
+            ),
+            "on-disk compile cache": lambda: load_all(
+                new_engine(("core.cotton_cache.Loader", None, cache_dir))
+            ),
+        }
@@ -0,0 +1,113 @@
+# src/core/cotton_cache.py
+#
+# Persistent compile cache for cotton components (COTTON_COMPILE_CACHE_DIR).
+#
+# The cotton loader rewrites <c-...> syntax into Django template code every time a
+# new process loads a component: its own cache lives in memory only, so each worker
+# (and every restart or autoscaled instance) compiles templates/cotton/** from
+# source again. This loader keeps the compiled output on disk instead:
+#   - entries are keyed by a hash of the source text and the django-cotton version,
+#     so an edited component (or a cotton upgrade) just misses and is recompiled;
+#     nothing needs invalidating and stale entries are harmless;
+#   - files are written to a temp name and renamed, so workers sharing the
+#     directory never read a partial entry;
+#   - templates without cotton syntax are returned as is and never stored.
+# Workers read entries as they load templates; with TEMPLATES_WARM_ON_BOOT
+# (core.warmup) that is all of them at startup. Running `manage.py warm_templates`
+# at deploy time fills the directory before the first worker boots.
+#
+# Entries are executed as template code, so the directory must be private: it is
+# created with mode 0700, and one that is not owned by this process's user, or is
+# group/world-writable, is not used at all (a warning is logged and cotton compiles
+# in memory). Anyone else who can write there could plant templates.
+#
+# An empty COTTON_COMPILE_CACHE_DIR (the default) keeps cotton's in-memory
+# behaviour. The directory can be deleted at any time.
+
+import hashlib
+from importlib.metadata import version
+import logging
+import os
+from pathlib import Path
+import stat
+import tempfile
+
+from django.conf import settings
+from django_cotton.cotton_loader import Loader as CottonLoader
+
+logger = logging.getLogger(__name__)
+
+COMPILER_VERSION = version("django-cotton")
+
+
+def _needs_compile(source: str) -> bool:
+    # Same test the cotton loader uses before running its compiler
+    return "<c-" in source or "{% cotton_verbatim" in source
+
+
+def entry_key(source: str) -> str:
+    return hashlib.sha256(f"{COMPILER_VERSION}\x00{source}".encode()).hexdigest()
+
+
+def private_dir(path: Path) -> bool:
+    """Create `path` (mode 0700) if missing; True if only this process's user can write to it."""
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = path.stat()
+    except OSError as exc:
+        logger.warning("Cotton compile cache unavailable (%s): %s", path, exc)
+        return False
+    if not stat.S_ISDIR(st.st_mode):
+        reason = "not a directory"
+    elif hasattr(os, "getuid") and st.st_uid != os.getuid():
+        reason = "not owned by this user"
+    elif st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        reason = "group or world writable"
+    else:
+        return True
+    logger.warning("Cotton compile cache disabled, %s is %s", path, reason)
+    return False
+
+
+class Loader(CottonLoader):
+    """django_cotton's loader, with compiled output kept in COTTON_COMPILE_CACHE_DIR."""
+
+    def __init__(self, engine, dirs=None, cache_dir=None):
+        super().__init__(engine, dirs)
+        cache_dir = cache_dir or getattr(settings, "COTTON_COMPILE_CACHE_DIR", "")
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._checked = False  # ownership/permissions verified on first use
+
+    def get_contents(self, origin):
+        if self.cache_dir is not None and not self._checked:
+            self._checked = True
+            if not private_dir(self.cache_dir):
+                self.cache_dir = None
+        if self.cache_dir is None:
+            return super().get_contents(origin)
+
+        source = self._get_template_string(origin.name)
+        if not _needs_compile(source):
+            return source
+
+        path = self.cache_dir / f"{entry_key(source)}.html"
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            pass
+
+        compiled = self.cotton_compiler.process(source)
+        self._store(path, compiled)
+        return compiled
+
+    def _store(self, path: Path, compiled: str) -> None:
+        if not path.parent.is_dir() and not private_dir(path.parent):
+            return  # deleted while running: recreated (privately) or not persisted
+        try:
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(compiled)
+            os.replace(tmp, path)
+        except OSError as exc:
+            # e.g. read-only filesystem: serve the compiled template, just don't persist it
+            logger.warning("Cotton compile cache not writable (%s): %s", path.parent, exc)
@@ -0,0 +1,177 @@
+# src/core/icons.py
+#
+# Icon registry behind the {% icon %} tag (core.templatetags.icons).
+#
+# Icons are small SVG templates in core/icons/<name>.html. Going through
+# get_template() for each {% icon %} walks the whole loader chain (cotton loader
+# first), and every call re-renders the template. Pages use dozens of icons, almost
+# always with the same few argument combinations, so the registry:
+#   - scans the icon folders once and compiles every icon up front;
+#   - memoizes the rendered SVG per (name, class, label, stroke_width, fill) in an
+#     LRU cache of ICON_CACHE_SIZE entries;
+#   - for labelled icons, renders a placeholder title id and swaps in a fresh unique
+#     id per call (aria-labelledby must not repeat on a page). Decorative icons need
+#     no id and are returned as is.
+#
+# Sprite mode (ICONS_SPRITE=1): `manage.py build_icon_sprite` compiles every icon
+# body into one content-hashed static file (core/icons/sprite.<hash>.svg, safe to
+# cache forever) plus a small manifest, written to STATIC_ROOT by default (found
+# there, or through the staticfiles finders). The tag then emits only the icon's root
+# <svg> element (class, aria attributes, stroke/fill, and <title> when labelled)
+# around `<use href="...sprite...svg#icon-<name>">`, so each page ships a few
+# dozen bytes per icon and the path data is downloaded once. Presentation
+# attributes on the outer <svg> inherit into the symbol, so class/stroke_width/fill
+# still apply. Icons missing from the manifest (or no manifest at all) are inlined
+# as before. External <use> references must be same-origin: serve static files
+# from the site's own origin when sprite mode is on.
+#
+# The registry is rebuilt when TEMPLATES/ICONS_SPRITE/static settings change
+# (override_settings) and, under runserver, when a template file changes.
+
+from functools import lru_cache
+import hashlib
+import json
+from pathlib import Path
+import re
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+from django.templatetags.static import static
+from django.utils.autoreload import file_changed
+
+# Folders searched for <name>.html, first match wins
+ICON_SEARCH_ORDER = ("core/icons",)
+ICON_CACHE_SIZE = 512
+
+TITLE_ID = "ICONTITLEIDX"  # placeholder, replaced per call
+
+# Static paths of the built sprite (see build_icon_sprite)
+SPRITE_DIR = "core/icons"
+SPRITE_MANIFEST = f"{SPRITE_DIR}/sprite.json"
+
+_SVG = re.compile(r"^\s*(<svg\b[^>]*>)(.*)</svg>\s*$", re.DOTALL)
+_TITLE = re.compile(r"<title\b.*?</title>", re.DOTALL)
+_VIEWBOX = re.compile(r'\bviewBox="([^"]+)"')
+
+
+def split_svg(html: str) -> tuple[str, str] | None:
+    """(root <svg ...> open tag, body) of a rendered icon, or None if it is not one."""
+    match = _SVG.match(html)
+    return (match.group(1), match.group(2)) if match else None
+
+
+class IconRegistry:
+    def __init__(self, search_order=ICON_SEARCH_ORDER, maxsize: int = ICON_CACHE_SIZE):
+        self.search_order = search_order
+        self._templates = None
+        self._sprite = None
+        self._rendered = lru_cache(maxsize=maxsize)(self._render_uncached)
+
+    def templates(self) -> dict:
+        """name -> compiled template, scanned once."""
+        if self._templates is None:
+            self._templates = self._scan()
+        return self._templates
+
+    def _scan(self) -> dict:
+        backend = engines["django"]
+        dirs = [*backend.engine.dirs, *get_app_template_dirs("templates")]
+        found = {}
+        for prefix in self.search_order:
+            for base in dirs:
+                for path in sorted(Path(base, prefix).glob("*.html")):
+                    found.setdefault(path.stem, f"{prefix}/{path.name}")
+        return {name: backend.get_template(tpl) for name, tpl in found.items()}
+
+    def sprite(self) -> tuple[str, frozenset] | None:
+        """(sprite URL, icon names) when sprite mode is on and the sprite is built."""
+        if self._sprite is None:
+            self._sprite = (None,)
+            manifest = getattr(settings, "ICONS_SPRITE", False) and _find_static(SPRITE_MANIFEST)
+            if manifest:
+                data = json.loads(Path(manifest).read_text())
+                self._sprite = (static(data["file"]), frozenset(data["icons"]))
+        return None if self._sprite == (None,) else self._sprite
+
+    def _render_uncached(self, name, class_, label, stroke_width, fill) -> str:
+        template = self.templates().get(name)
+        if template is None:
+            # fail softly; empty span placeholder
+            return f"<span class='{class_}' aria-hidden='true'></span>"
+        html = template.render(
+            {
+                "class": class_,
+                "label": label,
+                "title_id": TITLE_ID if label else "",
+                "stroke_width": stroke_width,
+                "fill": fill,
+            }
+        )
+        sprite = self.sprite()
+        parts = split_svg(html) if sprite and name in sprite[1] else None
+        if parts is None:
+            return html
+        open_tag, body = parts
+        title = _TITLE.search(body)
+        title = title.group(0) if title else ""
+        return f'{open_tag}{title}<use href="{sprite[0]}#icon-{name}"></use></svg>'
+
+    def render(self, name, class_="h-5 w-5", label=None, stroke_width=2, fill=None) -> str:
+        html = self._rendered(name, class_, label, stroke_width, fill)
+        if label:
+            html = html.replace(TITLE_ID, f"icon-{name}-{uuid4().hex[:6]}")
+        return html
+
+    def clear(self) -> None:
+        self._templates = None
+        self._sprite = None
+        self._rendered.cache_clear()
+
+    def build_sprite(self) -> tuple[str, list[str]]:
+        """(sprite SVG document, icon names in it); icons that don't parse are skipped."""
+        symbols, names = [], []
+        for name, template in sorted(self.templates().items()):
+            parts = split_svg(template.render({"label": None, "title_id": ""}))
+            viewbox = _VIEWBOX.search(parts[0]) if parts else None
+            if not viewbox:
+                continue
+            symbols.append(
+                f'<symbol id="icon-{name}" viewBox="{viewbox.group(1)}">{parts[1].strip()}</symbol>'
+            )
+            names.append(name)
+        document = '<svg xmlns="http://www.w3.org/2000/svg">\n' + "\n".join(symbols) + "\n</svg>\n"
+        return document, names
+
+
+def _find_static(path: str) -> str | None:
+    """A static file from the finders (app/STATICFILES_DIRS) or, built there, STATIC_ROOT."""
+    found = finders.find(path)
+    if found:
+        return found
+    root = getattr(settings, "STATIC_ROOT", None)
+    return str(Path(root, path)) if root and Path(root, path).is_file() else None
+
+
+def sprite_filename(document: str) -> str:
+    return f"sprite.{hashlib.sha256(document.encode()).hexdigest()[:12]}.svg"
+
+
+registry = IconRegistry()
+
+
+@receiver(setting_changed)
+def _clear_on_settings_change(*, setting, **kwargs):
+    if setting in ("TEMPLATES", "ICONS_SPRITE", "STATICFILES_DIRS", "STATIC_ROOT", "STATIC_URL"):
+        registry.clear()
+
+
+@receiver(file_changed)
+def _clear_on_file_change(sender, file_path, **kwargs):
+    # Runs alongside Django's own template reset; returning None leaves reload alone
+    if Path(file_path).suffix == ".html":
+        registry.clear()
@@ -0,0 +1,133 @@
+# src/core/mail.py
+#
+# Batched email sending over one reused backend connection.
+#
+# send_mail()/EmailMessage.send() open and close a backend connection per message;
+# with SMTP that is a TCP connect + TLS handshake + AUTH for every email. BatchMailer
+# opens the connection once per batch and ships the queued messages over it with
+# send_messages(), so an intake of thousands of welcome/invite emails costs one
+# session per batch instead of one per message.
+#
+# Usage:
+#     with BatchMailer() as mailer:
+#         for user in users:
+#             mailer.add(build_message(user), key=user.pk)
+#     mailer.sent, mailer.failed, mailer.failed_recipients
+#
+# Works with any EMAIL_BACKEND (smtp, locmem, filebased, console).
+
+import logging
+from smtplib import SMTPServerDisconnected
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+# A session left idle this long while the rate limiter waits is closed and reopened
+# before the next send, well inside typical SMTP server timeouts.
+SESSION_IDLE_SECONDS = 30
+
+
+class BatchMailer:
+    """
+    Queue EmailMessages and send them in batches of `batch_size`
+    (default settings.EMAIL_BATCH_SIZE), one connection session per batch.
+    Providers often cap messages per SMTP session; a batch size below that cap
+    keeps sessions valid while still amortising the handshake.
+
+    Messages go out one send_messages() call at a time on the open session, so a
+    failure is pinned to its message: it is counted in `failed` (recipients in
+    `failed_recipients`), the session is reopened and the rest still go out. A
+    message whose session was dropped by the server is retried once on a new one.
+
+    Each message is queued with an optional `key` (e.g. the user's pk) that is
+    passed back to the hooks.
+
+    Optional hooks:
+    - limiter: object with acquire() (core.ratelimit.RateLimiter), called before each
+      send and before the session is opened; if it waited SESSION_IDLE_SECONDS or more,
+      the idle session is reopened first
+    - on_sent: callable(key, message), called after each message is accepted
+    - on_failed: callable(key, message), called after each message that failed
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int | None = None,
+        connection=None,
+        limiter=None,
+        on_sent=None,
+        on_failed=None,
+    ):
+        self.batch_size = batch_size or getattr(settings, "EMAIL_BATCH_SIZE", 100)
+        self.connection = connection or get_connection()
+        self.limiter = limiter
+        self.on_sent = on_sent
+        self.on_failed = on_failed
+        self.sent = 0
+        self.failed = 0
+        self.failed_recipients: list[str] = []
+        self._pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        # Flush even when the block raised: queued messages belong to work that
+        # already happened (e.g. users committed before the error).
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+
+    def add(self, message, key=None) -> None:
+        """Queue one EmailMessage; a full batch is sent right away."""
+        self._pending.append((key, message))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Send everything queued over one session."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        is_open = False
+        try:
+            for key, message in batch:
+                if self.limiter is not None:
+                    waited = self.limiter.acquire()
+                    if is_open and waited >= SESSION_IDLE_SECONDS:
+                        self.connection.close()
+                        is_open = False
+                if not is_open:
+                    self.connection.open()
+                    is_open = True
+                message.connection = self.connection
+                try:
+                    sent = self._send(message)
+                except Exception:
+                    logger.exception("Email to %s failed", ", ".join(message.recipients()))
+                    self.failed += 1
+                    self.failed_recipients.extend(message.recipients())
+                    # The session may be unusable after an SMTP error
+                    self.connection.close()
+                    is_open = False
+                    if self.on_failed is not None:
+                        self.on_failed(key, message)
+                    continue
+                self.sent += sent
+                if sent and self.on_sent is not None:
+                    self.on_sent(key, message)
+        finally:
+            self.connection.close()
+
+    def _send(self, message) -> int:
+        try:
+            return self.connection.send_messages([message]) or 0
+        except SMTPServerDisconnected:
+            # Dropped session (server timeout, provider limit): one retry on a new one
+            self.connection.close()
+            self.connection.open()
+            return self.connection.send_messages([message]) or 0
@@ -0,0 +1,51 @@
+# src/core/management/commands/benchmark.py
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import autodiscover_modules
+
+from core import benchmarks
+
+
+class Command(BaseCommand):
+    help = "Run micro-benchmarks declared in <app>/benchmarks.py and print ops/second."
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all).")
+        parser.add_argument("--number", type=int, default=1000, help="Iterations per variant.")
+        parser.add_argument(
+            "--variant",
+            action="append",
+            default=[],
+            help="Only run variants whose label contains this text (repeatable).",
+        )
+        parser.add_argument("--list", action="store_true", help="List benchmarks and exit.")
+
+    def handle(self, *args, **opts):
+        autodiscover_modules("benchmarks")
+        available = benchmarks.registry()
+
+        if opts["list"]:
+            for name, bench in available.items():
+                self.stdout.write(f"{name:<32} {bench.description}")
+            return
+
+        unknown = set(opts["names"]) - set(available)
+        if unknown:
+            raise CommandError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+        if opts["number"] < 1:
+            raise CommandError("--number must be >= 1")
+
+        for name in opts["names"] or available:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for r in benchmarks.run(available[name], opts["number"], opts["variant"]):
+                unit = "items/s" if r.items is not None else "ops/s"
+                done = f"{r.items} items" if r.items is not None else str(r.number)
+                self.stdout.write(
+                    f"  {r.variant:<36} {r.per_second:>12,.0f} {unit}  "
+                    f"({done} in {r.seconds:.3f}s)"
+                )
+
+
+# usage
+# python src/manage.py benchmark --list
+# python src/manage.py benchmark email.invite --number=2000
+# python src/manage.py benchmark email.smtp.invite --number=1 --variant=1k
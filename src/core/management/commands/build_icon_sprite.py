@@ -0,0 +1,62 @@
+# src/core/management/commands/build_icon_sprite.py
+#
+# Compile every {% icon %} template into one content-hashed SVG sprite for
+# ICONS_SPRITE mode (see core.icons). The output is generated, so by default it goes
+# to STATIC_ROOT, next to the collected files and outside the source tree: run it
+# after collectstatic (and `collectstatic --clear` removes it). --check fails when
+# the built sprite is missing or out of date (CI).
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.icons import IconRegistry, SPRITE_DIR, sprite_filename
+
+
+class Command(BaseCommand):
+    help = "Build the hashed icon sprite (static core/icons/sprite.<hash>.svg + sprite.json)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--out-dir",
+            default=None,
+            help="Static root to write under (default: STATIC_ROOT).",
+        )
+        parser.add_argument(
+            "--check", action="store_true", help="Only verify the sprite is up to date."
+        )
+
+    def handle(self, *args, **opts):
+        base = Path(opts["out_dir"] or settings.STATIC_ROOT)
+        out_dir = base / SPRITE_DIR
+        document, names = IconRegistry().build_sprite()
+        filename = sprite_filename(document)
+        manifest = {"file": f"{SPRITE_DIR}/{filename}", "icons": names}
+        manifest_path = out_dir / "sprite.json"
+
+        if opts["check"]:
+            current = json.loads(manifest_path.read_text()) if manifest_path.exists() else None
+            if current != manifest or not (out_dir / filename).exists():
+                raise CommandError("Icon sprite is missing or stale; run build_icon_sprite.")
+            self.stdout.write(self.style.SUCCESS(f"Icon sprite up to date ({filename})."))
+            return
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for old in out_dir.glob("sprite.*.svg"):
+            if old.name != filename:
+                old.unlink()
+        (out_dir / filename).write_text(document)
+        manifest_path.write_text(json.dumps(manifest, indent=2) + "\n")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {out_dir / filename}: {len(names)} icons, {len(document):,} bytes."
+            )
+        )
+
+
+# usage
+# python src/manage.py collectstatic --noinput && python src/manage.py build_icon_sprite
+#   # then ICONS_SPRITE=1
+# python src/manage.py build_icon_sprite --check    # CI: fail if icons changed
@@ -0,0 +1,72 @@
+# src/core/management/commands/clear_expired_sessions.py
+#
+# Daytime-safe replacement for `clearsessions` (DB-backed session engines).
+#
+# clearsessions runs one DELETE ... WHERE expire_date < now over the whole table;
+# on MySQL that scans and locks for as long as it takes, stalling logins. This
+# command walks expired rows in primary-key order (keyset: session_key > last seen),
+# deletes at most --batch rows per statement, sleeps between batches, and reports
+# progress in rows/s.
+
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions in small keyset batches (safe to run while serving)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=1000, help="Rows per DELETE.")
+        parser.add_argument(
+            "--sleep", type=float, default=0.2, help="Seconds to pause between batches."
+        )
+        parser.add_argument(
+            "--report-every", type=int, default=20, help="Print progress every N batches."
+        )
+
+    def handle(self, *args, **opts):
+        if opts["batch"] < 1:
+            raise CommandError("--batch must be >= 1")
+
+        cutoff = timezone.now()  # fixed, so sessions expiring meanwhile wait for the next run
+        expired = Session.objects.filter(expire_date__lt=cutoff).order_by("session_key")
+        started = time.monotonic()
+        deleted = batches = 0
+        last_key = ""
+
+        while True:
+            keys = list(
+                expired.filter(session_key__gt=last_key).values_list("session_key", flat=True)[
+                    : opts["batch"]
+                ]
+            )
+            if not keys:
+                break
+            # Re-check expiry: a session selected above may have been refreshed since
+            deleted += Session.objects.filter(
+                session_key__in=keys, expire_date__lt=cutoff
+            ).delete()[0]
+            last_key = keys[-1]
+            batches += 1
+            if batches % opts["report_every"] == 0:
+                self._report(deleted, started)
+            if len(keys) < opts["batch"]:
+                break
+            if opts["sleep"]:
+                time.sleep(opts["sleep"])
+
+        self._report(deleted, started, final=True)
+
+    def _report(self, deleted: int, started: float, final: bool = False):
+        elapsed = time.monotonic() - started
+        rate = deleted / elapsed if elapsed else 0.0
+        line = f"deleted={deleted} elapsed={elapsed:.1f}s rate={rate:.0f} rows/s"
+        self.stdout.write(self.style.SUCCESS(f"Done: {line}") if final else line)
+
+
+# usage
+# python src/manage.py clear_expired_sessions                       # 1000 rows, 0.2s pause
+# python src/manage.py clear_expired_sessions --batch=500 --sleep=1 # gentler, busy hours
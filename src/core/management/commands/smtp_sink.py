@@ -0,0 +1,82 @@
+# src/core/management/commands/smtp_sink.py
+import asyncio
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    help = "Run a local SMTP sink that accepts and discards mail, reporting throughput/latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=1025)
+        parser.add_argument(
+            "--delay-ms", type=float, default=0, help="Delay before accepting each message."
+        )
+        parser.add_argument(
+            "--connect-delay-ms",
+            type=float,
+            default=0,
+            help="Delay before the greeting (simulates TCP/TLS/AUTH setup).",
+        )
+        parser.add_argument(
+            "--fail-rate", type=float, default=0.0, help="Fraction of messages to reject (0-1)."
+        )
+        parser.add_argument(
+            "--fail-code", type=int, default=451, help="Reply code for rejected messages."
+        )
+        parser.add_argument("--seed", type=int, default=None, help="Seed for --fail-rate.")
+        parser.add_argument(
+            "--report-every", type=float, default=5.0, help="Seconds between stats lines."
+        )
+
+    def handle(self, *args, **opts):
+        if not 0 <= opts["fail_rate"] <= 1:
+            raise CommandError("--fail-rate must be between 0 and 1")
+        if not 400 <= opts["fail_code"] <= 599:
+            raise CommandError("--fail-code must be a 4xx or 5xx SMTP code")
+
+        sink = SMTPSink(
+            opts["host"],
+            opts["port"],
+            delay=opts["delay_ms"] / 1000,
+            connect_delay=opts["connect_delay_ms"] / 1000,
+            fail_rate=opts["fail_rate"],
+            fail_code=opts["fail_code"],
+            seed=opts["seed"],
+        )
+        try:
+            asyncio.run(self._run(sink, opts["report_every"]))
+        except KeyboardInterrupt:
+            pass
+        self._report(sink, final=True)
+
+    async def _run(self, sink: SMTPSink, every: float):
+        await sink.serve()
+        self.stdout.write(
+            self.style.SUCCESS(f"SMTP sink listening on {sink.host}:{sink.port}")
+            + f"  (EMAIL_HOST={sink.host} EMAIL_PORT={sink.port} EMAIL_USE_TLS=0)"
+        )
+        seen = 0
+        while True:
+            await asyncio.sleep(every)
+            if sink.stats.messages + sink.stats.failed != seen:
+                seen = sink.stats.messages + sink.stats.failed
+                self._report(sink)
+
+    def _report(self, sink: SMTPSink, final: bool = False):
+        s = sink.stats.summary()
+        line = (
+            f"connections={s['connections']} messages={s['messages']} failed={s['failed']} "
+            f"rate={s['msgs_per_sec']:.0f}/s p50={s['p50_ms']:.1f}ms p95={s['p95_ms']:.1f}ms"
+        )
+        self.stdout.write(self.style.NOTICE(line) if final else line)
+
+
+# usage
+# python src/manage.py smtp_sink --port=1025 --delay-ms=20 --connect-delay-ms=150
+# python src/manage.py smtp_sink --fail-rate=0.05 --fail-code=451   # provider throttling
+# then run Django with EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend
+#   EMAIL_HOST=127.0.0.1 EMAIL_PORT=1025 EMAIL_USE_TLS=0
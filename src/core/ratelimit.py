@@ -0,0 +1,75 @@
+# src/core/ratelimit.py
+#
+# Token buckets for pacing outgoing work against provider quotas
+# (e.g. "14 emails/second, 50 000/day").
+#
+#     limiter = RateLimiter(per_second=10, per_hour=3000)
+#     for message in messages:
+#         limiter.acquire()   # blocks until every bucket has a token
+#         send(message)
+#
+# A bucket refills continuously at `rate` tokens/second up to `capacity`, so short
+# bursts up to `capacity` are allowed and the long-run rate never exceeds `rate`.
+
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, *, clock=time.monotonic):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be > 0 and capacity >= 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until one token is available (0 if one is available now)."""
+        self._refill()
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def take(self) -> None:
+        self._refill()
+        self._tokens -= 1
+
+
+class RateLimiter:
+    """
+    Combine a per-second and an optional per-hour quota. A quota of 0/None means
+    unlimited. The per-hour bucket starts full, so a fresh run may use the whole
+    hourly allowance (paced by the per-second bucket) before it starts waiting.
+    """
+
+    def __init__(
+        self,
+        per_second: float | None = None,
+        per_hour: float | None = None,
+        *,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self._sleep = sleep
+        self.buckets = []
+        if per_second:
+            self.buckets.append(TokenBucket(per_second, max(1.0, per_second), clock=clock))
+        if per_hour:
+            self.buckets.append(TokenBucket(per_hour / 3600, per_hour, clock=clock))
+
+    def acquire(self) -> float:
+        """Block until a send is allowed; returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            delay = max((b.wait_time() for b in self.buckets), default=0.0)
+            if delay <= 0:
+                break
+            self._sleep(delay)
+            waited += delay
+        for bucket in self.buckets:
+            bucket.take()
+        return waited
@@ -0,0 +1,187 @@
+# src/core/smtp_sink.py
+#
+# A local SMTP stand-in for load-testing email paths (no provider, no files).
+#
+# It speaks just enough SMTP for Django's smtp backend (EHLO/HELO, MAIL, RCPT,
+# DATA, RSET, NOOP, QUIT; no TLS/AUTH), throws message bodies away, and records
+# how many connections/messages it saw, per-message latency and throughput.
+# Provider behaviour can be simulated:
+#   connect_delay   seconds before the greeting (stands in for TCP+TLS+AUTH cost)
+#   delay           seconds before accepting each message
+#   fail_rate       fraction of messages rejected at end of DATA with `fail_code`
+#                   (4xx = temporary, e.g. 451 throttling; 5xx = permanent)
+#
+# Run it with `manage.py smtp_sink`, or in-process (benchmarks, tests):
+#
+#     with SMTPSink(delay=0.002) as sink:     # background thread, free port
+#         with override_settings(**sink.django_settings()):
+#             ...send mail...
+#     sink.stats.summary()
+
+import asyncio
+from dataclasses import dataclass, field
+import random
+import statistics
+import threading
+import time
+
+
+@dataclass
+class SinkStats:
+    connections: int = 0
+    messages: int = 0
+    recipients: int = 0
+    failed: int = 0
+    latencies: list[float] = field(default_factory=list)  # MAIL FROM → final DATA reply
+    first_at: float | None = None
+    last_at: float | None = None
+
+    def record(self, started: float, ok: bool, recipients: int) -> None:
+        now = time.monotonic()
+        self.first_at = self.first_at or started
+        self.last_at = now
+        self.latencies.append(now - started)
+        if ok:
+            self.messages += 1
+            self.recipients += recipients
+        else:
+            self.failed += 1
+
+    def summary(self) -> dict:
+        lat = sorted(self.latencies)
+        span = (self.last_at - self.first_at) if lat else 0.0
+        return {
+            "connections": self.connections,
+            "messages": self.messages,
+            "recipients": self.recipients,
+            "failed": self.failed,
+            "msgs_per_sec": (self.messages / span) if span else 0.0,
+            "p50_ms": statistics.median(lat) * 1000 if lat else 0.0,
+            "p95_ms": lat[int(len(lat) * 0.95) - 1] * 1000 if lat else 0.0,
+        }
+
+
+class SMTPSink:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        delay: float = 0.0,
+        connect_delay: float = 0.0,
+        fail_rate: float = 0.0,
+        fail_code: int = 451,
+        seed: int | None = None,
+    ):
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.connect_delay = connect_delay
+        self.fail_rate = fail_rate
+        self.fail_code = fail_code
+        self.stats = SinkStats()
+        self._random = random.Random(seed)
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    # --- protocol ------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats.connections += 1
+
+        async def reply(line: str):
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        if self.connect_delay:
+            await asyncio.sleep(self.connect_delay)
+        await reply("220 langcon-sink ESMTP")
+
+        started, rcpts = None, 0
+        try:
+            while line := await reader.readline():
+                verb = line[:4].upper().decode("ascii", "replace")
+                if verb == "EHLO":
+                    await reply("250-langcon-sink\r\n250-8BITMIME\r\n250 SIZE 0")
+                elif verb == "HELO":
+                    await reply("250 langcon-sink")
+                elif verb == "MAIL":
+                    started, rcpts = time.monotonic(), 0
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    rcpts += 1
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        pass  # body is discarded
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    ok = self._random.random() >= self.fail_rate
+                    self.stats.record(started or time.monotonic(), ok, rcpts)
+                    if ok:
+                        await reply("250 OK queued")
+                    else:
+                        await reply(f"{self.fail_code} Simulated failure")
+                elif verb in ("RSET", "NOOP"):
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    # --- lifecycle -----------------------------------------------------------
+
+    async def serve(self) -> asyncio.AbstractServer:
+        """Start listening on the running loop (foreground use: the command)."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    def start(self) -> "SMTPSink":
+        """Serve from a background thread; returns once the port is bound."""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.serve())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="smtp-sink", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def django_settings(self) -> dict:
+        """Settings that point Django's smtp backend at this sink."""
+        return {
+            "EMAIL_BACKEND": "django.core.mail.backends.smtp.EmailBackend",
+            "EMAIL_HOST": self.host,
+            "EMAIL_PORT": self.port,
+            "EMAIL_USE_TLS": False,
+            "EMAIL_USE_SSL": False,
+            "EMAIL_HOST_USER": "",
+            "EMAIL_HOST_PASSWORD": "",
+        }
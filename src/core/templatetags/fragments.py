@@ -0,0 +1,122 @@
+# src/core/templatetags/fragments.py
+#
+# Fragment caching for layout partials (navbar, footer) with per-request holes.
+#
+#     {% load fragments %}
+#     {% cachefragment "navbar" %}
+#       ... links, icons, active_url ...
+#       {% nocache %}{% csrf_token %}{% endnocache %}
+#     {% endcachefragment %}
+#
+# The rendered fragment is stored in the default cache under a key made of:
+#   - the fragment name and FRAGMENT_CACHE_VERSION (set it per deploy);
+#   - the visitor's role state: authenticated, role, is_staff, is_superuser
+#     (what the user_roles filters and navbar conditions look at);
+#   - the current view name (core.templatetags.navigation), for active links;
+#   - any extra values after the name: {% cachefragment "footer" year %}.
+# So a fragment must not depend on anything else: startswith= checks inside it
+# have to agree with the view name, and per-user values go in {% nocache %} blocks.
+#
+# {% nocache %} blocks are cut out of the cached copy and rendered on every request
+# (CSRF tokens, the user's name). They see the context of the {% cachefragment %}
+# tag, not loop or {% with %} variables around them.
+#
+# Off when FRAGMENT_CACHE_TIMEOUT is 0 (the default in dev, so template edits show).
+
+import hashlib
+import re
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+
+from .navigation import _current_view_name
+
+register = template.Library()
+
+_HOLE = "\x00nocache:{}\x00"
+_HOLE_RE = re.compile("\x00nocache:(\\d+)\x00")
+_FILLING = "_fragment_filling"
+
+
+def _role_state(request) -> str:
+    user = getattr(request, "user", None)
+    if not getattr(user, "is_authenticated", False):
+        return "anon"
+    return f"{getattr(user, 'role', '')}:{int(user.is_staff)}:{int(user.is_superuser)}"
+
+
+class NoCacheNode(template.Node):
+    def __init__(self, nodelist):
+        self.nodelist = nodelist
+        self.index = None  # set by the enclosing CacheFragmentNode
+
+    def render(self, context):
+        if context.get(_FILLING) and self.index is not None:
+            return _HOLE.format(self.index)
+        return self.nodelist.render(context)
+
+
+class CacheFragmentNode(template.Node):
+    def __init__(self, name, vary_on, nodelist):
+        self.name = name
+        self.vary_on = vary_on
+        self.nodelist = nodelist
+        self.holes = nodelist.get_nodes_by_type(NoCacheNode)
+        for index, hole in enumerate(self.holes):
+            hole.index = index
+
+    def cache_key(self, context) -> str:
+        request = context.get("request")
+        parts = [
+            getattr(settings, "FRAGMENT_CACHE_VERSION", ""),
+            _role_state(request),
+            (_current_view_name(request) or "") if request else "",
+            *(str(v.resolve(context)) for v in self.vary_on),
+        ]
+        digest = hashlib.md5("|".join(parts).encode(), usedforsecurity=False).hexdigest()
+        return f"fragment:{self.name.resolve(context)}:{digest}"
+
+    def render(self, context):
+        timeout = getattr(settings, "FRAGMENT_CACHE_TIMEOUT", 0)
+        if not timeout:
+            return self.nodelist.render(context)
+
+        key = self.cache_key(context)
+        cached = cache.get(key)
+        if cached is None:
+            with context.push({_FILLING: True}):
+                cached = self.nodelist.render(context)
+            cache.set(key, cached, timeout)
+        if not self.holes:
+            return cached
+        filled = {}
+
+        def fill(match):
+            index = int(match.group(1))
+            if index not in filled:
+                filled[index] = self.holes[index].nodelist.render(context)
+            return filled[index]
+
+        return _HOLE_RE.sub(fill, cached)
+
+
+@register.tag
+def cachefragment(parser, token):
+    """{% cachefragment "name" [vary_value ...] %} ... {% endcachefragment %}"""
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"{bits[0]!r} needs a fragment name")
+    nodelist = parser.parse(("endcachefragment",))
+    parser.delete_first_token()
+    return CacheFragmentNode(
+        parser.compile_filter(bits[1]), [parser.compile_filter(b) for b in bits[2:]], nodelist
+    )
+
+
+@register.tag
+def nocache(parser, token):
+    """{% nocache %} ... {% endnocache %}: rendered per request inside a cached fragment."""
+    nodelist = parser.parse(("endnocache",))
+    parser.delete_first_token()
+    return NoCacheNode(nodelist)
@@ -1,4 +1,6 @@
 # src/core/templatetags/navigation.py
+from functools import lru_cache
+
 from django import template
 from django.urls import resolve, Resolver404
 from django.utils.safestring import mark_safe
@@ -6,13 +8,30 @@ from django.utils.safestring import mark_safe
 register = template.Library()
 
 
-def _is_active_by_view(request, view_name: str) -> bool:
-    """Return True if the current resolved view name equals view_name."""
-    try:
-        current = resolve(request.path_info)
-        return current.view_name == view_name
-    except Resolver404:
-        return False
+_UNRESOLVED = object()
+
+
+def _current_view_name(request) -> str | None:
+    """
+    View name of the current page, resolved at most once per request: a navbar asks
+    dozens of times. Reuses request.resolver_match (set by URL dispatch) when present.
+    """
+    name = getattr(request, "_nav_view_name", _UNRESOLVED)
+    if name is _UNRESOLVED:
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            try:
+                match = resolve(request.path_info)
+            except Resolver404:
+                match = None
+        name = request._nav_view_name = match.view_name if match else None
+    return name
+
+
+@lru_cache(maxsize=256)
+def _name_set(view_names: tuple[str, ...]) -> frozenset[str]:
+    # Each tag call site passes the same tuple every render: build its set once
+    return frozenset(view_names)
 
 
 def _is_active(request, view_names: tuple[str, ...], startswith: str | None) -> bool:
@@ -20,13 +39,10 @@ def _is_active(request, view_names: tuple[str, ...], startswith: str | None) ->
     if not request:
         return False
     # view-name match
-    for name in view_names:
-        if _is_active_by_view(request, name):
-            return True
-    # path prefix match
-    if startswith and request.path.startswith(startswith):
+    if view_names and _current_view_name(request) in _name_set(view_names):
         return True
-    return False
+    # path prefix match
+    return bool(startswith and request.path.startswith(startswith))
 
 
 @register.simple_tag(takes_context=True)
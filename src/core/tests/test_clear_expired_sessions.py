@@ -0,0 +1,44 @@
+# src/core/tests/test_clear_expired_sessions.py
+#
+# Purpose: clear_expired_sessions deletes only expired rows, in bounded batches.
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.utils import timezone
+import pytest
+
+
+@pytest.mark.django_db
+def test_clear_expired_sessions_in_batches(django_assert_max_num_queries):
+    """
+    GIVEN 25 expired and 3 live sessions
+    WHEN the command runs with --batch=10
+    THEN the 25 expired rows go in 3 batches (6 statements), live ones stay,
+         and the rate is reported.
+    """
+    now = timezone.now()
+    Session.objects.bulk_create(
+        [
+            Session(session_key=f"old{i:03}", session_data="", expire_date=now - timedelta(days=1))
+            for i in range(25)
+        ]
+        + [
+            Session(session_key=f"new{i:03}", session_data="", expire_date=now + timedelta(days=1))
+            for i in range(3)
+        ]
+    )
+
+    out = StringIO()
+    with django_assert_max_num_queries(6):
+        call_command("clear_expired_sessions", "--batch=10", "--sleep=0", stdout=out)
+
+    assert sorted(Session.objects.values_list("session_key", flat=True)) == [
+        "new000",
+        "new001",
+        "new002",
+    ]
+    assert "deleted=25" in out.getvalue()
+    assert "rows/s" in out.getvalue()
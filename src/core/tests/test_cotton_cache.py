@@ -0,0 +1,107 @@
+# src/core/tests/test_cotton_cache.py
+#
+# Purpose: compiled cotton templates persist on disk, a new engine (worker) loads
+# them without recompiling, and an edited template is compiled again. A cache
+# directory other users can write to is never used.
+
+import os
+import stat
+
+from django.template import Engine
+from django_cotton.compiler_regex import CottonCompiler
+
+from core.cotton_cache import entry_key
+
+PAGE = '<c-button variant="primary">Save</c-button>\n'
+
+
+def _engine(template_dir, cache_dir):
+    return Engine(
+        dirs=[str(template_dir)],
+        loaders=[("core.cotton_cache.Loader", None, str(cache_dir))],
+        builtins=["django_cotton.templatetags.cotton"],
+    )
+
+
+def _count_compiles(monkeypatch):
+    calls = []
+    original = CottonCompiler.process
+    monkeypatch.setattr(
+        CottonCompiler, "process", lambda self, src: calls.append(src) or original(self, src)
+    )
+    return calls
+
+
+def test_new_engine_reuses_compiled_components(tmp_path, monkeypatch):
+    """
+    GIVEN a template using cotton syntax, loaded once through the caching loader
+    WHEN a fresh engine (a new worker) loads it again
+    THEN it is not recompiled and gets the same compiled source.
+    """
+    templates, cache_dir = tmp_path / "templates", tmp_path / "cache"
+    templates.mkdir()
+    (templates / "page.html").write_text(PAGE)
+    calls = _count_compiles(monkeypatch)
+
+    first = _engine(templates, cache_dir).get_template("page.html")
+    second = _engine(templates, cache_dir).get_template("page.html")
+
+    assert "<c-button" not in first.source and first.source == second.source
+    assert len(calls) == 1
+    assert len(list(cache_dir.glob("*.html"))) == 1
+
+
+def test_edited_component_is_recompiled(tmp_path, monkeypatch):
+    """
+    GIVEN a cached template
+    WHEN its source changes
+    THEN the next engine compiles the new source instead of serving the old entry.
+    """
+    templates, cache_dir = tmp_path / "templates", tmp_path / "cache"
+    templates.mkdir()
+    page = templates / "page.html"
+    page.write_text(PAGE)
+    _engine(templates, cache_dir).get_template("page.html")
+
+    page.write_text(PAGE.replace("primary", "ghost"))
+    calls = _count_compiles(monkeypatch)
+    template = _engine(templates, cache_dir).get_template("page.html")
+
+    assert "ghost" in template.source and "primary" not in template.source
+    assert len(calls) == 1
+
+
+def test_cache_dir_is_created_private(tmp_path):
+    """
+    GIVEN a cache directory that does not exist yet
+    WHEN a template is loaded
+    THEN the directory is created readable and writable by this user only.
+    """
+    templates, cache_dir = tmp_path / "templates", tmp_path / "cache"
+    templates.mkdir()
+    (templates / "page.html").write_text(PAGE)
+
+    _engine(templates, cache_dir).get_template("page.html")
+
+    assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700
+    assert len(list(cache_dir.glob("*.html"))) == 1
+
+
+def test_world_writable_cache_dir_is_ignored(tmp_path, monkeypatch):
+    """
+    GIVEN a world-writable cache directory holding a planted entry for the template
+    WHEN a template is loaded
+    THEN the entry is ignored: the source is compiled in memory and nothing is stored.
+    """
+    templates, cache_dir = tmp_path / "templates", tmp_path / "cache"
+    templates.mkdir()
+    (templates / "page.html").write_text(PAGE)
+    cache_dir.mkdir()
+    os.chmod(cache_dir, 0o777)
+    (cache_dir / f"{entry_key(PAGE)}.html").write_text("planted")
+    calls = _count_compiles(monkeypatch)
+
+    template = _engine(templates, cache_dir).get_template("page.html")
+
+    assert "planted" not in template.source and len(calls) == 1
+    assert [p.name for p in cache_dir.iterdir()] == [f"{entry_key(PAGE)}.html"]
@@ -0,0 +1,71 @@
+# src/core/tests/test_fragments.py
+#
+# Purpose: navbar/footer fragments are cached per role and active view, while
+# per-user parts ({% nocache %}: name, CSRF token) are still rendered per request.
+
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, override_settings
+from django.urls import reverse
+import pytest
+
+User = get_user_model()
+
+CACHED = override_settings(FRAGMENT_CACHE_TIMEOUT=60)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _student(email, first_name):
+    return User.objects.create_user(
+        email=email, password="pass1234", role="student", first_name=first_name
+    )
+
+
+@pytest.mark.django_db
+@CACHED
+def test_cached_navbar_keeps_user_name_and_csrf_per_request():
+    """
+    GIVEN two students loading the same page with fragment caching on
+    WHEN the second is served from the cached navbar
+    THEN each sees their own name, and their logout form's CSRF token is accepted.
+    """
+    url = reverse("core:landing")
+    pages = {}
+    for email, name in (("ann@ex.com", "Ann"), ("bob@ex.com", "Bob")):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(_student(email, name))
+        pages[name] = (client, client.get(url).content.decode())
+
+    assert any(k.startswith(":1:fragment:navbar:") for k in cache._cache)  # LocMem keys
+    assert "Bob" in pages["Bob"][1] and "Ann" not in pages["Bob"][1]
+
+    client, html = pages["Bob"]
+    token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', html).group(1)
+    resp = client.post(reverse("users:logout"), {"csrfmiddlewaretoken": token})
+    assert resp.status_code == 200  # logged-out page, not a 403
+
+
+@pytest.mark.django_db
+@CACHED
+def test_navbar_fragment_varies_by_role():
+    """
+    GIVEN a cached navbar rendered for a student
+    WHEN an admin loads the same page
+    THEN the admin gets their own variant (with the Register link).
+    """
+    url = reverse("core:landing")
+    register = reverse("users:register")
+    student, admin = Client(), Client()
+    student.force_login(_student("s@ex.com", "Sam"))
+    admin.force_login(User.objects.create_user(email="a@ex.com", password="x", role="admin"))
+
+    assert register not in student.get(url).content.decode()
+    assert register in admin.get(url).content.decode()
@@ -0,0 +1,73 @@
+# src/core/tests/test_icons.py
+#
+# Purpose: the icon registry compiles each icon once, reuses rendered SVG, still
+# gives every labelled icon its own title id, and can emit sprite references.
+
+from io import StringIO
+import re
+
+from django.core.management import call_command
+from django.template import engines
+from django.test import override_settings
+
+from core.icons import IconRegistry
+
+
+def _render_tag(source):
+    return engines["django"].from_string("{% load icons %}" + source).render({})
+
+
+def test_registry_renders_each_combination_once(monkeypatch):
+    """
+    GIVEN a fresh registry
+    WHEN the same decorative icon is rendered three times
+    THEN the template renders once and all three outputs are identical.
+    """
+    registry = IconRegistry()
+    template = registry.templates()["menu"]
+    calls = []
+    original = template.render
+    monkeypatch.setattr(template, "render", lambda ctx: calls.append(ctx) or original(ctx))
+
+    outputs = {registry.render("menu", "h-6 w-6") for _ in range(3)}
+
+    assert len(calls) == 1
+    assert len(outputs) == 1
+    assert 'aria-hidden="true"' in outputs.pop()
+
+
+def test_labelled_icons_get_unique_title_ids():
+    """
+    GIVEN two labelled icons on one page, and an unknown icon name
+    WHEN the page renders
+    THEN each labelled icon has its own title id and the unknown one is a placeholder.
+    """
+    html = _render_tag(
+        "{% icon 'menu' label='Open' %}{% icon 'menu' label='Open' %}{% icon 'nope' class_='x' %}"
+    )
+
+    ids = re.findall(r'aria-labelledby="(icon-menu-[0-9a-f]{6})"', html)
+    assert len(ids) == 2 and ids[0] != ids[1]
+    assert all(f'<title id="{i}">Open</title>' in html for i in ids)
+    assert "<span class='x' aria-hidden='true'></span>" in html
+
+
+def test_sprite_mode_emits_use_references(tmp_path):
+    """
+    GIVEN a built sprite and ICONS_SPRITE on
+    WHEN a labelled icon renders
+    THEN it is a <use> into the hashed sprite, keeps its title/aria attributes,
+         and no longer inlines the path data.
+    """
+    with override_settings(STATIC_ROOT=tmp_path):
+        call_command("build_icon_sprite", stdout=StringIO())
+        call_command("build_icon_sprite", "--check", stdout=StringIO())
+
+    with override_settings(ICONS_SPRITE=True, STATIC_ROOT=tmp_path):
+        html = _render_tag("{% icon 'menu' class_='h-6 w-6' label='Open' %}")
+
+    assert re.search(r'<use href="/static/core/icons/sprite\.[0-9a-f]{12}\.svg#icon-menu">', html)
+    assert 'class="h-6 w-6"' in html and 'role="img"' in html
+    assert re.search(r'<title id="icon-menu-[0-9a-f]{6}">Open</title>', html)
+    assert "<path" not in html
+    assert 'id="icon-menu"' in next(tmp_path.glob("core/icons/sprite.*.svg")).read_text()
@@ -0,0 +1,115 @@
+# src/core/tests/test_mail.py
+#
+# Purpose: BatchMailer reuses one connection session per batch and keeps going
+# (with accurate counts) when a single message fails or a session is dropped.
+
+from smtplib import SMTPServerDisconnected
+
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+
+from core.mail import BatchMailer, SESSION_IDLE_SECONDS
+
+
+class CountingBackend(EmailBackend):
+    """locmem backend that counts sessions and rejects one address."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opens = 0
+
+    def open(self):
+        self.opens += 1
+        return True
+
+    def send_messages(self, messages):
+        if any("bad@" in r for m in messages for r in m.recipients()):
+            raise OSError("550 mailbox unavailable")
+        return super().send_messages(messages)
+
+
+def _msg(to):
+    return EmailMessage(subject="Hi", body="Hello", from_email="noreply@example.com", to=[to])
+
+
+def test_batch_mailer_uses_one_session_per_batch():
+    """
+    GIVEN 5 messages and batch_size=2
+    WHEN they are sent through BatchMailer
+    THEN all 5 are delivered over 3 sessions (not 5).
+    """
+    backend = CountingBackend()
+    with BatchMailer(batch_size=2, connection=backend) as mailer:
+        for i in range(5):
+            mailer.add(_msg(f"u{i}@example.com"))
+
+    assert mailer.sent == 5
+    assert mailer.failed == 0
+    assert backend.opens == 3
+
+
+def test_batch_mailer_isolates_failed_message():
+    """
+    GIVEN a batch where one recipient is rejected
+    WHEN the batch is flushed
+    THEN the others are still sent and the failure is counted with its recipient.
+    """
+    backend = CountingBackend()
+    with BatchMailer(batch_size=10, connection=backend) as mailer:
+        for to in ("a@example.com", "bad@example.com", "c@example.com"):
+            mailer.add(_msg(to))
+
+    assert mailer.sent == 2
+    assert mailer.failed == 1
+    assert mailer.failed_recipients == ["bad@example.com"]
+
+
+class DroppingBackend(CountingBackend):
+    """Drops the session the first time a message is sent on it after a long wait."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.drop_next = False
+
+    def send_messages(self, messages):
+        if self.drop_next:
+            self.drop_next = False
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        return super().send_messages(messages)
+
+
+class SlowLimiter:
+    """Reports a long wait before every send after the first."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def acquire(self):
+        self.calls += 1
+        return 0.0 if self.calls == 1 else SESSION_IDLE_SECONDS
+
+
+def test_batch_mailer_reopens_idle_and_dropped_sessions():
+    """
+    GIVEN a rate limiter that waits long between sends, and a server that drops
+          one session
+    WHEN a batch of 3 messages is sent
+    THEN the idle session is reopened before each later send, the dropped message
+         is retried once on a new session, and nothing is counted as failed.
+    """
+    backend = DroppingBackend()
+    sent_keys = []
+    with BatchMailer(
+        batch_size=10,
+        connection=backend,
+        limiter=SlowLimiter(),
+        on_sent=lambda key, message: sent_keys.append(key),
+    ) as mailer:
+        for i in range(3):
+            mailer.add(_msg(f"u{i}@example.com"), key=i)
+        backend.drop_next = True
+
+    assert mailer.sent == 3
+    assert mailer.failed == 0
+    assert sent_keys == [0, 1, 2]
+    assert backend.opens == 4  # one per send after an idle wait, plus the retry
@@ -0,0 +1,51 @@
+# src/core/tests/test_navigation.py
+#
+# Purpose: active_url/aria_current resolve the current path at most once per request,
+# however many navigation tags a page renders.
+
+from django.template import engines
+from django.test import RequestFactory
+
+from core.templatetags import navigation
+
+NAV = "{% load navigation %}" + "".join(
+    "{% active_url 'core:landing' 'users:login' %}{% aria_current 'users:student_home' %}"
+    for _ in range(15)
+)
+
+
+def _count_resolves(monkeypatch):
+    calls = []
+    real = navigation.resolve
+    monkeypatch.setattr(navigation, "resolve", lambda path: calls.append(path) or real(path))
+    return calls
+
+
+def test_navbar_resolves_path_once_per_render(monkeypatch):
+    """
+    GIVEN a request without resolver_match and a template with 30 navigation tags
+    WHEN it renders
+    THEN the path is resolved once and the matching tags are active.
+    """
+    calls = _count_resolves(monkeypatch)
+    request = RequestFactory().get("/users/login/")
+
+    html = engines["django"].from_string(NAV).render({"request": request})
+
+    assert len(calls) == 1
+    assert html.count("is-active") == 15
+    assert "aria-current" not in html
+
+
+def test_navbar_reuses_resolver_match(monkeypatch, client):
+    """
+    GIVEN a real request, which Django has already resolved
+    WHEN the navbar renders for it
+    THEN navigation tags never call resolve() themselves.
+    """
+    calls = _count_resolves(monkeypatch)
+
+    resp = client.get("/users/login/")
+
+    assert resp.status_code == 200
+    assert calls == []
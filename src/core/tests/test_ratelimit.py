@@ -0,0 +1,35 @@
+# src/core/tests/test_ratelimit.py
+import pytest
+
+from core.ratelimit import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_rate_limiter_respects_both_quotas():
+    """
+    GIVEN 2/second and 5/hour quotas
+    WHEN we acquire 6 sends on a fake clock
+    THEN sends are paced at 2/s after the initial burst, and the 6th waits for the
+         hourly bucket to refill (~12 minutes after the 5th).
+    """
+    clock = FakeClock()
+    limiter = RateLimiter(per_second=2, per_hour=5, clock=clock, sleep=clock.sleep)
+
+    times = []
+    for _ in range(6):
+        limiter.acquire()
+        times.append(clock.now)
+
+    assert times[:2] == [0.0, 0.0]  # burst up to the per-second capacity
+    assert times[2:5] == [0.5, 1.0, 1.5]
+    assert times[5] == pytest.approx(720)  # 3600 / 5 seconds per hourly token
@@ -0,0 +1,51 @@
+# src/core/tests/test_smtp_sink.py
+#
+# Purpose: the local SMTP sink speaks enough SMTP for Django's smtp backend, counts
+# connections/messages, and injects the configured failures.
+
+from django.core.mail import EmailMessage
+from django.test import override_settings
+
+from core.mail import BatchMailer
+from core.smtp_sink import SMTPSink
+
+
+def _msg(to):
+    return EmailMessage(subject="Hi", body="Hello", from_email="noreply@example.com", to=[to])
+
+
+def test_sink_records_batched_sends():
+    """
+    GIVEN a running sink and Django's smtp backend pointed at it
+    WHEN 5 messages are sent through BatchMailer with batch_size=2
+    THEN the sink accepts all 5 over 3 connections and reports latency.
+    """
+    with SMTPSink() as sink, override_settings(**sink.django_settings()):
+        with BatchMailer(batch_size=2) as mailer:
+            for i in range(5):
+                mailer.add(_msg(f"u{i}@example.com"))
+
+    summary = sink.stats.summary()
+    assert mailer.sent == 5
+    assert summary["messages"] == 5
+    assert summary["connections"] == 3
+    assert summary["p50_ms"] >= 0
+
+
+def test_sink_injects_failures():
+    """
+    GIVEN a sink that rejects every message with a 5xx code
+    WHEN messages are sent
+    THEN the sender sees each one fail and the sink counts them as failed.
+    """
+    with (
+        SMTPSink(fail_rate=1.0, fail_code=554) as sink,
+        override_settings(**sink.django_settings()),
+    ):
+        with BatchMailer(batch_size=10) as mailer:
+            mailer.add(_msg("a@example.com"))
+            mailer.add(_msg("b@example.com"))
+
+    assert mailer.sent == 0
+    assert mailer.failed_recipients == ["a@example.com", "b@example.com"]
+    assert sink.stats.failed == 2
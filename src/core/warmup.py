@@ -0,0 +1,68 @@
+# src/core/warmup.py
+#
+# Template warm-up for the cached template loader (TEMPLATES_CACHED, settings).
+#
+# With the cached loader, a template is read and compiled (cotton components
+# included: the cotton loader rewrites <c-...> syntax on load) the first time a
+# process asks for it, then kept for the life of the process. Without a warm-up the
+# first requests each worker serves pay that cost. warm_templates() compiles every
+# *.html under the engine's template dirs (templates/cotton, core/templates) and the
+# installed apps' template dirs into the current process's loader cache:
+#   - config/wsgi.py and config/asgi.py call it at worker boot (TEMPLATES_WARM_ON_BOOT);
+#   - `manage.py warm_templates` runs it in its own process, which is useful as a
+#     deploy check (every template compiles) and to time the cost.
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import time
+
+from django.conf import settings
+from django.template import engines, TemplateDoesNotExist, TemplateSyntaxError
+from django.template.utils import get_app_template_dirs
+
+
+@dataclass
+class WarmupReport:
+    compiled: int = 0
+    seconds: float = 0.0
+    failed: list[tuple[str, str]] = field(default_factory=list)
+
+
+def template_dirs(*, app_dirs: bool = True) -> list[Path]:
+    engine = engines["django"].engine
+    dirs = [Path(d) for d in engine.dirs]
+    if app_dirs:
+        dirs += [Path(d) for d in get_app_template_dirs("templates")]
+    return dirs
+
+
+def template_names(*, app_dirs: bool = True) -> list[str]:
+    """Every *.html template name the loaders can see (first dir wins, as in lookup)."""
+    names = set()
+    for base in template_dirs(app_dirs=app_dirs):
+        names.update(p.relative_to(base).as_posix() for p in base.rglob("*.html"))
+    return sorted(names)
+
+
+def warm_templates(*, app_dirs: bool = True) -> WarmupReport:
+    """Load (compile) every template into this process's template loaders."""
+    engine = engines["django"].engine
+    report = WarmupReport()
+    started = time.perf_counter()
+    for name in template_names(app_dirs=app_dirs):
+        try:
+            engine.get_template(name)
+            report.compiled += 1
+        except (TemplateSyntaxError, TemplateDoesNotExist) as exc:
+            # e.g. third-party partials that only compile in their own context
+            report.failed.append((name, str(exc)))
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def warm_on_boot() -> None:
+    """Worker-boot hook: warm only when the cached loader will keep the result."""
+    if getattr(settings, "TEMPLATES_CACHED", False) and getattr(
+        settings, "TEMPLATES_WARM_ON_BOOT", False
+    ):
+        warm_templates()
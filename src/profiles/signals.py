@@ -5,6 +5,8 @@ from django.contrib.auth import get_user_model
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from users.bulk import defer_created, users_bulk_created
+
 User = get_user_model()
 
 
@@ -20,8 +22,35 @@ def ensure_profile_for_student(sender, instance, created, **kwargs):
 
     if not created:
         return
+    # Inside users.bulk.bulk_user_operations(): handled set-wise below
+    if defer_created(instance):
+        return
     if getattr(instance, "role", None) != "student":
         return
 
     Profile = apps.get_model("profiles", "Profile")
     Profile.objects.get_or_create(user=instance)
+
+
+@receiver(users_bulk_created)
+def ensure_profiles_for_bulk_students(sender, users, **kwargs):
+    """
+    Set-wise version of ensure_profile_for_student for users created in bulk:
+    one lookup of existing profiles and one bulk_create of the missing ones.
+    """
+    if not getattr(settings, "PROFILES_AUTO_CREATE", True):
+        return
+
+    student_ids = [u.pk for u in users if getattr(u, "role", None) == "student"]
+    if not student_ids:
+        return
+
+    Profile = apps.get_model("profiles", "Profile")
+    existing = set(
+        Profile.objects.filter(user_id__in=student_ids).values_list("user_id", flat=True)
+    )
+    Profile.objects.bulk_create(
+        [Profile(user_id=pk) for pk in student_ids if pk not in existing],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
@@ -0,0 +1,13 @@
+# src/tasks/apps.py
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TasksConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "tasks"
+    verbose_name = "Background tasks"
+
+    def ready(self):
+        # Register @task functions declared in each app's `tasks.py`
+        autodiscover_modules("tasks")
@@ -0,0 +1,66 @@
+# src/tasks/management/commands/run_worker.py
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from tasks import queue
+
+
+class Command(BaseCommand):
+    help = "Process queued background tasks (invite emails, ...). Runs until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=20, help="Tasks claimed per round trip.")
+        parser.add_argument(
+            "--sleep", type=float, default=2.0, help="Seconds to wait when the queue is empty."
+        )
+        parser.add_argument("--once", action="store_true", help="Drain due tasks, then exit.")
+        parser.add_argument("--stats", action="store_true", help="Print queue depth and exit.")
+        parser.add_argument("--worker-id", default=None, help="Name stored on claimed tasks.")
+
+    def handle(self, *args, **opts):
+        if opts["batch"] < 1:
+            raise CommandError("--batch must be >= 1")
+
+        if opts["stats"]:
+            self._print_stats()
+            return
+
+        worker_id = opts["worker_id"] or f"{socket.gethostname()}:{os.getpid()}"
+        done = failed = 0
+        self.stdout.write(f"Worker {worker_id} started (batch={opts['batch']})")
+
+        try:
+            while True:
+                claimed = queue.claim(opts["batch"], worker_id)
+                for task_row in claimed:
+                    if queue.run(task_row):
+                        done += 1
+                    else:
+                        failed += 1
+                        self.stderr.write(f"[fail] {task_row.name} #{task_row.pk}")
+                if not claimed:
+                    if opts["once"]:
+                        break
+                    close_old_connections()  # long-lived process: drop dead/expired connections
+                    time.sleep(opts["sleep"])
+        except KeyboardInterrupt:
+            self.stdout.write("Interrupted; RUNNING tasks are reclaimed after the lock timeout.")
+
+        self.stdout.write(self.style.SUCCESS(f"Done: succeeded={done} failed={failed}"))
+
+    def _print_stats(self):
+        s = queue.stats()
+        self.stdout.write(
+            f"queued={s['queued']} due={s['due']} running={s['running']} failed={s['failed']} "
+            f"lag={s['lag_seconds']:.0f}s"
+        )
+
+
+# usage
+# python src/manage.py run_worker              # run forever
+# python src/manage.py run_worker --once       # drain due tasks (cron-friendly)
+# python src/manage.py run_worker --stats      # queue depth
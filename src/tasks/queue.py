@@ -0,0 +1,162 @@
+# src/tasks/queue.py
+#
+# A small durable task queue on top of the `Task` table.
+#
+# Declare work in any app's `tasks.py` (autodiscovered in TasksConfig.ready):
+#
+#     from tasks.queue import task
+#
+#     @task("users.send_invite")
+#     def send_invite(user_id):
+#         ...
+#
+# and queue it from request code:
+#
+#     enqueue("users.send_invite", user_id=user.pk)
+#
+# The row is written in the caller's transaction, so a job exists if and only if
+# the data it refers to was committed. `manage.py run_worker` claims due jobs in
+# batches (SELECT ... FOR UPDATE SKIP LOCKED where the backend supports it), runs
+# them, deletes them on success and retries failures with exponential backoff.
+# Jobs left RUNNING by a dead worker are reclaimed after TASKS_LOCK_TIMEOUT, or
+# marked FAILED if that was their last attempt.
+#
+# With settings.TASKS_EAGER (default in dev) enqueue() skips the table and runs
+# the function after commit in-process, so local development needs no worker.
+# Payloads must be JSON-serialisable and must never contain secrets.
+
+from collections.abc import Callable
+from datetime import timedelta
+import logging
+import traceback
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry: dict[str, Callable] = {}
+
+
+class UnknownTask(LookupError):
+    """No function is registered under this task name."""
+
+
+def task(name: str):
+    """Register `func` under `name` (a stable string stored in the queue)."""
+
+    def decorator(func: Callable) -> Callable:
+        _registry[name] = func
+        func.task_name = name
+        return func
+
+    return decorator
+
+
+def get_task(name: str) -> Callable:
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownTask(name) from None
+
+
+def enqueue(name: str, *, delay: timedelta | None = None, **payload) -> Task | None:
+    """
+    Queue a call of task `name` with keyword arguments `payload`.
+    Returns the Task row, or None when running eagerly.
+    """
+    func = get_task(name)  # fail fast on typos, at the call site
+    if getattr(settings, "TASKS_EAGER", False):
+        transaction.on_commit(lambda: func(**payload))
+        return None
+    return Task.objects.create(
+        name=name,
+        payload=payload,
+        run_after=timezone.now() + (delay or timedelta()),
+        max_attempts=getattr(settings, "TASKS_MAX_ATTEMPTS", 5),
+    )
+
+
+# --- worker side -------------------------------------------------------------
+
+
+def claim(batch_size: int, worker_id: str) -> list[Task]:
+    """Lock up to `batch_size` due tasks for this worker and mark them RUNNING."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, "TASKS_LOCK_TIMEOUT", 600))
+    abandoned = Q(status=Task.Status.RUNNING, locked_at__lt=stale)
+    exhausted = Q(attempts__gte=F("max_attempts"))
+    due = Q(status=Task.Status.QUEUED, run_after__lte=now) | (abandoned & ~exhausted)
+    with transaction.atomic():
+        # A job whose worker died on its last attempt is not retried forever
+        Task.objects.filter(abandoned & exhausted).update(
+            status=Task.Status.FAILED,
+            last_error="Worker lock expired on the last attempt",
+            locked_at=None,
+        )
+        ids = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(due)
+            .order_by("run_after", "id")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        Task.objects.filter(pk__in=ids).update(
+            status=Task.Status.RUNNING,
+            locked_at=now,
+            locked_by=worker_id,
+            attempts=F("attempts") + 1,
+        )
+    return list(Task.objects.filter(pk__in=ids).order_by("run_after", "id"))
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before retry number `attempts` (1, 2, 3...): base * 2^(n-1), capped."""
+    base = getattr(settings, "TASKS_RETRY_BACKOFF", 30)
+    cap = getattr(settings, "TASKS_RETRY_BACKOFF_MAX", 3600)
+    return timedelta(seconds=min(cap, base * 2 ** (attempts - 1)))
+
+
+def run(task_row: Task) -> bool:
+    """Run one claimed task; returns True on success."""
+    try:
+        get_task(task_row.name)(**task_row.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Task %s #%s failed", task_row.name, task_row.pk)
+        if task_row.attempts >= task_row.max_attempts:
+            Task.objects.filter(pk=task_row.pk).update(
+                status=Task.Status.FAILED, last_error=error, locked_at=None
+            )
+        else:
+            Task.objects.filter(pk=task_row.pk).update(
+                status=Task.Status.QUEUED,
+                run_after=timezone.now() + backoff(task_row.attempts),
+                last_error=error,
+                locked_at=None,
+            )
+        return False
+
+    Task.objects.filter(pk=task_row.pk).delete()
+    return True
+
+
+def stats() -> dict:
+    """Queue depth by status, how many queued jobs are due, and the oldest due job's lag."""
+    now = timezone.now()
+    counts = dict.fromkeys(Task.Status.values, 0)
+    for row in Task.objects.values("status").annotate(n=Count("id")):
+        counts[row["status"]] = row["n"]
+
+    due = Task.objects.filter(status=Task.Status.QUEUED, run_after__lte=now)
+    oldest = due.aggregate(oldest=Min("run_after"))["oldest"]
+    return {
+        **counts,
+        "due": due.count(),
+        "lag_seconds": (now - oldest).total_seconds() if oldest else 0.0,
+    }
@@ -0,0 +1,104 @@
+# src/tasks/tests/test_task_queue.py
+#
+# Purpose: invites are queued instead of sent inline, `run_worker` drains the
+# queue, and failing tasks (or tasks whose worker died) are retried with backoff
+# until max_attempts.
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+import pytest
+
+from tasks import queue
+from tasks.models import Task
+
+User = get_user_model()
+
+CALLS = []
+
+
+@queue.task("tests.flaky")
+def flaky(n):
+    CALLS.append(n)
+    raise RuntimeError("SMTP stalled")
+
+
+@pytest.mark.django_db
+@override_settings(TASKS_EAGER=False, EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+def test_invite_is_queued_then_sent_by_worker(django_capture_on_commit_callbacks, capsys):
+    """
+    GIVEN queueing is enabled (not eager)
+    WHEN a user without a password is created
+    THEN no email is sent inline and one task is queued;
+         `run_worker --once` sends the invite and removes the task.
+    """
+    with django_capture_on_commit_callbacks(execute=True):
+        User.objects.create_user(email="queued@example.com", role="student")
+
+    assert mail.outbox == []
+    assert Task.objects.filter(name="users.send_invites").count() == 1
+
+    call_command("run_worker", "--stats")
+    assert "queued=1 due=1" in capsys.readouterr().out
+
+    call_command("run_worker", "--once")
+
+    assert [m.to for m in mail.outbox] == [["queued@example.com"]]
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+@override_settings(TASKS_EAGER=False, TASKS_MAX_ATTEMPTS=2, TASKS_RETRY_BACKOFF=60)
+def test_failing_task_backs_off_then_fails():
+    """
+    GIVEN a task that always raises, with max_attempts=2
+    WHEN the worker runs it, then runs it again once the backoff has elapsed
+    THEN the first failure requeues it in the future and the second marks it FAILED.
+    """
+    CALLS.clear()
+    row = queue.enqueue("tests.flaky", n=1)
+
+    call_command("run_worker", "--once")
+    row.refresh_from_db()
+    assert row.status == Task.Status.QUEUED
+    assert row.attempts == 1
+    assert row.run_after > timezone.now()
+    assert "SMTP stalled" in row.last_error
+
+    # Not due yet: a second drain does nothing
+    call_command("run_worker", "--once")
+    assert CALLS == [1]
+
+    Task.objects.filter(pk=row.pk).update(run_after=timezone.now())
+    call_command("run_worker", "--once")
+    row.refresh_from_db()
+    assert row.status == Task.Status.FAILED
+    assert CALLS == [1, 1]
+
+
+@pytest.mark.django_db
+@override_settings(TASKS_EAGER=False, TASKS_MAX_ATTEMPTS=2, TASKS_LOCK_TIMEOUT=60)
+def test_abandoned_task_is_reclaimed_until_attempts_run_out():
+    """
+    GIVEN two tasks left RUNNING by a dead worker, one with an attempt left
+    WHEN another worker claims after the lock timeout
+    THEN the first is reclaimed and the exhausted one is marked FAILED, not rerun.
+    """
+    expired = timezone.now() - timedelta(minutes=5)
+    retry, spent = queue.enqueue("tests.flaky", n=1), queue.enqueue("tests.flaky", n=2)
+    Task.objects.filter(pk=retry.pk).update(
+        status=Task.Status.RUNNING, locked_at=expired, attempts=1
+    )
+    Task.objects.filter(pk=spent.pk).update(
+        status=Task.Status.RUNNING, locked_at=expired, attempts=2
+    )
+
+    claimed = queue.claim(10, "worker-2")
+
+    assert [t.pk for t in claimed] == [retry.pk] and claimed[0].attempts == 2
+    spent.refresh_from_db()
+    assert spent.status == Task.Status.FAILED and spent.locked_at is None
@@ -6,4 +6,7 @@ class UsersConfig(AppConfig):
     name = "users"
 
     def ready(self):
-        from . import signals  # noqa: F401 (just to register handlers)
+        from . import roles, signals  # noqa: F401 (register handlers and system checks)
+        from .last_login import install
+
+        install()
@@ -0,0 +1,224 @@
+# src/users/backends.py
+#
+# Auth backends that keep per-request auth data in the shared cache.
+#
+# PermissionCacheBackend (opt in with USERS_CACHE_PERMS=1): ModelBackend whose
+# permission sets are shared across requests. ModelBackend only caches them on the
+# request's user instance, so every admin page rebuilt them from the auth join tables; with
+# TEACHER_ADMIN_FULL_PERMS a Teacher Admin's group set is every Permission row.
+#   - per user: direct permissions + the user's group ids;
+#   - per group-set signature (sorted group ids): the groups' permissions, so all
+#     Teacher Admins share one entry.
+# Entries are built from the permission rows only. Superusers (every permission)
+# bypass them and go through ModelBackend, so their "everything" is never shared.
+# Every key embeds a generation number; any change to memberships, group or user
+# permissions, groups or permissions bumps it (see users.signals), which orphans all
+# entries at once. Changes are rare, so coarse invalidation is the simple, safe one.
+# Saving or deleting a user drops that user's entry (forget_user_permissions()).
+# Bulk writes that skip m2m_changed must call bump_permissions_generation().
+# The counter lives in the default cache, so revocations only reach other workers
+# through a shared cache (system check users.W002).
+#
+# CachedModelBackend: serves request.user from the shared cache; it shares
+# permission sets too when USERS_CACHE_PERMS is on.
+#
+# AuthenticationMiddleware calls the session's backend get_user(pk) on every
+# authenticated request, i.e. one SELECT on users_user per request, for an object
+# that changes rarely. This backend keeps the loaded user (and, with
+# USERS_CACHE_PROFILE, its `profile`) in the default cache for
+# USERS_CACHE_USER_TIMEOUT seconds.
+#
+# Opt in with USERS_CACHE_AUTH_USER=1 (settings). Sessions remember the backend that
+# logged them in, so switching backends logs everyone out once. Invalidation only
+# reaches the cache it runs against: with a per-process cache (LocMem, the default
+# without CACHE_URL) other workers keep serving a changed, deactivated or deleted
+# user until the entry expires. A shared cache is required; system check users.W001
+# warns otherwise.
+#
+# Entries are dropped when the user (or profile) is saved or deleted, which covers
+# password changes (set_password + save) and therefore session-hash checks. Code
+# that changes users with queryset.update()/bulk_update() bypasses signals and must
+# call forget_users() itself.
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core import checks
+from django.core.cache import cache
+from django.db import transaction
+
+KEY = "users:auth-user:{}"
+BACKEND = "users.backends.CachedModelBackend"
+PERMS_GENERATION_KEY = "users:perms:generation"
+
+# Cache backends that are not shared between processes
+LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def _cache_key(pk) -> str:
+    return KEY.format(pk)
+
+
+def forget_users(pks) -> None:
+    """Drop cached users now and again at commit (so no request re-caches the old row)."""
+    if BACKEND not in settings.AUTHENTICATION_BACKENDS:
+        return
+    keys = [_cache_key(pk) for pk in pks]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _perms_generation() -> int:
+    gen = cache.get(PERMS_GENERATION_KEY)
+    if gen is None:
+        # Start from the clock, not 1: an evicted counter must not revive old entries
+        cache.add(PERMS_GENERATION_KEY, int(time.time() * 1000), timeout=None)
+        gen = cache.get(PERMS_GENERATION_KEY)
+    return gen
+
+
+def forget_user_permissions(pks) -> None:
+    """Drop users' own permission entries (saved/deleted user: flags may have changed)."""
+    gen = cache.get(PERMS_GENERATION_KEY)
+    if gen is None:
+        return  # nothing cached under any generation still in use
+    keys = [f"users:perms:{gen}:user:{pk}" for pk in pks]
+    cache.delete_many(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def bump_permissions_generation() -> None:
+    """Invalidate every cached permission set (now and again at commit)."""
+
+    def bump():
+        try:
+            cache.incr(PERMS_GENERATION_KEY)
+        except ValueError:
+            _perms_generation()
+
+    bump()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(bump)
+
+
+def _perm_names(permissions) -> set[str]:
+    rows = permissions.values_list("content_type__app_label", "codename").order_by()
+    return {f"{app_label}.{codename}" for app_label, codename in rows}
+
+
+class PermissionCacheBackend(ModelBackend):
+    def shares_permissions(self) -> bool:
+        return True
+
+    def _shared_perms(self, user_obj) -> tuple[set, set]:
+        """(direct permissions, group permissions) as "app_label.codename" sets."""
+        if not hasattr(user_obj, "_shared_perm_cache"):
+            timeout = settings.USERS_CACHE_PERMS_TIMEOUT
+            gen = _perms_generation()
+            user_key = f"users:perms:{gen}:user:{user_obj.pk}"
+            entry = cache.get(user_key)
+            if entry is None:
+                group_ids = tuple(sorted(user_obj.groups.values_list("pk", flat=True)))
+                entry = (_perm_names(self._get_user_permissions(user_obj)), group_ids)
+                cache.set(user_key, entry, timeout=timeout)
+            user_perms, group_ids = entry
+
+            group_perms = set()
+            if group_ids:
+                group_key = f"users:perms:{gen}:groups:{','.join(map(str, group_ids))}"
+                group_perms = cache.get(group_key)
+                if group_perms is None:
+                    # From the group rows only: shared by everyone with these groups
+                    group_perms = _perm_names(self._get_group_permissions(user_obj))
+                    cache.set(group_key, group_perms, timeout=timeout)
+            user_obj._shared_perm_cache = (user_perms, group_perms)
+        return user_obj._shared_perm_cache
+
+    def get_user_permissions(self, user_obj, obj=None):
+        # Superusers have every permission: ModelBackend, never the shared entries
+        if not self.shares_permissions() or user_obj.is_superuser:
+            return super().get_user_permissions(user_obj, obj)
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        return self._shared_perms(user_obj)[0]
+
+    def get_group_permissions(self, user_obj, obj=None):
+        if not self.shares_permissions() or user_obj.is_superuser:
+            return super().get_group_permissions(user_obj, obj)
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        return self._shared_perms(user_obj)[1]
+
+
+class CachedModelBackend(PermissionCacheBackend):
+    def shares_permissions(self) -> bool:
+        return getattr(settings, "USERS_CACHE_PERMS", False)
+
+    def get_user(self, user_id):
+        key = _cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            User = get_user_model()
+            qs = User._default_manager.all()
+            if getattr(settings, "USERS_CACHE_PROFILE", False):
+                qs = qs.select_related("profile")
+            try:
+                user = qs.get(pk=user_id)
+            except User.DoesNotExist:
+                return None
+            cache.set(key, user, timeout=settings.USERS_CACHE_USER_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
+
+
+def _shares_permissions(path) -> bool:
+    if path == f"{__name__}.PermissionCacheBackend":
+        return True
+    return path == BACKEND and getattr(settings, "USERS_CACHE_PERMS", False)
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs=None, **kwargs):
+    if settings.CACHES.get("default", {}).get("BACKEND") not in LOCAL_CACHES:
+        return []
+    warnings = []
+    if BACKEND in settings.AUTHENTICATION_BACKENDS:
+        warnings.append(
+            checks.Warning(
+                "USERS_CACHE_AUTH_USER is on but the default cache is per-process: other "
+                "workers keep serving changed or deactivated users until their entry expires.",
+                hint="Point CACHE_URL at a shared cache (Redis) or turn USERS_CACHE_AUTH_USER off.",
+                obj="USERS_CACHE_AUTH_USER",
+                id="users.W001",
+            )
+        )
+    if any(_shares_permissions(path) for path in settings.AUTHENTICATION_BACKENDS):
+        warnings.append(
+            checks.Warning(
+                "USERS_CACHE_PERMS is on but the default cache is per-process: permissions "
+                "revoked in one worker stay granted in the others until their entry expires.",
+                hint="Point CACHE_URL at a shared cache (Redis) or turn USERS_CACHE_PERMS off.",
+                obj="USERS_CACHE_PERMS",
+                id="users.W002",
+            )
+        )
+    if getattr(settings, "USERS_DEFER_LAST_LOGIN", False):
+        warnings.append(
+            checks.Warning(
+                "USERS_DEFER_LAST_LOGIN is on but the default cache is per-process: other "
+                "workers read a stale last_login, and keep accepting password-reset links a "
+                "login should have invalidated, until the buffer is flushed.",
+                hint="Point CACHE_URL at a shared cache (Redis) or unset USERS_DEFER_LAST_LOGIN.",
+                obj="USERS_DEFER_LAST_LOGIN",
+                id="users.W003",
+            )
+        )
+    return warnings
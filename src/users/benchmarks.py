@@ -0,0 +1,179 @@
+# src/users/benchmarks.py
+#
+# `manage.py benchmark email.invite email.welcome` (rendering only), and `email.smtp.*`
+# (end to end through a local SMTP sink).
+
+from contextlib import contextmanager
+from functools import partial
+from io import StringIO
+from pathlib import Path
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.test import override_settings
+
+from core.benchmarks import benchmark
+from core.mail import BatchMailer
+from core.smtp_sink import SMTPSink
+
+from .emails import compile_invite, compile_welcome
+from .utils import build_invite_message, send_invite_email, send_set_password
+
+User = get_user_model()
+
+
+def _user():
+    # Unsaved: token generation only needs pk, password, last_login and email
+    return User(pk=1, email="bench@example.com", password="!unusable", role="student")
+
+
+@benchmark("email.invite", "Invite emails: render per message vs compiled once")
+def invite_render():
+    user = _user()
+    invite = compile_invite(domain="example.org", use_https=True)
+    return {
+        "render per message": lambda: build_invite_message(
+            user, domain="example.org", use_https=True
+        ).message(),
+        "compiled once": lambda: invite.message(user).message(),
+    }
+
+
+@benchmark("email.welcome", "Welcome emails (seed_students --send-welcome), compiled once")
+def welcome_render():
+    user = _user()
+    welcome = compile_welcome(domain="example.org", use_https=True)
+    return {
+        "compiled once": lambda: welcome.message(
+            user, email=user.email, password="Temp-1234"
+        ).message(),
+    }
+
+
+# --- end-to-end through a local SMTP server (core.smtp_sink) ---------------------
+#
+#   python src/manage.py benchmark email.smtp.invite --number=1 --variant=1k
+#
+# Every variant sends real SMTP traffic to an in-process sink on a free port, so the
+# numbers include connection setup and the SMTP dialogue but no provider or disk.
+# Database work happens in a transaction that is rolled back.
+
+SIZES = {"1k": 1_000, "10k": 10_000}
+DOMAIN = "bench.example.org"
+
+
+@contextmanager
+def _sink_and_rollback():
+    with (
+        SMTPSink() as sink,
+        override_settings(
+            **sink.django_settings(),
+            # Seeding hashes CSV passwords; a fast hasher keeps the focus on email
+            PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+            EMAIL_RATE_PER_SECOND=0,
+            TASKS_EAGER=True,
+        ),
+    ):
+        with transaction.atomic():
+            yield sink
+            transaction.set_rollback(True)
+
+
+def _bench_users(n: int) -> list:
+    return [
+        User(pk=i, email=f"bench{i}@example.com", password="!unusable", role="student")
+        for i in range(1, n + 1)
+    ]
+
+
+@benchmark("email.smtp.invite", "Invites over SMTP: one connection each vs batched", warmup=False)
+def smtp_invite():
+    with _sink_and_rollback():
+
+        def per_message(n):
+            for user in _bench_users(n):
+                send_invite_email(user, domain=DOMAIN, use_https=True)
+            return n
+
+        def batched(n):
+            invite = compile_invite(domain=DOMAIN, use_https=True)
+            with BatchMailer() as mailer:
+                for user in _bench_users(n):
+                    mailer.add(invite.message(user))
+            return mailer.sent
+
+        variants = {}
+        for label, n in SIZES.items():
+            variants[f"send_invite_email {label}"] = partial(per_message, n)
+            variants[f"compiled + BatchMailer {label}"] = partial(batched, n)
+        yield variants
+
+
+@benchmark(
+    "email.smtp.set_password",
+    "send_set_password per user vs send_set_password_bulk",
+    warmup=False,
+)
+def smtp_set_password():
+    with _sink_and_rollback():
+        n_max = max(SIZES.values())
+        User.objects.bulk_create(
+            [
+                User(email=f"bench{i}@example.com", password="!unusable", role="student")
+                for i in range(n_max)
+            ],
+            batch_size=1000,
+        )
+        tmp = tempfile.TemporaryDirectory()
+
+        def per_user(n):
+            for i in range(n):
+                send_set_password(f"bench{i}@example.com", domain=DOMAIN)
+            return n
+
+        def bulk(n):
+            path = Path(tmp.name) / f"{n}.csv"
+            path.write_text("email\n" + "".join(f"bench{i}@example.com\n" for i in range(n)))
+            call_command(
+                "send_set_password_bulk", f"--file={path}", f"--domain={DOMAIN}", stdout=StringIO()
+            )
+            return n
+
+        variants = {}
+        for label, n in SIZES.items():
+            variants[f"send_set_password {label}"] = partial(per_user, n)
+            variants[f"send_set_password_bulk {label}"] = partial(bulk, n)
+        with tmp:
+            yield variants
+
+
+@benchmark("email.smtp.welcome", "seed_students --bulk --send-welcome", warmup=False)
+def smtp_welcome():
+    with _sink_and_rollback():
+        tmp = tempfile.TemporaryDirectory()
+
+        def seed(n):
+            path = Path(tmp.name) / f"{n}.csv"
+            path.write_text(
+                "email,first_name,last_name,password\n"
+                + "".join(f"welcome{i}@example.com,W,{i},Temp-{i}\n" for i in range(n))
+            )
+            with transaction.atomic():  # each run starts from the same empty state
+                call_command(
+                    "seed_students",
+                    str(path),
+                    "--bulk",
+                    "--send-welcome",
+                    f"--site-domain={DOMAIN}",
+                    stdout=StringIO(),
+                )
+                transaction.set_rollback(True)
+            return n
+
+        with tmp:
+            yield {
+                f"seed_students --send-welcome {label}": partial(seed, n)
+                for label, n in SIZES.items()
+            }
@@ -0,0 +1,84 @@
+# src/users/bulk.py
+#
+# Coalesce per-user post_save side effects during bulk work.
+#
+# Creating a user normally triggers one Profile get_or_create and one invite
+# on_commit closure per instance (see profiles.signals / users.signals), and
+# bulk_create() triggers neither. Inside bulk_user_operations():
+#   - the per-instance receivers only record the new user and return;
+#   - code using bulk_create() registers its users with ops.created(...);
+#   - on a clean exit, `users_bulk_created` is sent ONCE with every recorded user,
+#     and its receivers replay the side effects set-wise (one bulk_create of missing
+#     profiles, one batched invite dispatch).
+#
+# Usage:
+#   with transaction.atomic(), bulk_user_operations() as ops:
+#       User.objects.bulk_create(users)
+#       ops.created(users)
+#
+# Blocks nest: an inner block joins the outermost one, which does the replay.
+# If the block raises, or ops.discard() was called (e.g. the work was rolled back
+# on purpose, as in an import preview), nothing is replayed.
+
+from contextlib import contextmanager
+import threading
+
+from django.dispatch import Signal
+
+# Sent with `users=[...]` when the outermost bulk_user_operations() block exits
+users_bulk_created = Signal()
+
+_local = threading.local()
+
+
+class BulkUserOperations:
+    def __init__(self):
+        self._created = {}
+
+    def created(self, users) -> None:
+        """Record saved users (pk set) whose post-create side effects are pending."""
+        for user in users:
+            self._created[user.pk] = user
+
+    def discard(self) -> None:
+        """Forget recorded users: their rows were rolled back, nothing to replay."""
+        self._created.clear()
+
+    @property
+    def created_users(self) -> list:
+        return list(self._created.values())
+
+
+def current_bulk_operation() -> BulkUserOperations | None:
+    return getattr(_local, "current", None)
+
+
+def defer_created(instance) -> bool:
+    """
+    For post_save receivers: inside a bulk block, record `instance` and return True
+    (the receiver should then return and let the set-wise replay handle it).
+    """
+    ops = current_bulk_operation()
+    if ops is None:
+        return False
+    ops.created([instance])
+    return True
+
+
+@contextmanager
+def bulk_user_operations():
+    outer = current_bulk_operation()
+    if outer is not None:
+        yield outer
+        return
+
+    ops = BulkUserOperations()
+    _local.current = ops
+    try:
+        yield ops
+    finally:
+        _local.current = None
+
+    users = ops.created_users
+    if users:
+        users_bulk_created.send(sender=BulkUserOperations, users=users)
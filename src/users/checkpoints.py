@@ -0,0 +1,42 @@
+# src/users/checkpoints.py
+import json
+import os
+from pathlib import Path
+import tempfile
+
+from django.utils import timezone
+
+
+class Checkpoint:
+    """
+    Small JSON progress file for long-running, resumable commands.
+
+    Writes are atomic (temp file + os.replace), so a crash mid-write never leaves a
+    truncated checkpoint behind.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def load(self) -> dict | None:
+        """Return the saved state, or None when there is no checkpoint yet."""
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, state: dict) -> None:
+        data = {**state, "updated_at": timezone.now().isoformat()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
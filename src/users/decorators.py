@@ -7,11 +7,7 @@ from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import redirect
 
-ROLE_HOME = {
-    "student": "users:student_home",
-    "teacher": "users:teacher_home",
-    "admin": "users:admin_home",
-}
+from .roles import role_home_name, role_home_url
 
 
 def _normalize_roles(allowed_roles) -> set[str]:
@@ -42,8 +38,8 @@ def role_required(allowed_roles: Iterable[str] | str):
             if role in allowed:
                 return view_func(request, *args, **kwargs)
 
-            # Not allowed → try to send them to THEIR home
-            target = ROLE_HOME.get(role)
+            # Not allowed → try to send them to THEIR home (users.roles)
+            target = role_home_name(role)
 
             # If we don't know their role, or no target, go to landing
             if not target:
@@ -57,7 +53,7 @@ def role_required(allowed_roles: Iterable[str] | str):
                 raise PermissionDenied("You do not have permission to view this page.")
 
             messages.error(request, "You do not have permission to view this page.")
-            return redirect(target)
+            return redirect(role_home_url(role))
 
         return wrapper
 
@@ -0,0 +1,76 @@
+# src/users/emails.py
+#
+# Invite and welcome emails, compiled once per run (see core.emails.CompiledEmail).
+#
+#     invite = compile_invite(domain="example.org", use_https=True)
+#     for user in users:
+#         mailer.add(invite.message(user))
+#
+# Per user, only the uid/token pair (plus any extra fields) is computed; templates
+# and the reset-URL prefix come from the single compile-time render.
+
+from django.conf import settings
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from core.emails import CompiledEmail
+
+from .constants import PWD_RESET_TPLS
+from .tokens import default_token_generator
+
+INVITE_SUBJECT = "Set your password"
+INVITE_TXT = "users/registration/invite_email.txt"
+WELCOME_SUBJECT = "Welcome — your account details"
+WELCOME_TXT = "users/registration/welcome_email.txt"
+
+
+class UserEmail:
+    """A CompiledEmail whose password-set link is filled in per user."""
+
+    def __init__(self, compiled: CompiledEmail, token_generator=default_token_generator):
+        self.compiled = compiled
+        self.token_generator = token_generator
+
+    def message(self, user, *, connection=None, **values):
+        return self.compiled.build(
+            to=user.email,
+            connection=connection,
+            uid=urlsafe_base64_encode(force_bytes(user.pk)),
+            token=self.token_generator.make_token(user),
+            **values,
+        )
+
+
+def _base_context(domain: str, use_https: bool) -> dict:
+    return {
+        "site_name": getattr(settings, "SITE_NAME", "LangCon"),
+        "domain": domain,
+        "protocol": "https" if use_https else "http",
+    }
+
+
+def compile_invite(*, domain: str, use_https: bool) -> UserEmail:
+    """Invite: set-password link, HTML (password reset template) + short text body."""
+    return UserEmail(
+        CompiledEmail(
+            subject=INVITE_SUBJECT,
+            text_template=INVITE_TXT,
+            html_template=PWD_RESET_TPLS["email_html"],
+            context=_base_context(domain, use_https),
+            fields=("uid", "token"),
+            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com"),
+        )
+    )
+
+
+def compile_welcome(*, domain: str, use_https: bool, from_email: str | None = None) -> UserEmail:
+    """seed_students --send-welcome: login email, temporary password and a reset link."""
+    return UserEmail(
+        CompiledEmail(
+            subject=WELCOME_SUBJECT,
+            text_template=WELCOME_TXT,
+            context=_base_context(domain, use_https),
+            fields=("email", "password", "uid", "token"),
+            from_email=from_email,
+        )
+    )
@@ -0,0 +1,110 @@
+# src/users/groups.py
+#
+# The "Teacher Admin" group: every teacher is staff and a member of it.
+#
+# sync_teacher_admin_group() brings the database in line by diffing instead of
+# rewriting: permissions are added/removed only where they differ, non-staff
+# teachers are fixed with one UPDATE, and missing memberships are inserted with one
+# bulk through-table insert. A second run against an up-to-date DB only reads.
+#
+# teacher_group_id() caches the group's pk for request-time code (RegisterView)
+# so registrations do not hit Group.objects.get_or_create every time. The pk is only
+# cached once it is committed: inside a transaction it is remembered on commit, so a
+# rollback (failed request, test isolation) cannot leave a pk for a row that is gone.
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .backends import bump_permissions_generation, forget_users
+
+User = get_user_model()
+
+TEACHER_GROUP_NAME = "Teacher Admin"
+
+_teacher_group_id: int | None = None
+
+
+def _remember(pk: int) -> None:
+    def remember():
+        global _teacher_group_id
+        _teacher_group_id = pk
+
+    # Runs now outside a transaction; after commit (never on rollback) inside one
+    transaction.on_commit(remember)
+
+
+def teacher_group_id() -> int:
+    """Primary key of the Teacher Admin group (created on first use, then cached)."""
+    if _teacher_group_id is not None:
+        return _teacher_group_id
+    group, _ = Group.objects.get_or_create(name=TEACHER_GROUP_NAME)
+    _remember(group.pk)
+    return group.pk
+
+
+def clear_teacher_group_cache() -> None:
+    global _teacher_group_id
+    _teacher_group_id = None
+
+
+@receiver(post_delete, sender=Group)
+def _forget_deleted_group(sender, instance, **kwargs):
+    if instance.pk == _teacher_group_id:
+        clear_teacher_group_cache()
+
+
+def sync_teacher_admin_group(
+    *, using: str = DEFAULT_DB_ALIAS, full_perms: bool | None = None, batch_size: int = 1000
+) -> dict:
+    """
+    Ensure Teacher Admin exists, has the right perms, and all teacher users are
+    staff & in the group. Controlled by settings.TEACHER_ADMIN_FULL_PERMS.
+
+    Returns counts of what changed: perms_added, perms_removed, staff_set, members_added.
+    """
+    if full_perms is None:
+        full_perms = getattr(settings, "TEACHER_ADMIN_FULL_PERMS", True)
+
+    group, _ = Group.objects.using(using).get_or_create(name=TEACHER_GROUP_NAME)
+
+    # --- permissions: diff ids, touch only the difference ---
+    perms_qs = Permission.objects.using(using)
+    if not full_perms:
+        perms_qs = perms_qs.filter(codename__startswith="view_")
+    wanted = set(perms_qs.values_list("pk", flat=True))
+    current = set(group.permissions.values_list("pk", flat=True))
+    if wanted - current:
+        group.permissions.add(*(wanted - current))
+    if current - wanted:
+        group.permissions.remove(*(current - wanted))
+
+    # --- teachers: one UPDATE for staff, one bulk insert for memberships ---
+    teachers = User.objects.using(using).filter(role=User.Roles.TEACHER)
+    to_staff = list(teachers.filter(is_staff=False).values_list("pk", flat=True))
+    staff_set = User.objects.using(using).filter(pk__in=to_staff).update(is_staff=True)
+    forget_users(to_staff)
+
+    Membership = User.groups.through
+    missing = teachers.exclude(groups=group).values_list("pk", flat=True)
+    members = [Membership(user_id=pk, group_id=group.pk) for pk in missing]
+    Membership.objects.using(using).bulk_create(
+        members, batch_size=batch_size, ignore_conflicts=True
+    )
+    if members:  # bulk_create skips m2m_changed
+        bump_permissions_generation()
+
+    # Refresh the request-time cache (the group may have just been created)
+    if using == DEFAULT_DB_ALIAS:
+        clear_teacher_group_cache()
+        _remember(group.pk)
+
+    return {
+        "perms_added": len(wanted - current),
+        "perms_removed": len(current - wanted),
+        "staff_set": staff_set,
+        "members_added": len(members),
+    }
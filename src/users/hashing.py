@@ -0,0 +1,72 @@
+# src/users/hashing.py
+#
+# Parallel password hashing for bulk account provisioning.
+#
+# A full PBKDF2 (or Argon2/scrypt) hash costs tens to hundreds of milliseconds of
+# CPU, so hashing thousands of passwords on one core dominates bulk imports. The
+# pool below fans the work out to worker processes and returns encoded hashes in
+# input order, ready to be assigned to `user.password` and written in bulk.
+#
+# Workers only run `hasher.encode(password, salt)`: the hasher instance and a
+# fresh salt are chosen in the parent (where settings are configured), so worker
+# processes never need Django settings or the app registry.
+
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import get_hasher, make_password
+
+
+def _encode(job: tuple) -> str:
+    hasher, password, salt = job
+    return hasher.encode(password, salt)
+
+
+class PasswordHashPool:
+    """
+    Usage:
+        with PasswordHashPool(workers=4) as pool:
+            hashes = pool.hash_many(["s3cret", None, "other"])
+
+    - workers <= 1 hashes inline (no processes are started).
+    - None produces an unusable password, exactly like make_password(None).
+    """
+
+    def __init__(self, workers: int = 0, chunksize: int = 8):
+        self.workers = workers
+        self.chunksize = chunksize
+        self._executor = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def hash_many(self, passwords: list[str | None]) -> list[str]:
+        """Return one encoded hash per input password, in the same order."""
+        hasher = get_hasher("default")
+        encoded: list[str | None] = [None] * len(passwords)
+        jobs, positions = [], []
+
+        for i, password in enumerate(passwords):
+            if password is None:
+                encoded[i] = make_password(None)
+            else:
+                jobs.append((hasher, password, hasher.salt()))
+                positions.append(i)
+
+        if self._executor is not None and len(jobs) > 1:
+            results = self._executor.map(_encode, jobs, chunksize=self.chunksize)
+        else:
+            results = map(_encode, jobs)
+
+        for i, value in zip(positions, results, strict=True):
+            encoded[i] = value
+        return encoded
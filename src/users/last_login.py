@@ -0,0 +1,118 @@
+# src/users/last_login.py
+#
+# Deferred last_login writes (USERS_DEFER_LAST_LOGIN=1).
+#
+# Django's update_last_login receiver issues one UPDATE per login. When thousands of
+# students sign in within minutes (e.g. results day) those writes queue up behind
+# everything else. In deferred mode a login only:
+#   - sets user.last_login on the instance (the request sees the right value);
+#   - records the timestamp in this process's buffer and in the shared cache, so
+#     every process can read the *effective* last_login (effective_last_login());
+#     a per-process cache breaks that (system check users.W003);
+# and the buffer is written with one bulk UPDATE per USERS_LAST_LOGIN_BATCH logins,
+# or at most USERS_LAST_LOGIN_FLUSH_SECONDS after the first buffered login, and on
+# interpreter exit. A crash loses at most that window of timestamps.
+#
+# Password-reset tokens hash last_login, so they must read the effective value, not
+# the (possibly stale) column: see users.tokens.
+
+import atexit
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+
+from .backends import forget_users
+
+KEY = "users:last-login:{}"
+
+_lock = threading.Lock()
+_pending: dict[int, object] = {}  # pk -> datetime
+_timer: threading.Timer | None = None
+
+
+def _cache_timeout() -> int:
+    # Comfortably longer than the flush window, so readers never lose a pending value
+    return settings.USERS_LAST_LOGIN_FLUSH_SECONDS * 10
+
+
+def effective_last_login(user):
+    """user.last_login, or a newer login that is still waiting to be written."""
+    if not settings.USERS_DEFER_LAST_LOGIN or user.pk is None:
+        return user.last_login
+    pending = cache.get(KEY.format(user.pk))
+    if pending and (user.last_login is None or pending > user.last_login):
+        return pending
+    return user.last_login
+
+
+def record_login(sender, user, **kwargs):
+    """user_logged_in receiver used instead of django's update_last_login."""
+    if not settings.USERS_DEFER_LAST_LOGIN:
+        update_last_login(sender, user, **kwargs)
+        return
+
+    now = timezone.now()
+    user.last_login = now
+    cache.set(KEY.format(user.pk), now, timeout=_cache_timeout())
+
+    global _timer
+    with _lock:
+        _pending[user.pk] = now
+        full = len(_pending) >= settings.USERS_LAST_LOGIN_BATCH
+        if not full and _timer is None:
+            _timer = threading.Timer(settings.USERS_LAST_LOGIN_FLUSH_SECONDS, _flush_in_thread)
+            _timer.daemon = True
+            _timer.start()
+    if full:
+        flush()
+
+
+def flush() -> int:
+    """Write buffered timestamps with one bulk UPDATE; returns the number of users."""
+    global _timer
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    if not batch:
+        return 0
+    User = get_user_model()
+    try:
+        User.objects.bulk_update(
+            [User(pk=pk, last_login=ts) for pk, ts in batch.items()],
+            ["last_login"],
+            batch_size=500,
+        )
+    except Exception:
+        with _lock:  # keep them for the next flush (newer logins win)
+            for pk, ts in batch.items():
+                _pending.setdefault(pk, ts)
+        raise
+    forget_users(batch)  # bulk_update skips post_save
+    return len(batch)
+
+
+def _flush_in_thread():
+    try:
+        flush()
+    finally:
+        connections.close_all()  # this thread's connections only
+
+
+def install() -> None:
+    """
+    Replace django's update_last_login receiver (called from UsersConfig.ready).
+    record_login() falls back to it while deferral is off, so the setting can change
+    at runtime (override_settings).
+    """
+    user_logged_in.disconnect(update_last_login, dispatch_uid="update_last_login")
+    user_logged_in.connect(record_login, dispatch_uid="users.record_login")
+    atexit.register(flush)
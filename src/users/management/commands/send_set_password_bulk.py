@@ -0,0 +1,217 @@
+# src/users/management/commands/send_set_password_bulk.py
+#
+# Send set-password invites to many users at once, paced for the SMTP provider.
+#
+# Select users by any combination of:
+#   --file PATH            emails listed in a file (csv/ndjson/xlsx with an `email` column)
+#   --role ROLE            e.g. student
+#   --unusable-only        only users who have never set a password
+#   --joined-after/--joined-before YYYY-MM-DD
+# Only active users are considered.
+#
+# Users are streamed in primary-key order (QuerySet.iterator) and invites go out
+# through core.mail.BatchMailer, throttled by a token bucket (--per-second /
+# --per-hour, defaults from EMAIL_RATE_PER_SECOND / EMAIL_RATE_PER_HOUR).
+#
+# With --checkpoint, progress is recorded as it happens: the highest pk handled
+# and the pks whose invite failed. --resume skips every user up to that pk except
+# the failed ones, which are retried, so a re-run after a crash, Ctrl-C or SMTP
+# errors neither emails anyone twice nor drops anyone. The checkpoint is removed
+# only after a run with no failures.
+#
+# Examples:
+#   python src/manage.py send_set_password_bulk --role=student --unusable-only --dry-run
+#   python src/manage.py send_set_password_bulk --role=student --unusable-only \
+#       --joined-after=2025-09-01 --checkpoint=tmp/invites.json --domain=langcon.example.org
+#   python src/manage.py send_set_password_bulk --file=data/intake.csv \
+#       --checkpoint=tmp/invites.json --resume
+
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from core.mail import BatchMailer
+from core.ratelimit import RateLimiter
+from users.checkpoints import Checkpoint
+from users.emails import compile_invite
+from users.seed_sources import open_source, SourceError
+
+User = get_user_model()
+
+# Up to this many file emails are pushed into the query (lowercased email IN ...);
+# larger lists are matched in Python while streaming, to stay under backend
+# parameter limits. Both compare lowercased addresses.
+MAX_EMAIL_IN = 1000
+
+
+class Command(BaseCommand):
+    help = "Send set-password invites to many users (file / role / date filters), rate-limited."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", default=None, help="File of emails (needs 'email' column).")
+        parser.add_argument("--role", choices=User.Roles.values, default=None)
+        parser.add_argument(
+            "--unusable-only",
+            action="store_true",
+            help="Only users without a usable password (never set one).",
+        )
+        parser.add_argument("--joined-after", type=date.fromisoformat, default=None)
+        parser.add_argument("--joined-before", type=date.fromisoformat, default=None)
+        parser.add_argument("--domain", default=None, help="Domain override, e.g. localhost:8000")
+        parser.add_argument("--https", action="store_true", help="Use https in links")
+        parser.add_argument(
+            "--per-second",
+            type=float,
+            default=None,
+            help="Max emails per second (default: settings.EMAIL_RATE_PER_SECOND; 0 = no limit).",
+        )
+        parser.add_argument(
+            "--per-hour",
+            type=float,
+            default=None,
+            help="Max emails per hour (default: settings.EMAIL_RATE_PER_HOUR; 0 = no limit).",
+        )
+        parser.add_argument("--checkpoint", default=None, help="Progress file for --resume.")
+        parser.add_argument(
+            "--resume", action="store_true", help="Skip users already sent per --checkpoint."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="List matching users; send nothing."
+        )
+
+    def handle(self, *args, **opts):
+        filters = {
+            "file": opts["file"],
+            "role": opts["role"],
+            "unusable_only": opts["unusable_only"],
+            "joined_after": opts["joined_after"] and opts["joined_after"].isoformat(),
+            "joined_before": opts["joined_before"] and opts["joined_before"].isoformat(),
+        }
+        if not any(filters.values()):
+            raise CommandError(
+                "Pass at least one of --file, --role, --unusable-only, --joined-after/--before"
+            )
+        if opts["resume"] and not opts["checkpoint"]:
+            raise CommandError("--resume requires --checkpoint")
+
+        emails = self._read_emails(opts["file"]) if opts["file"] else None
+        users = self._queryset(opts, emails)
+
+        checkpoint = Checkpoint(opts["checkpoint"]) if opts["checkpoint"] else None
+        state = checkpoint.load() if checkpoint and opts["resume"] else None
+        progress = {"filters": filters, "last_pk": 0, "sent": 0, "failed": []}
+        if state:
+            if state.get("filters") != filters:
+                raise CommandError(
+                    "Checkpoint was written with different filters; rerun without --resume"
+                )
+            progress.update(
+                last_pk=state["last_pk"], sent=state["sent"], failed=state.get("failed", [])
+            )
+            users = users.filter(Q(pk__gt=progress["last_pk"]) | Q(pk__in=progress["failed"]))
+            self.stdout.write(
+                self.style.NOTICE(
+                    f"Resuming after user id {progress['last_pk']} ({progress['sent']} sent, "
+                    f"{len(progress['failed'])} failed to retry)"
+                )
+            )
+
+        if opts["dry_run"]:
+            n = 0
+            for user in users.iterator(chunk_size=500):
+                if emails is None or user.email.lower() in emails:
+                    n += 1
+                    self.stdout.write(f"would invite: {user.email}")
+            self.stdout.write(self.style.SUCCESS(f"Dry run: {n} user(s) match."))
+            return
+
+        domain = opts["domain"] or getattr(settings, "SITE_DOMAIN", "") or "localhost:8000"
+        use_https = opts["https"]
+        per_second = opts["per_second"]
+        per_hour = opts["per_hour"]
+        limiter = RateLimiter(
+            per_second=(
+                getattr(settings, "EMAIL_RATE_PER_SECOND", 0) if per_second is None else per_second
+            ),
+            per_hour=getattr(settings, "EMAIL_RATE_PER_HOUR", 0) if per_hour is None else per_hour,
+        )
+
+        failed = set(progress["failed"])
+
+        def record(pk, ok):
+            progress["last_pk"] = max(progress["last_pk"], pk)
+            if ok:
+                progress["sent"] += 1
+                failed.discard(pk)
+            else:
+                failed.add(pk)
+            progress["failed"] = sorted(failed)
+            if checkpoint:
+                checkpoint.save(progress)
+
+        invite = compile_invite(domain=domain, use_https=use_https)
+        mailer = BatchMailer(
+            limiter=limiter,
+            on_sent=lambda pk, message: record(pk, True),
+            on_failed=lambda pk, message: record(pk, False),
+        )
+        retry = set(failed)
+        with mailer:
+            for user in users.iterator(chunk_size=500):
+                if emails is not None and user.email.lower() not in emails:
+                    continue
+                retry.discard(user.pk)
+                mailer.add(invite.message(user), key=user.pk)
+        # Earlier failures that no longer match the filters (e.g. set a password since)
+        failed -= retry
+
+        for email in mailer.failed_recipients:
+            self.stderr.write(f"[failed] {email}")
+        if checkpoint and not failed:
+            checkpoint.clear()
+        elif checkpoint:
+            progress["failed"] = sorted(failed)
+            checkpoint.save(progress)
+            self.stderr.write(
+                f"{len(failed)} invite(s) failed; rerun with --resume to retry them "
+                f"(checkpoint kept: {checkpoint.path})"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Invites sent={mailer.sent} failed={mailer.failed} "
+                f"(total with earlier runs: {progress['sent']})"
+            )
+        )
+
+    def _read_emails(self, path: str) -> set[str]:
+        try:
+            with open_source(path) as source:
+                if "email" not in source.headers:
+                    raise CommandError(f"{path} has no 'email' column")
+                return {
+                    row["email"].strip().lower()
+                    for row, _ in source
+                    if row.get("email", "").strip()
+                }
+        except SourceError as exc:
+            raise CommandError(str(exc)) from exc
+
+    def _queryset(self, opts, emails: set[str] | None):
+        qs = User.objects.filter(is_active=True)
+        if opts["role"]:
+            qs = qs.filter(role=opts["role"])
+        if opts["unusable_only"]:
+            # AbstractBaseUser.set_unusable_password() stores "!" + random suffix
+            qs = qs.filter(password__startswith="!")
+        if opts["joined_after"]:
+            qs = qs.filter(date_joined__date__gte=opts["joined_after"])
+        if opts["joined_before"]:
+            qs = qs.filter(date_joined__date__lt=opts["joined_before"])
+        if emails is not None and len(emails) <= MAX_EMAIL_IN:
+            # Case-insensitive, like the Python check used for longer lists
+            qs = qs.alias(email_lower=Lower("email")).filter(email_lower__in=emails)
+        return qs.order_by("pk")
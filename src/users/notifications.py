@@ -0,0 +1,247 @@
+# src/users/notifications.py
+#
+# One place where account emails are requested, merged and sent.
+#
+# Code asks for a notification with notify(user, kind).
+#
+# INVITE is durable: it is written to the task queue (users.send_invites jobs) right
+# away, in the caller's transaction, so the job exists if and only if the user row
+# was committed (tasks.queue). Requests within one transaction are merged into the
+# same job rows (up to INVITE_BATCH users each, one SMTP session per job), so a bulk
+# import queues a handful of jobs, not one per user.
+#
+# Other kinds (WELCOME) carry data that must not leave the process (a temporary
+# password), so they are collected per unit of work and handed to the unit's handler:
+#   - inside a transaction: at commit, by a single on_commit callback (dropped with
+#     the transaction on rollback);
+#   - inside `with collect_notifications():` (e.g. a management command run): when the
+#     block exits or unit.flush() is called, including requests whose transactions
+#     committed inside the block.
+#
+# Merging rules, per recipient:
+#   - the same kind requested twice is sent once;
+#   - WELCOME supersedes INVITE (the welcome mail carries its own set-password link):
+#     requesting a WELCOME, or cancel_invites(), takes the user out of the invite jobs
+#     queued by a transaction that is still open. seed_students --send-welcome calls
+#     cancel_invites() in the transaction that creates the users, so they get one
+#     email, not two. An invite whose transaction has committed is not recalled.
+#
+# Handlers receive every surviving notification of their kind at once. WELCOME needs
+# a handler from the unit that requests it (see seed_students).
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import threading
+
+from django.db import transaction
+
+from tasks.models import Task
+from tasks.queue import enqueue
+
+INVITE = "invite"
+WELCOME = "welcome"
+
+# kind -> kinds it makes redundant for the same user
+SUPERSEDES = {WELCOME: {INVITE}}
+
+# Invites per queued job (one SMTP session each)
+INVITE_BATCH = 200
+
+_local = threading.local()
+
+
+@dataclass
+class Notification:
+    kind: str
+    user: object
+    data: dict = field(default_factory=dict)
+
+
+# --- durable invites -----------------------------------------------------------
+
+
+class _InviteJob:
+    """A users.send_invites job written in the current transaction, still growing."""
+
+    def __init__(self, key: tuple):
+        self.key = key  # savepoint ids at creation
+        self.user_ids: list[int] = []
+        self.task: Task | None = None  # None when the queue runs eagerly
+
+    def release(self):
+        # Committed: the job is out of our hands (the worker may run it any time)
+        jobs = getattr(_local, "invite_jobs", [])
+        if self in jobs:
+            jobs.remove(self)
+
+    def save(self, new: bool) -> None:
+        if new:
+            # Eager mode runs the job after commit with this very list
+            self.task = enqueue("users.send_invites", user_ids=self.user_ids)
+        elif self.task is not None and self.user_ids:
+            Task.objects.filter(pk=self.task.pk).update(payload={"user_ids": self.user_ids})
+        elif self.task is not None:
+            Task.objects.filter(pk=self.task.pk).delete()
+            self.task = None
+
+
+def _open_invite_jobs(connection) -> list[_InviteJob]:
+    """Jobs of transactions still open (a rolled-back one lost its on_commit callback)."""
+    registered = {id(getattr(cb, "__self__", None)) for _, cb, _ in connection.run_on_commit}
+    jobs = [j for j in getattr(_local, "invite_jobs", []) if id(j) in registered]
+    _local.invite_jobs = jobs
+    return jobs
+
+
+def queue_invites(user_pks) -> None:
+    """Write invite jobs for `user_pks` in the caller's transaction, merged per transaction."""
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        pks = list(dict.fromkeys(user_pks))
+        for i in range(0, len(pks), INVITE_BATCH):
+            enqueue("users.send_invites", user_ids=pks[i : i + INVITE_BATCH])
+        return
+
+    jobs = _open_invite_jobs(connection)
+    queued = {pk for job in jobs for pk in job.user_ids}
+    key = tuple(connection.savepoint_ids)
+    changed: dict[_InviteJob, bool] = {}  # job -> is new
+    for pk in user_pks:
+        if pk in queued:
+            continue
+        queued.add(pk)
+        job = next((j for j in reversed(jobs) if j.key == key), None)
+        if job is None or len(job.user_ids) >= INVITE_BATCH:
+            job = _InviteJob(key)
+            transaction.on_commit(job.release)
+            jobs.append(job)
+            changed[job] = True
+        changed.setdefault(job, False)
+        job.user_ids.append(pk)
+    for job, new in changed.items():
+        job.save(new)
+
+
+def cancel_invites(user_pks) -> None:
+    """Take users out of the invite jobs their (still open) transaction has queued."""
+    pks = set(user_pks)
+    for job in _open_invite_jobs(transaction.get_connection()):
+        if pks.intersection(job.user_ids):
+            job.user_ids[:] = [pk for pk in job.user_ids if pk not in pks]
+            job.save(False)
+
+
+def merge(notifications: list[Notification]) -> dict[str, list[Notification]]:
+    """Apply the merging rules; returns surviving notifications grouped by kind."""
+    latest: dict[tuple[int, str], Notification] = {}
+    for n in notifications:
+        latest[(n.user.pk, n.kind)] = n  # later request wins (e.g. newest password)
+
+    kinds_by_user: dict[int, set[str]] = {}
+    for user_pk, kind in latest:
+        kinds_by_user.setdefault(user_pk, set()).add(kind)
+
+    grouped: dict[str, list[Notification]] = {}
+    for (user_pk, kind), n in latest.items():
+        superseded = any(
+            kind in SUPERSEDES.get(other, ()) for other in kinds_by_user[user_pk] if other != kind
+        )
+        if not superseded:
+            grouped.setdefault(kind, []).append(n)
+    return grouped
+
+
+class NotificationUnit:
+    """Collects notifications (or, once closed, dispatches whatever it is given)."""
+
+    def __init__(self, handlers: dict | None = None, *, closed: bool = False, depth: int = 0):
+        self.handlers = dict(handlers or {})
+        self.pending: list[Notification] = []
+        self.closed = closed
+        # Atomic blocks already open when the unit began: from the unit's point of
+        # view, work at this depth is committed (it stands or falls with the caller).
+        self.depth = depth
+
+    def add(self, notifications: list[Notification]) -> None:
+        if self.closed:
+            self.dispatch(notifications)
+        else:
+            self.pending += notifications
+
+    def flush(self) -> None:
+        """Send everything collected so far (committed work only)."""
+        batch, self.pending = self.pending, []
+        self.dispatch(batch)
+
+    def dispatch(self, notifications: list[Notification]) -> None:
+        for kind, items in merge(notifications).items():
+            try:
+                handler = self.handlers[kind]
+            except KeyError:
+                raise LookupError(f"No handler for {kind!r} notifications") from None
+            handler(items)
+
+
+def _current_unit() -> NotificationUnit | None:
+    return getattr(_local, "unit", None)
+
+
+@contextmanager
+def collect_notifications(handlers: dict | None = None):
+    """
+    Collect notifications until the block exits, then send them as one merged batch.
+    Nested blocks join the outermost one (their handlers are added to it).
+    """
+    outer = _current_unit()
+    if outer is not None:
+        outer.handlers.update(handlers or {})
+        yield outer
+        return
+
+    unit = NotificationUnit(handlers, depth=len(transaction.get_connection().atomic_blocks))
+    _local.unit = unit
+    try:
+        yield unit
+    finally:
+        _local.unit = None
+        unit.closed = True
+        # Also on error: what was collected belongs to work that already committed
+        unit.flush()
+
+
+def notify(user, kind: str, **data) -> None:
+    """Request `kind` email for `user` (saved); sent with the current unit of work."""
+    if kind == INVITE:
+        queue_invites([user.pk])
+        return
+    if INVITE in SUPERSEDES.get(kind, ()):
+        cancel_invites([user.pk])
+
+    n = Notification(kind, user, data)
+    target = _current_unit() or NotificationUnit(closed=True)  # no unit → send when committed
+    connection = transaction.get_connection()
+
+    if len(connection.atomic_blocks) <= target.depth:
+        target.add([n])  # not inside a transaction of our own: already committed
+        return
+
+    # One buffer + one on_commit callback per transaction (per savepoint level, so a
+    # rolled-back savepoint discards its own requests along with its callback). A
+    # buffer whose callback is no longer registered belonged to a transaction that
+    # has ended: start a new one.
+    key = tuple(connection.savepoint_ids)
+    buffers = getattr(_local, "buffers", None)
+    if buffers is None:
+        buffers = _local.buffers = {}
+    buffer = buffers.get(key)
+    if buffer is None or not any(cb is buffer[0] for _, cb, _ in connection.run_on_commit):
+        items: list[Notification] = []
+
+        def release():
+            if buffers.get(key, (None,))[0] is release:
+                del buffers[key]
+            target.add(items)
+
+        buffers[key] = buffer = (release, items)
+        transaction.on_commit(release)
+    buffer[1].append(n)
@@ -1,5 +1,8 @@
+from django.conf import settings
 from import_export import fields, resources
 
+from .bulk import bulk_user_operations
+from .hashing import PasswordHashPool
 from .models import User
 
 
@@ -29,3 +32,58 @@ class UserResource(resources.ModelResource):
             "is_active",
             "date_joined",
         )
+
+    def import_data(self, dataset, dry_run=False, *args, **kwargs):
+        self._dry_run = dry_run  # before_import() is not told
+        # Coalesce profile creation and invite emails for the whole import
+        with bulk_user_operations() as ops:
+            result = super().import_data(dataset, dry_run, *args, **kwargs)
+            if dry_run:
+                # Preview: the rows were rolled back, so replay nothing for them
+                ops.discard()
+            return result
+
+    # --- optional 'password' column on import --------------------------------
+    # Off unless settings.USERS_IMPORT_PASSWORDS. Not a declared field, so it is
+    # never exported. It only sets the password of accounts the import *creates*
+    # with the student role and no staff/superuser flag: an existing account
+    # (matched by email) keeps its password, so a spreadsheet cannot take over a
+    # staff login. Eligible cells are hashed up front in one PasswordHashPool pass
+    # (settings.USERS_HASH_WORKERS processes), except on a dry run (preview), and
+    # the hash is assigned just before each instance is saved.
+
+    def before_import(self, dataset, **kwargs):
+        super().before_import(dataset, **kwargs)
+        self._password_hashes = {}
+        if (
+            not getattr(settings, "USERS_IMPORT_PASSWORDS", False)
+            or getattr(self, "_dry_run", False)
+            or "password" not in (dataset.headers or [])
+        ):
+            return
+
+        pairs = [
+            (str(email or "").strip(), str(password).strip())
+            for email, password in zip(dataset["email"], dataset["password"], strict=True)
+            if password is not None and str(password).strip()
+        ]
+        existing = set(
+            User.objects.filter(email__in=[email for email, _ in pairs]).values_list(
+                "email", flat=True
+            )
+        )
+        pairs = [(email, password) for email, password in pairs if email not in existing]
+        workers = getattr(settings, "USERS_HASH_WORKERS", 0)
+        with PasswordHashPool(workers=workers) as pool:
+            hashes = pool.hash_many([password for _, password in pairs])
+        self._password_hashes = {email: h for (email, _), h in zip(pairs, hashes, strict=True)}
+
+    def before_save_instance(self, instance, row, **kwargs):
+        super().before_save_instance(instance, row, **kwargs)
+        if instance.pk is not None or not instance.is_student:
+            return
+        if instance.is_staff or instance.is_superuser:
+            return
+        encoded = getattr(self, "_password_hashes", {}).get(str(row.get("email") or "").strip())
+        if encoded:
+            instance.password = encoded
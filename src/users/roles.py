@@ -0,0 +1,77 @@
+# src/users/roles.py
+#
+# Role routing: which page is "home" for each role (post-login redirect, and where
+# role_required sends users who hit a page that is not theirs).
+#
+# One registry, built from DEFAULT_ROLE_HOMES overlaid with
+# settings.USERS_ROLE_REDIRECTS. URL names are reversed once and the resulting paths
+# kept; the map is rebuilt when either setting or the URLconf changes
+# (setting_changed, so @override_settings in tests works). A system check
+# (users.E001) reports URL names that do not reverse at startup instead of at the
+# first login.
+
+from django.conf import settings
+from django.core import checks
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import NoReverseMatch, reverse
+
+# role -> URL name; settings.USERS_ROLE_REDIRECTS overrides per role
+DEFAULT_ROLE_HOMES = {
+    "student": "users:student_home",
+    "teacher": "users:teacher_home",
+    "admin": "users:admin_home",
+}
+# Unknown/missing role after login
+FALLBACK_ROLE = "student"
+
+_routes: dict[str, tuple[str, str]] | None = None  # role -> (URL name, path)
+
+
+def role_url_names() -> dict[str, str]:
+    """role -> URL name, defaults overlaid with settings."""
+    return {**DEFAULT_ROLE_HOMES, **(getattr(settings, "USERS_ROLE_REDIRECTS", None) or {})}
+
+
+def _get_routes() -> dict[str, tuple[str, str]]:
+    global _routes
+    if _routes is None:
+        _routes = {role: (name, reverse(name)) for role, name in role_url_names().items()}
+    return _routes
+
+
+def role_home_name(role) -> str | None:
+    """URL name of `role`'s home page, or None for an unknown role."""
+    route = _get_routes().get(role)
+    return route[0] if route else None
+
+
+def role_home_url(role) -> str:
+    """Resolved home path for `role` (unknown roles get the FALLBACK_ROLE home)."""
+    routes = _get_routes()
+    return (routes.get(role) or routes[FALLBACK_ROLE])[1]
+
+
+@receiver(setting_changed)
+def _reset_routes(*, setting, **kwargs):
+    global _routes
+    if setting in ("USERS_ROLE_REDIRECTS", "ROOT_URLCONF"):
+        _routes = None
+
+
+@checks.register(checks.Tags.urls)
+def check_role_homes(app_configs=None, **kwargs):
+    errors = []
+    for role, name in role_url_names().items():
+        try:
+            reverse(name)
+        except NoReverseMatch:
+            errors.append(
+                checks.Error(
+                    f"Home page for role {role!r} is {name!r}, which is not a known URL name.",
+                    hint="Fix USERS_ROLE_REDIRECTS (or users.roles.DEFAULT_ROLE_HOMES).",
+                    obj="USERS_ROLE_REDIRECTS",
+                    id="users.E001",
+                )
+            )
+    return errors
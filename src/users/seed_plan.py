@@ -0,0 +1,230 @@
+# src/users/seed_plan.py
+#
+# Plan/apply for `seed_students --plan` / `--apply`.
+#
+# build_plan() reads the rows once, compares them against existing users with a
+# handful of set-based queries and returns a JSON-serialisable diff:
+#   create      new students (password already hashed)
+#   update      name and/or password changes for existing users (only with --update)
+#   exists      existing users left alone because --update was not given
+#   unchanged   existing users whose row changes nothing
+#   duplicates  later rows repeating an email already seen in the file. With --update
+#               they are folded into the first row's entry (provided names and
+#               password win), exactly as a direct or --bulk run applies them to the
+#               user the first row created or updated; otherwise they are ignored
+#               (a direct run skips them too: the user exists by then)
+#   invalid     rows with a missing or invalid email (ignored)
+#
+# apply_plan() executes exactly that diff without the source file. It refuses a
+# stale plan (a planned create now exists, a planned update's user vanished or its
+# names changed since planning) instead of guessing.
+#
+# Plans contain password HASHES, never plain text. Treat the file as a secret.
+
+from dataclasses import replace
+import json
+import os
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .hashing import PasswordHashPool
+from .seeding import clean_row, INVALID_EMAIL, write_users
+
+User = get_user_model()
+
+PLAN_VERSION = 1
+NAME_FIELDS = ("first_name", "last_name")
+
+
+class PlanError(Exception):
+    """The plan file is unreadable or no longer matches the database."""
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def build_plan(
+    rows,
+    *,
+    source: str,
+    update: bool,
+    default_password: str | None,
+    hash_pool: PasswordHashPool | None = None,
+    lookup_batch: int = 1000,
+) -> dict:
+    """
+    rows: iterable of raw dicts (e.g. a seed source), numbered from 1 in order.
+    """
+    hash_pool = hash_pool or PasswordHashPool()
+    first_seen: dict[str, object] = {}
+    duplicates, invalid = [], []
+
+    for row_no, raw in enumerate(rows, start=1):
+        problem, cleaned = clean_row(row_no, raw)
+        if problem:
+            reason = "invalid" if problem == INVALID_EMAIL else "missing"
+            invalid.append({"row": row_no, "email": cleaned, "reason": reason})
+        elif cleaned.email in first_seen:
+            first = first_seen[cleaned.email]
+            duplicates.append(
+                {"row": row_no, "email": cleaned.email, "first_row": first.row_no, "merged": update}
+            )
+            if update:
+                first_seen[cleaned.email] = replace(
+                    first,
+                    first_name=cleaned.first_name or first.first_name,
+                    last_name=cleaned.last_name or first.last_name,
+                    password=cleaned.password or first.password,
+                )
+        else:
+            first_seen[cleaned.email] = cleaned
+
+    # One query per `lookup_batch` emails instead of one per row
+    existing: dict[str, dict] = {}
+    for batch in _chunks(list(first_seen), lookup_batch):
+        for u in User.objects.filter(email__in=batch).values("id", "email", *NAME_FIELDS):
+            existing[u["email"].lower()] = u
+
+    creates, updates, exists, unchanged = [], [], [], []
+    to_hash: list[tuple[dict, str | None]] = []
+
+    for email, row in first_seen.items():
+        current = existing.get(email)
+        if current is None:
+            # CREATE path password choice: CSV > --default > unusable(None)
+            chosen = row.password or (default_password or "") or None
+            entry = {
+                "row": row.row_no,
+                "email": email,
+                "first_name": row.first_name,
+                "last_name": row.last_name,
+                "password_source": "csv" if row.password else ("default" if chosen else None),
+            }
+            creates.append(entry)
+            to_hash.append((entry, chosen))
+            continue
+
+        if not update:
+            exists.append({"row": row.row_no, "email": email, "id": current["id"]})
+            continue
+
+        changes = {}
+        for field in NAME_FIELDS:
+            new = getattr(row, field)
+            if new and current[field] != new:
+                changes[field] = {"from": current[field], "to": new}
+        entry = {"row": row.row_no, "email": email, "id": current["id"], "changes": changes}
+        # For UPDATES, only change password if CSV provides one
+        if row.password:
+            changes["password"] = True
+            to_hash.append((entry, row.password))
+        if changes:
+            updates.append(entry)
+        else:
+            unchanged.append({"row": row.row_no, "email": email, "id": current["id"]})
+
+    hashes = hash_pool.hash_many([password for _, password in to_hash])
+    for (entry, _), encoded in zip(to_hash, hashes, strict=True):
+        entry["password"] = encoded
+
+    return {
+        "version": PLAN_VERSION,
+        "source": source,
+        "generated_at": timezone.now().isoformat(),
+        "options": {"update": update, "default_password": bool(default_password)},
+        "summary": {
+            "rows": len(first_seen) + len(duplicates) + len(invalid),
+            "create": len(creates),
+            "update": len(updates),
+            "name_changes": sum(1 for u in updates if set(u["changes"]) & set(NAME_FIELDS)),
+            "password_changes": sum(1 for u in updates if "password" in u["changes"]),
+            "exists": len(exists),
+            "unchanged": len(unchanged),
+            "duplicates": len(duplicates),
+            "invalid": len(invalid),
+        },
+        "create": creates,
+        "update": updates,
+        "exists": exists,
+        "unchanged": unchanged,
+        "duplicates": duplicates,
+        "invalid": invalid,
+    }
+
+
+def write_plan(plan: dict, path: str | Path) -> None:
+    # Contains password hashes: owner-only from the moment the file exists
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)  # an existing file keeps its old mode otherwise
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=2)
+
+
+def read_plan(path: str | Path) -> dict:
+    try:
+        plan = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise PlanError(f"Could not read plan {path}: {exc}") from exc
+    if plan.get("version") != PLAN_VERSION:
+        raise PlanError(f"Unsupported plan version: {plan.get('version')!r}")
+    return plan
+
+
+def apply_plan(plan: dict, *, batch_size: int = 500, lookup_batch: int = 1000) -> dict:
+    """Execute a plan in one transaction; returns {"created": n, "updated": n}."""
+    creates, updates = plan["create"], plan["update"]
+
+    conflicts = []
+    for batch in _chunks([c["email"] for c in creates], lookup_batch):
+        conflicts += User.objects.filter(email__in=batch).values_list("email", flat=True)
+    if conflicts:
+        raise PlanError(
+            f"Stale plan: {len(conflicts)} planned create(s) now exist, e.g. {conflicts[0]}"
+        )
+
+    users_by_id: dict[int, User] = {}
+    for batch in _chunks([u["id"] for u in updates], lookup_batch):
+        users_by_id.update(User.objects.in_bulk(batch))
+
+    to_update = []
+    for entry in updates:
+        user = users_by_id.get(entry["id"])
+        if user is None:
+            raise PlanError(
+                f"Stale plan: user {entry['email']} (id={entry['id']}) no longer exists"
+            )
+        for field in NAME_FIELDS:
+            change = entry["changes"].get(field)
+            if change is None:
+                continue
+            if getattr(user, field) != change["from"]:
+                raise PlanError(f"Stale plan: {field} of {entry['email']} changed since planning")
+            setattr(user, field, change["to"])
+        if entry["changes"].get("password"):
+            user.password = entry["password"]
+        to_update.append(user)
+
+    to_create = [
+        User(
+            email=c["email"],
+            password=c["password"],
+            role=User.Roles.STUDENT,
+            first_name=c["first_name"],
+            last_name=c["last_name"],
+            is_active=True,
+            is_staff=False,
+            is_superuser=False,
+        )
+        for c in creates
+    ]
+    write_users(
+        to_create,
+        to_update,
+        fields=("first_name", "last_name", "password"),
+        batch_size=batch_size,
+    )
+    return {"created": len(to_create), "updated": len(to_update)}
@@ -0,0 +1,256 @@
+# src/users/seed_sources.py
+#
+# Streaming row sources for `seed_students`.
+#
+# A source is opened once, exposes the header row, and yields (row_dict, position)
+# pairs where `position` is what a checkpoint needs to continue right after that
+# row. Nothing is loaded into memory beyond the current row.
+#
+# Supported inputs (picked from the file name, or forced with format=...):
+#   .csv / .csv.gz                 byte offset (decompressed offset for .gz)
+#   .ndjson / .jsonl (+ .gz)       one JSON object per line; byte offset
+#   .xlsx                          first worksheet, read-only streaming; row index
+#   "-"                            stdin (CSV unless format says otherwise); not resumable
+
+import csv
+import gzip
+import json
+from pathlib import Path
+import sys
+
+STDIN = "-"
+FORMATS = ("csv", "ndjson", "xlsx")
+
+
+class SourceError(Exception):
+    """The input cannot be opened or parsed."""
+
+
+class _TrackedLines:
+    """
+    Iterate a binary file line by line, decoding as we go and remembering the byte
+    offset just past the last line handed out. csv.reader pulls lines lazily, so after
+    it yields a record this offset is exactly the end of that record (multi-line
+    quoted fields included).
+    """
+
+    def __init__(self, fh, encoding: str, offset: int = 0):
+        self.fh = fh
+        self.encoding = encoding
+        self.offset = offset
+
+    def __iter__(self):
+        for raw in iter(self.fh.readline, b""):
+            self.offset += len(raw)
+            yield raw.decode(self.encoding)
+
+
+class RowSource:
+    """
+    Usage:
+        with open_source("students.csv.gz") as source:
+            source.headers          # ['email', 'first_name', ...]
+            source.seek(position)   # optional: resume after a checkpoint
+            for row, position in source:
+                ...
+    """
+
+    def __init__(self, path: str | Path, encoding: str = "utf-8"):
+        self.path = path if path == STDIN else Path(path)
+        self.encoding = encoding
+        self.resumable = self.path != STDIN
+        self.headers: list[str] = []
+        self._opened = False
+
+    @property
+    def name(self) -> str:
+        return "<stdin>" if self.path == STDIN else str(self.path)
+
+    @property
+    def identity(self) -> str:
+        """Stable id stored in checkpoints and plans."""
+        return self.name if self.path == STDIN else str(self.path.resolve())
+
+    def open(self) -> "RowSource":
+        """Open the input and read the header (idempotent)."""
+        if not self._opened:
+            try:
+                self._open()
+            except SourceError:
+                raise
+            except Exception as exc:
+                raise SourceError(f"Could not read {self.name}: {exc}") from exc
+            self._opened = True
+        return self
+
+    def close(self) -> None:
+        if self._opened:
+            self._close()
+            self._opened = False
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- subclass hooks --------------------------------------------------------
+
+    def _open(self) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        raise NotImplementedError
+
+    @property
+    def position(self) -> int:
+        raise NotImplementedError
+
+    def seek(self, position: int) -> None:
+        raise NotImplementedError
+
+    def __iter__(self):
+        raise NotImplementedError
+
+
+class _LineSource(RowSource):
+    """Shared plumbing for line-based formats (plain or gzipped, file or stdin)."""
+
+    def _open(self) -> None:
+        if self.path == STDIN:
+            self._fh = sys.stdin.buffer
+        elif self.path.name.endswith(".gz"):
+            self._fh = gzip.open(self.path, "rb")
+        else:
+            self._fh = self.path.open("rb")
+        self._lines = _TrackedLines(self._fh, self.encoding)
+        self._read_header()
+
+    def _close(self) -> None:
+        if self._fh is not sys.stdin.buffer:
+            self._fh.close()
+
+    def _read_header(self) -> None:
+        raise NotImplementedError
+
+    @property
+    def position(self) -> int:
+        return self._lines.offset
+
+    def seek(self, position: int) -> None:
+        """Continue reading at a byte offset previously reported by this source."""
+        if not self.resumable:
+            raise SourceError(f"{self.name} is not seekable; cannot resume")
+        self._fh.seek(position)  # gzip: offset in the decompressed stream
+        self._lines.offset = position
+
+
+class CSVSource(_LineSource):
+    def _read_header(self) -> None:
+        self._reader = csv.reader(self._lines)
+        self.headers = next(self._reader, None) or []
+
+    def __iter__(self):
+        for values in self._reader:
+            if not values:  # blank line; csv.DictReader skips these too
+                continue
+            yield dict(zip(self.headers, values)), self._lines.offset
+
+
+class NDJSONSource(_LineSource):
+    """
+    One JSON object per line. There is no header row: the keys of the first object
+    stand in for it (enough to check for 'email'/'password' up front).
+    """
+
+    def _read_header(self) -> None:
+        self._lines_iter = iter(self._lines)
+        self._first = None
+        for line in self._lines_iter:
+            if line.strip():
+                self._first = (self._parse(line), self._lines.offset)
+                break
+        self.headers = list(self._first[0]) if self._first else []
+
+    def _parse(self, line: str) -> dict:
+        try:
+            obj = json.loads(line)
+        except ValueError as exc:
+            raise SourceError(f"{self.name}: invalid JSON near byte {self._lines.offset}") from exc
+        if not isinstance(obj, dict):
+            raise SourceError(f"{self.name}: expected one JSON object per line")
+        # Same shape as csv rows: text values, missing/null → ""
+        return {str(k): "" if v is None else str(v) for k, v in obj.items()}
+
+    def seek(self, position: int) -> None:
+        super().seek(position)
+        self._first = None  # header peek is before any checkpoint
+
+    def __iter__(self):
+        if self._first is not None:
+            first, self._first = self._first, None
+            yield first
+        for line in self._lines_iter:
+            if line.strip():
+                yield self._parse(line), self._lines.offset
+
+
+class XLSXSource(RowSource):
+    """First worksheet of an .xlsx workbook, streamed with openpyxl's read-only mode."""
+
+    def _open(self) -> None:
+        if self.path == STDIN:
+            raise SourceError("XLSX cannot be read from stdin; pass a file path")
+        try:
+            from openpyxl import load_workbook
+        except ImportError as exc:
+            raise SourceError("Reading .xlsx requires openpyxl (pip install openpyxl)") from exc
+
+        self._wb = load_workbook(self.path, read_only=True, data_only=True)
+        self._ws = self._wb.worksheets[0]
+        header = next(self._ws.iter_rows(max_row=1, values_only=True), None) or ()
+        self.headers = ["" if h is None else str(h).strip() for h in header]
+        self._row_index = 0  # data rows consumed
+
+    def _close(self) -> None:
+        self._wb.close()
+
+    @property
+    def position(self) -> int:
+        return self._row_index
+
+    def seek(self, position: int) -> None:
+        self._row_index = position
+
+    def __iter__(self):
+        # Row 1 is the header; data row N lives on sheet row N + 1
+        for values in self._ws.iter_rows(min_row=self._row_index + 2, values_only=True):
+            self._row_index += 1
+            if all(v is None or v == "" for v in values):
+                continue
+            row = {h: "" if v is None else str(v) for h, v in zip(self.headers, values) if h}
+            yield row, self._row_index
+
+
+_SOURCES = {"csv": CSVSource, "ndjson": NDJSONSource, "xlsx": XLSXSource}
+
+
+def detect_format(path: str) -> str:
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".xlsx"):
+        return "xlsx"
+    return "csv"
+
+
+def open_source(path: str, fmt: str | None = None) -> RowSource:
+    """Build (but do not open) the right source for a path or "-"."""
+    if path != STDIN and not Path(path).exists():
+        raise SourceError(f"Input not found: {path}")
+    fmt = fmt or ("csv" if path == STDIN else detect_format(path))
+    if fmt not in _SOURCES:
+        raise SourceError(f"Unknown format {fmt!r}; choose from {', '.join(FORMATS)}")
+    return _SOURCES[fmt](path)
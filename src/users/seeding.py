@@ -0,0 +1,252 @@
+# src/users/seeding.py
+#
+# Set-based engine behind `seed_students --bulk`.
+#
+# Instead of one SELECT + one INSERT/UPDATE per CSV row, rows are processed in
+# chunks: all existing emails of a chunk are loaded with a single query, and the
+# resulting creates/updates are written with batched bulk_create/bulk_update.
+#
+# Semantics match the per-row path of the command:
+# - CREATE: password = CSV password > --default-password > unusable
+# - UPDATE: names update when provided and different; the password changes ONLY
+#           when the CSV row provides one (--default-password is ignored)
+# - Rows repeating an email seen earlier in the run act on that earlier user,
+#   exactly as they would when processed one by one.
+#
+# Password hashing for a chunk is done in one call to users.hashing.PasswordHashPool,
+# which can spread the work over several processes (--workers).
+
+from dataclasses import dataclass
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from .backends import forget_users
+from .bulk import bulk_user_operations
+from .hashing import PasswordHashPool
+
+User = get_user_model()
+
+# Row outcomes reported back to the command
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+EXISTS = "exists"
+MISSING_EMAIL = "missing_email"
+INVALID_EMAIL = "invalid_email"
+
+
+@dataclass
+class SeedRow:
+    """A sanitized CSV row (email already lowercased and validated)."""
+
+    row_no: int
+    email: str
+    first_name: str
+    last_name: str
+    password: str  # CSV-provided password; "" when the column is empty/missing
+
+
+@dataclass
+class RowResult:
+    """Outcome of one row, in input order."""
+
+    row_no: int
+    email: str
+    action: str
+    user: User | None = None
+    # Plain-text password the user ends up with (for welcome emails), if any
+    plain_password: str | None = None
+    pwd_changed: bool = False
+
+
+def clean_row(row_no: int, row: dict) -> tuple[str | None, SeedRow | str]:
+    """
+    Sanitize one raw CSV dict.
+
+    Returns (None, SeedRow) for a usable row, or (MISSING_EMAIL | INVALID_EMAIL, raw_email)
+    when the row must be skipped.
+    """
+    raw_email = (row.get("email") or "").strip()
+    email = raw_email.lower()  # normalize and avoid case-duplicates
+
+    if not email:
+        return MISSING_EMAIL, raw_email
+    try:
+        validate_email(email)
+    except ValidationError:
+        return INVALID_EMAIL, raw_email
+
+    return None, SeedRow(
+        row_no=row_no,
+        email=email,
+        first_name=(row.get("first_name") or "").strip(),
+        last_name=(row.get("last_name") or "").strip(),
+        password=(row.get("password") or "").strip(),
+    )
+
+
+class BulkSeeder:
+    """
+    Apply SeedRows chunk by chunk with a constant number of queries per chunk.
+
+    Usage:
+        seeder = BulkSeeder(update=True, default_password=None, dry_run=False)
+        for chunk in chunks:
+            results = seeder.process_chunk(chunk)
+    """
+
+    update_fields = ("first_name", "last_name", "password")
+
+    def __init__(
+        self,
+        *,
+        update: bool,
+        default_password: str | None,
+        dry_run: bool,
+        batch_size: int = 500,
+        hash_pool: PasswordHashPool | None = None,
+    ):
+        self.update = update
+        self.default_password = default_password
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.hash_pool = hash_pool or PasswordHashPool()
+        # Users created during a dry run are never saved; remember them so later
+        # chunks still see them as "existing", as the per-row path would.
+        self._dry_run_created: dict[str, User] = {}
+
+    # --- public API ----------------------------------------------------------
+
+    def process_chunk(self, rows: list[SeedRow]) -> list[RowResult]:
+        """Plan and (unless dry_run) write one chunk; returns one result per row."""
+        known = self._load_existing({r.email for r in rows})
+        to_create: dict[str, User] = {}
+        to_update: dict[int, User] = {}
+        # (user, plain-text password) pairs, hashed together once planning is done
+        self._pending_hashes: list[tuple[User, str | None]] = []
+        results: list[RowResult] = []
+
+        for row in rows:
+            user = known.get(row.email)
+            if user is None:
+                results.append(self._plan_create(row, known, to_create))
+            elif not self.update:
+                results.append(RowResult(row.row_no, row.email, EXISTS, user=user))
+            else:
+                results.append(self._plan_update(row, user, to_create, to_update))
+
+        if self.dry_run:
+            self._dry_run_created.update(to_create)
+        else:
+            self._apply_hashes()
+            self._flush(list(to_create.values()), list(to_update.values()))
+        return results
+
+    # --- planning ------------------------------------------------------------
+
+    def _load_existing(self, emails: set[str]) -> dict[str, User]:
+        """One query for the whole chunk, keyed by lowercased email."""
+        known = {u.email.lower(): u for u in User.objects.filter(email__in=emails)}
+        for email in emails:
+            if email not in known and email in self._dry_run_created:
+                known[email] = self._dry_run_created[email]
+        return known
+
+    def _plan_create(self, row: SeedRow, known: dict, to_create: dict) -> RowResult:
+        # CREATE path password choice: CSV > --default > unusable(None)
+        chosen = row.password or (self.default_password or "") or None
+        user = User(
+            email=row.email,
+            role=User.Roles.STUDENT,
+            first_name=row.first_name,
+            last_name=row.last_name,
+            is_active=True,
+            is_staff=False,
+            is_superuser=False,
+        )
+        self._pending_hashes.append((user, chosen))
+        known[row.email] = user
+        to_create[row.email] = user
+        return RowResult(row.row_no, row.email, CREATED, user=user, plain_password=chosen)
+
+    def _plan_update(self, row: SeedRow, user: User, to_create: dict, to_update: dict):
+        changed = False
+
+        # names update if provided and different
+        if row.first_name and user.first_name != row.first_name:
+            user.first_name = row.first_name
+            changed = True
+        if row.last_name and user.last_name != row.last_name:
+            user.last_name = row.last_name
+            changed = True
+
+        # For UPDATES, only change password if CSV provides one
+        if row.password:
+            self._pending_hashes.append((user, row.password))
+            changed = True
+
+        if not changed:
+            return RowResult(row.row_no, row.email, UNCHANGED, user=user)
+
+        # A row updating a user created earlier in this chunk folds into the INSERT
+        if row.email not in to_create and user.pk is not None:
+            to_update[user.pk] = user
+        return RowResult(
+            row.row_no,
+            row.email,
+            UPDATED,
+            user=user,
+            plain_password=row.password or None,
+            pwd_changed=bool(row.password),
+        )
+
+    # --- writing -------------------------------------------------------------
+
+    def _apply_hashes(self) -> None:
+        """Hash every password of the chunk in one pool call; later rows win."""
+        pending = self._pending_hashes
+        hashes = self.hash_pool.hash_many([password for _, password in pending])
+        for (user, _), encoded in zip(pending, hashes, strict=True):
+            user.password = encoded
+
+    def _flush(self, to_create: list[User], to_update: list[User]) -> None:
+        write_users(to_create, to_update, fields=self.update_fields, batch_size=self.batch_size)
+
+
+def write_users(
+    to_create: list[User],
+    to_update: list[User],
+    *,
+    fields: tuple[str, ...],
+    batch_size: int,
+) -> None:
+    """
+    Insert and update users in one transaction with batched statements.
+
+    bulk_create skips post_save; created users are handed to bulk_user_operations(),
+    which replays profile creation and invite emails set-wise before the commit.
+    """
+    with transaction.atomic(), bulk_user_operations() as ops:
+        if to_create:
+            User.objects.bulk_create(to_create, batch_size=batch_size)
+            _backfill_pks(to_create)
+            ops.created(to_create)
+        if to_update:
+            User.objects.bulk_update(to_update, fields, batch_size=batch_size)
+            forget_users(u.pk for u in to_update)
+
+
+def _backfill_pks(users: list[User]) -> None:
+    """Backends such as MySQL don't return ids from bulk INSERTs; fetch them in one query."""
+    missing = {u.email: u for u in users if u.pk is None}
+    if not missing:
+        return
+    for pk, email in User.objects.filter(email__in=missing).values_list("pk", "email"):
+        user = missing.get(email)
+        if user is not None:
+            user.pk = pk
+            user._state.adding = False
+            user._state.db = User.objects.db
@@ -1,15 +1,17 @@
 # src/users/signals.py
-from django.conf import settings
+from django.apps import apps as global_apps
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
-from django.db import transaction
-from django.db.models.signals import post_migrate, post_save
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
 from django.dispatch import receiver
 
-from .utils import get_domain_and_scheme, send_invite_email
+from .backends import bump_permissions_generation, forget_user_permissions, forget_users
+from .bulk import defer_created, users_bulk_created
+from .groups import sync_teacher_admin_group, TEACHER_GROUP_NAME  # noqa: F401
+from .notifications import INVITE, notify, queue_invites
 
 User = get_user_model()
-TEACHER_GROUP_NAME = "Teacher Admin"
 
 
 # -------------------------------
@@ -18,22 +20,66 @@ TEACHER_GROUP_NAME = "Teacher Admin"
 @receiver(post_save, sender=User)
 def send_invite_on_create(sender, instance, created: bool, **kwargs):
     """
-    When a new user is created without a usable password,
-    send them a set-password invite after the transaction commits.
+    When a new user is created without a usable password, request a set-password
+    invite. users.notifications queues it (tasks.queue) in the same transaction,
+    merged with the transaction's other invites, so the web request never waits on SMTP.
     """
     if not created:
         return
 
+    # Inside users.bulk.bulk_user_operations(): handled set-wise below
+    if defer_created(instance):
+        return
+
     # Skip superusers and anyone who already has a password.
     if instance.is_superuser or instance.has_usable_password():
         return
 
-    def _send():
-        domain, use_https = get_domain_and_scheme(None)
-        send_invite_email(instance, domain=domain, use_https=use_https)
+    notify(instance, INVITE)
+
 
-    # Run only after DB commit so uid/token are valid.
-    transaction.on_commit(_send)
+@receiver(users_bulk_created)
+def send_invites_for_bulk_created(sender, users, **kwargs):
+    """Set-wise version of send_invite_on_create."""
+    queue_invites([u.pk for u in users if not u.is_superuser and not u.has_usable_password()])
+
+
+# -------------------------------
+# Cached request.user (users.backends)
+# -------------------------------
+@receiver(post_save, sender=User, dispatch_uid="users.forget_cached_user_save")
+@receiver(post_delete, sender=User, dispatch_uid="users.forget_cached_user_delete")
+def forget_cached_user(sender, instance, created=False, **kwargs):
+    if not created:
+        forget_users([instance.pk])
+        # is_superuser/is_active may have changed (users.backends permission cache)
+        forget_user_permissions([instance.pk])
+
+
+@receiver(post_save, sender="profiles.Profile", dispatch_uid="users.forget_profile_save")
+@receiver(post_delete, sender="profiles.Profile", dispatch_uid="users.forget_profile_delete")
+def forget_cached_user_profile(sender, instance, **kwargs):
+    # The profile may be cached with its user (USERS_CACHE_PROFILE)
+    forget_users([instance.user_id])
+
+
+# -------------------------------
+# Shared permission cache (users.backends)
+# -------------------------------
+@receiver(m2m_changed, sender=User.groups.through, dispatch_uid="users.perms_user_groups")
+@receiver(m2m_changed, sender=User.user_permissions.through, dispatch_uid="users.perms_user_perms")
+@receiver(m2m_changed, sender=Group.permissions.through, dispatch_uid="users.perms_group_perms")
+def invalidate_permissions_on_m2m(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_permissions_generation()
+
+
+@receiver(post_save, sender=Group, dispatch_uid="users.perms_group_save")
+@receiver(post_delete, sender=Group, dispatch_uid="users.perms_group_delete")
+@receiver(post_save, sender=Permission, dispatch_uid="users.perms_permission_save")
+@receiver(post_delete, sender=Permission, dispatch_uid="users.perms_permission_delete")
+def invalidate_permissions(sender, **kwargs):
+    bump_permissions_generation()
 
 
 # -------------------------------
@@ -41,29 +87,15 @@ def send_invite_on_create(sender, instance, created: bool, **kwargs):
 # -------------------------------
 
 
-@receiver(post_migrate)
-def ensure_teacher_admin_group(sender, **kwargs):
+def ensure_teacher_admin_group(sender, apps=None, using=DEFAULT_DB_ALIAS, **kwargs):
     """
-    Ensure Teacher Admin exists, has the right perms, and all teacher users
-    are staff & in the group. Controlled by settings.TEACHER_ADMIN_FULL_PERMS.
+    Sync the Teacher Admin group once per `migrate`, after the last app's
+    post_migrate (so every app's permissions exist). See users.groups.
     """
-    full_perms = getattr(settings, "TEACHER_ADMIN_FULL_PERMS", True)
-
-    group, _ = Group.objects.get_or_create(name=TEACHER_GROUP_NAME)
-    perms_qs = (
-        Permission.objects.all()
-        if full_perms
-        else Permission.objects.filter(codename__startswith="view_")
-    )
-    group.permissions.set(perms_qs)
-    group.save()
-
-    # Sync existing teachers
-    for u in User.objects.filter(role="teacher"):
-        if not u.is_staff:
-            u.is_staff = True
-            u.save(update_fields=["is_staff"])
-        u.groups.add(group)
+    last = [c for c in global_apps.get_app_configs() if c.models_module is not None][-1]
+    if sender.label != last.label:
+        return
+    sync_teacher_admin_group(using=using)
 
 
 # Connect after migrations (use a stable dispatch_uid to avoid double-wiring)
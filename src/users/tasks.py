@@ -0,0 +1,37 @@
+# src/users/tasks.py
+#
+# Background tasks for the users app (run by `manage.py run_worker`, see tasks.queue).
+
+import logging
+
+from django.contrib.auth import get_user_model
+
+from core.mail import BatchMailer
+from tasks.queue import task
+
+from .emails import compile_invite
+from .utils import get_domain_and_scheme
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+@task("users.send_invites")
+def send_invites(user_ids: list[int]):
+    """
+    Send the set-password invite to each user, over one mail connection.
+    Users that were deleted or have set a password in the meantime are skipped.
+    A message the server rejects is logged and skipped (retrying the whole job would
+    re-send every invite that did go out); if the server cannot be reached at all the
+    job fails before sending anything and the worker retries it.
+    """
+    users = User.objects.filter(pk__in=user_ids, is_superuser=False).order_by("pk")
+    domain, use_https = get_domain_and_scheme(None)
+    invite = compile_invite(domain=domain, use_https=use_https)
+    with BatchMailer() as mailer:
+        for user in users:
+            if user.has_usable_password():
+                continue
+            mailer.add(invite.message(user))
+    if mailer.failed:
+        logger.warning("%d invite(s) failed: %s", mailer.failed, mailer.failed_recipients)
@@ -0,0 +1,81 @@
+# src/users/tests/test_bulk.py
+#
+# Purpose: bulk_user_operations() turns per-user post_save side effects (profile
+# creation, invite emails) into one set-wise replay when the block exits.
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import override_settings
+import pytest
+
+from profiles.models import Profile
+from tasks.models import Task
+from users.bulk import bulk_user_operations
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend", TASKS_EAGER=False)
+def test_bulk_block_coalesces_profiles_and_invites(django_capture_on_commit_callbacks):
+    """
+    GIVEN several students created with create_user() inside bulk_user_operations()
+    WHEN the block exits
+    THEN every student gets a profile and an invite,
+         sent by ONE queued job for all invites.
+    """
+    with django_capture_on_commit_callbacks(execute=True):
+        with bulk_user_operations():
+            for i in range(3):
+                User.objects.create_user(email=f"b{i}@example.com", role="student")
+            # Nothing is replayed until the block exits
+            assert not Profile.objects.filter(user__email__startswith="b").exists()
+
+    assert Profile.objects.filter(user__email__startswith="b").count() == 3
+    assert Task.objects.filter(name="users.send_invites").count() == 1
+
+    call_command("run_worker", "--once")
+    assert sorted(m.to[0] for m in mail.outbox) == [f"b{i}@example.com" for i in range(3)]
+
+
+@pytest.mark.django_db
+def test_bulk_block_skips_replay_on_error(django_capture_on_commit_callbacks):
+    """
+    GIVEN a bulk block that raises
+    WHEN it exits
+    THEN no side effects are replayed (the surrounding transaction rolls the users back).
+    """
+    with django_capture_on_commit_callbacks() as callbacks:
+        with pytest.raises(RuntimeError):
+            with bulk_user_operations():
+                User.objects.create_user(email="fail@example.com", role="student")
+                raise RuntimeError("boom")
+
+    assert callbacks == []
+    assert not Profile.objects.filter(user__email="fail@example.com").exists()
+
+
+@pytest.mark.django_db
+@override_settings(TASKS_EAGER=False)
+def test_import_dry_run_replays_nothing(django_capture_on_commit_callbacks):
+    """
+    GIVEN an admin import preview (dry_run) of new students
+    WHEN the import rolls the users back
+    THEN no profiles are created and no invites are queued for them.
+    """
+    from tablib import Dataset
+
+    from users.resources import UserResource
+
+    dataset = Dataset(headers=["email", "first_name", "last_name", "role", "is_active"])
+    dataset.append(["preview@example.com", "Pre", "View", "student", True])
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        result = UserResource().import_data(dataset, dry_run=True)
+
+    assert not result.has_errors()
+    assert not User.objects.filter(email="preview@example.com").exists()
+    assert Profile.objects.count() == 0
+    assert callbacks == []
+    assert not Task.objects.filter(name="users.send_invites").exists()
@@ -0,0 +1,85 @@
+# src/users/tests/test_cached_auth_user.py
+#
+# Purpose: CachedModelBackend serves request.user from the cache (no users_user query
+# per request) and drops the entry when the user changes.
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+User = get_user_model()
+
+CACHED = override_settings(AUTHENTICATION_BACKENDS=["users.backends.CachedModelBackend"])
+
+
+def _user_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(url)
+    return resp, [q["sql"] for q in ctx.captured_queries if '"users_user"' in q["sql"]]
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+@CACHED
+def test_cached_user_skips_user_query(client):
+    """
+    GIVEN a logged-in student and the cached backend
+    WHEN they load two pages
+    THEN only the first request queries users_user, and the profile comes along.
+    """
+    user = User.objects.create_user(email="c@ex.com", password="pass1234", role="student")
+    client.force_login(user)
+    url = reverse("users:student_home")
+
+    resp, queries = _user_queries(client, url)
+    assert resp.status_code == 200 and len(queries) == 1
+    resp, queries = _user_queries(client, url)
+    assert resp.status_code == 200 and queries == []
+    assert "profile" in resp.wsgi_request.user._state.fields_cache
+
+
+@pytest.mark.django_db
+@CACHED
+def test_password_change_invalidates_cached_user(client):
+    """
+    GIVEN a cached logged-in user
+    WHEN their password changes (elsewhere)
+    THEN the cache entry is dropped and the old session is no longer valid.
+    """
+    user = User.objects.create_user(email="p@ex.com", password="pass1234", role="student")
+    client.force_login(user)
+    url = reverse("users:student_home")
+    assert client.get(url).status_code == 200
+
+    user.set_password("new-pass-5678")
+    user.save()
+
+    resp = client.get(url)
+    assert resp.status_code == 302  # back to login
+    assert not resp.wsgi_request.user.is_authenticated
+
+
+def test_check_warns_without_shared_cache():
+    """
+    GIVEN the cached-user backend
+    WHEN the default cache is per-process (LocMem) or shared (Redis)
+    THEN system check users.W001 warns only for the per-process cache.
+    """
+    from users.backends import check_shared_cache
+
+    redis = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+    with CACHED:
+        assert [w.id for w in check_shared_cache()] == ["users.W001"]
+        with override_settings(CACHES=redis):
+            assert check_shared_cache() == []
+    assert check_shared_cache() == []
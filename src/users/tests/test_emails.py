@@ -0,0 +1,57 @@
+# src/users/tests/test_emails.py
+#
+# Purpose: compiled (render-once) invite/welcome emails carry each user's own,
+# working reset link and escape per-recipient values in HTML.
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.urls import resolve
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
+import pytest
+
+from users.emails import compile_invite, compile_welcome
+
+User = get_user_model()
+
+
+def _reset_link(body: str, prefix: str) -> str:
+    return next(word for word in body.split() if word.startswith(prefix))
+
+
+@pytest.mark.django_db
+def test_compiled_invite_has_per_user_valid_links():
+    """
+    GIVEN one compiled invite
+    WHEN we build messages for two users
+    THEN each text and HTML body links to the reset view with that user's uid and a valid token.
+    """
+    invite = compile_invite(domain="example.org", use_https=True)
+    users = [User.objects.create_user(email=f"c{i}@example.com") for i in range(2)]
+
+    for user in users:
+        msg = invite.message(user)
+        assert msg.to == [user.email]
+        link = _reset_link(msg.body, "https://example.org/")
+        match = resolve(link.removeprefix("https://example.org"))
+        assert match.view_name == "users:password_reset_confirm"
+        assert force_str(urlsafe_base64_decode(match.kwargs["uidb64"])) == str(user.pk)
+        assert default_token_generator.check_token(user, match.kwargs["token"])
+        assert link in msg.alternatives[0][0]
+
+
+@pytest.mark.django_db
+def test_compiled_welcome_fills_fields_verbatim_in_text():
+    """
+    GIVEN a compiled welcome email
+    WHEN the temporary password contains HTML-special characters
+    THEN the plain-text body shows it verbatim.
+    """
+    user = User.objects.create_user(email="w@example.com", password="x")
+    welcome = compile_welcome(domain="example.org", use_https=False)
+
+    msg = welcome.message(user, email=user.email, password="<a&b>")
+
+    assert "Email: w@example.com" in msg.body
+    assert "Temporary password: <a&b>" in msg.body
+    assert "http://example.org/users/reset/" in msg.body
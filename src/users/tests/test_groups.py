@@ -0,0 +1,80 @@
+# src/users/tests/test_groups.py
+#
+# Purpose: the Teacher Admin sync only writes what differs, and is a read-only
+# no-op when the database is already in sync.
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+import pytest
+
+from users.groups import sync_teacher_admin_group, TEACHER_GROUP_NAME
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_sync_fixes_teachers_then_is_a_noop(django_assert_max_num_queries):
+    """
+    GIVEN teachers that are not staff and not in the group, plus a student
+    WHEN we sync twice
+    THEN the first run makes teachers staff members of the group (students untouched)
+         and the second run changes nothing with a handful of read queries.
+    """
+    teachers = [
+        User.objects.create_user(email=f"t{i}@example.com", password="x", role="teacher")
+        for i in range(3)
+    ]
+    student = User.objects.create_user(email="st@example.com", password="x", role="student")
+    User.objects.filter(pk__in=[t.pk for t in teachers]).update(is_staff=False)
+
+    first = sync_teacher_admin_group()
+    assert first["staff_set"] == 3
+    assert first["members_added"] == 3
+
+    group = Group.objects.get(name=TEACHER_GROUP_NAME)
+    assert set(group.user_set.values_list("email", flat=True)) == {t.email for t in teachers}
+    assert User.objects.filter(role="teacher", is_staff=False).count() == 0
+    assert not student.groups.exists()
+
+    with django_assert_max_num_queries(6):
+        second = sync_teacher_admin_group()
+    assert second == {"perms_added": 0, "perms_removed": 0, "staff_set": 0, "members_added": 0}
+
+
+@pytest.mark.django_db
+def test_sync_narrows_permissions_to_view_only():
+    """
+    GIVEN a group synced with full permissions
+    WHEN we sync with full_perms=False
+    THEN only view_* permissions remain.
+    """
+    sync_teacher_admin_group(full_perms=True)
+    result = sync_teacher_admin_group(full_perms=False)
+
+    group = Group.objects.get(name=TEACHER_GROUP_NAME)
+    codenames = set(group.permissions.values_list("codename", flat=True))
+    assert result["perms_removed"] > 0
+    assert codenames and all(c.startswith("view_") for c in codenames)
+
+
+@pytest.mark.django_db
+def test_teacher_group_id_is_not_cached_from_a_rolled_back_transaction():
+    """
+    GIVEN no Teacher Admin group
+    WHEN teacher_group_id() creates it inside a transaction that rolls back
+    THEN the pk is not cached, and the next call returns a group that exists.
+    """
+    from django.db import transaction
+
+    from users import groups
+
+    Group.objects.filter(name=TEACHER_GROUP_NAME).delete()
+    groups.clear_teacher_group_cache()
+
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            groups.teacher_group_id()
+            raise RuntimeError("request failed")
+
+    assert groups._teacher_group_id is None
+    assert Group.objects.filter(pk=groups.teacher_group_id(), name=TEACHER_GROUP_NAME).exists()
@@ -0,0 +1,111 @@
+# src/users/tests/test_hashing.py
+#
+# Purpose: PasswordHashPool hashes in parallel without changing results, and the
+# admin import path (UserResource, opt-in, new students only) and
+# `seed_students --workers` both use it.
+
+import csv
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core.management import call_command
+from django.test import override_settings
+import pytest
+import tablib
+
+from users.hashing import PasswordHashPool
+from users.resources import UserResource
+
+User = get_user_model()
+
+
+def test_hash_pool_keeps_order_and_handles_unusable():
+    """
+    GIVEN a mix of passwords and None
+    WHEN we hash them with two worker processes
+    THEN each hash verifies against its own input, in input order,
+         and None becomes an unusable password.
+    """
+    with PasswordHashPool(workers=2) as pool:
+        hashes = pool.hash_many(["first!1", None, "second!2"])
+
+    assert check_password("first!1", hashes[0])
+    assert not check_password("second!2", hashes[0])
+    assert hashes[1].startswith("!")  # UNUSABLE_PASSWORD_PREFIX
+    assert check_password("second!2", hashes[2])
+
+
+@pytest.mark.django_db
+@override_settings(USERS_IMPORT_PASSWORDS=True)
+def test_user_resource_import_hashes_password_column():
+    """
+    GIVEN an admin import dataset carrying a 'password' column, with USERS_IMPORT_PASSWORDS
+    WHEN UserResource imports it
+    THEN new users get that password, and the column is never exported.
+    """
+    dataset = tablib.Dataset(headers=["email", "first_name", "password"])
+    dataset.append(["imp1@example.com", "Imp", "Imported!1"])
+    dataset.append(["imp2@example.com", "Imp", ""])
+
+    result = UserResource().import_data(dataset, dry_run=False, raise_errors=True)
+
+    assert not result.has_errors()
+    assert User.objects.get(email="imp1@example.com").check_password("Imported!1")
+    assert "password" not in UserResource().export().headers
+
+
+@pytest.mark.django_db
+@override_settings(USERS_IMPORT_PASSWORDS=True)
+def test_user_resource_import_keeps_existing_passwords():
+    """
+    GIVEN an existing superuser and a 'password' column naming them
+    WHEN UserResource imports the dataset
+    THEN the existing account keeps its password.
+    """
+    User.objects.create_superuser(email="root@example.com", password="Original!1")
+    dataset = tablib.Dataset(headers=["email", "first_name", "password"])
+    dataset.append(["root@example.com", "Root", "Hijacked!1"])
+
+    UserResource().import_data(dataset, dry_run=False, raise_errors=True)
+
+    root = User.objects.get(email="root@example.com")
+    assert root.check_password("Original!1") and not root.check_password("Hijacked!1")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("enabled, dry_run", [(False, False), (True, True)])
+def test_user_resource_import_skips_passwords(enabled, dry_run, monkeypatch):
+    """
+    GIVEN a 'password' column, and the setting off or a dry run (preview)
+    WHEN UserResource imports it
+    THEN nothing is hashed and no imported user gets that password.
+    """
+    monkeypatch.setattr(PasswordHashPool, "hash_many", lambda *a, **k: pytest.fail("hashed"))
+    dataset = tablib.Dataset(headers=["email", "first_name", "password"])
+    dataset.append(["skip@example.com", "Skip", "Imported!1"])
+
+    with override_settings(USERS_IMPORT_PASSWORDS=enabled):
+        UserResource().import_data(dataset, dry_run=dry_run, raise_errors=True)
+
+    user = User.objects.filter(email="skip@example.com").first()
+    assert user is None or not user.check_password("Imported!1")
+
+
+@pytest.mark.django_db
+def test_seed_students_bulk_with_workers(tmp_path):
+    """
+    GIVEN CSV rows with passwords
+    WHEN we run seed_students --bulk --workers=2
+    THEN the precomputed hashes are written and verify.
+    """
+    csv_path = tmp_path / "workers.csv"
+    with csv_path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=["email", "password"])
+        w.writeheader()
+        w.writerow({"email": "w1@example.com", "password": "Worker!1"})
+        w.writerow({"email": "w2@example.com", "password": "Worker!2"})
+
+    call_command("seed_students", str(csv_path), "--bulk", "--workers=2")
+
+    assert User.objects.get(email="w1@example.com").check_password("Worker!1")
+    assert User.objects.get(email="w2@example.com").check_password("Worker!2")
@@ -0,0 +1,85 @@
+# src/users/tests/test_last_login.py
+#
+# Purpose: with USERS_DEFER_LAST_LOGIN, logins are buffered and written in one bulk
+# UPDATE, and reset tokens follow the effective (not yet written) last_login.
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+import pytest
+
+from users import last_login
+from users.tokens import default_token_generator
+
+User = get_user_model()
+
+DEFERRED = override_settings(USERS_DEFER_LAST_LOGIN=True, USERS_LAST_LOGIN_FLUSH_SECONDS=3600)
+
+
+@pytest.fixture(autouse=True)
+def _clean_state():
+    cache.clear()
+    yield
+    last_login._pending.clear()
+    last_login.flush()  # cancels the timer
+    cache.clear()
+
+
+def _login(client, user):
+    assert client.login(username=user.email, password="pass1234")
+
+
+@pytest.mark.django_db
+@DEFERRED
+def test_logins_are_buffered_then_flushed_in_one_update(client, django_assert_num_queries):
+    """
+    GIVEN three students logging in with deferral on
+    WHEN they log in, then the buffer is flushed
+    THEN the column is untouched until the flush, which writes all three in one UPDATE.
+    """
+    users = [
+        User.objects.create_user(email=f"l{i}@ex.com", password="pass1234", role="student")
+        for i in range(3)
+    ]
+    for user in users:
+        _login(client, user)
+
+    assert User.objects.filter(last_login__isnull=False).count() == 0
+    assert all(last_login.effective_last_login(u) is not None for u in users)
+
+    with django_assert_num_queries(1):
+        assert last_login.flush() == 3
+    assert User.objects.filter(last_login__isnull=False).count() == 3
+
+
+@pytest.mark.django_db
+@DEFERRED
+def test_reset_tokens_follow_pending_last_login(client):
+    """
+    GIVEN a reset token issued before a login, and one issued after it
+    WHEN the login is still buffered, and again after the flush
+    THEN the old token is already invalid and the new one stays valid.
+    """
+    user = User.objects.create_user(email="t@ex.com", password="pass1234", role="student")
+    old = default_token_generator.make_token(User.objects.get(pk=user.pk))
+
+    _login(client, user)
+    fresh = User.objects.get(pk=user.pk)  # column still stale
+    assert not default_token_generator.check_token(fresh, old)
+    new = default_token_generator.make_token(fresh)
+
+    last_login.flush()
+    assert default_token_generator.check_token(User.objects.get(pk=user.pk), new)
+
+
+def test_check_warns_for_per_process_cache():
+    """
+    GIVEN the default cache is per-process (LocMem)
+    WHEN USERS_DEFER_LAST_LOGIN is on, then off
+    THEN system check users.W003 warns only while it is on.
+    """
+    from users.backends import check_shared_cache
+
+    with DEFERRED:
+        assert "users.W003" in [w.id for w in check_shared_cache()]
+    assert "users.W003" not in [w.id for w in check_shared_cache()]
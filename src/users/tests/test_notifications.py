@@ -0,0 +1,76 @@
+# src/users/tests/test_notifications.py
+#
+# Purpose: account emails requested within one unit of work are merged per
+# recipient and sent as one batch; invite jobs are written in the caller's
+# transaction; rolled-back work sends nothing.
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.db import transaction
+from django.test import override_settings
+import pytest
+
+from tasks.models import Task
+from users.notifications import INVITE, notify
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend", TASKS_EAGER=False)
+def test_welcome_supersedes_automatic_invite(tmp_path):
+    """
+    GIVEN a CSV user without a password, seeded with --send-welcome
+    WHEN the command runs
+    THEN the user gets the welcome email only: no invite job is queued.
+    """
+    csv_path = tmp_path / "one.csv"
+    csv_path.write_text("email,first_name,last_name,password\nsolo@example.com,,,\n")
+
+    call_command("seed_students", str(csv_path), "--send-welcome", "--site-domain=example.org")
+
+    assert [m.to for m in mail.outbox] == [["solo@example.com"]]
+    assert mail.outbox[0].subject.startswith("Welcome")
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+@override_settings(TASKS_EAGER=False)
+def test_transaction_sends_one_merged_batch(django_capture_on_commit_callbacks):
+    """
+    GIVEN invites requested several times inside one transaction, and in one that rolls back
+    WHEN the transactions end
+    THEN one job holds each committed user once (one on_commit callback).
+    """
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with transaction.atomic():
+            users = [User.objects.create_user(email=f"m{i}@example.com") for i in range(3)]
+            notify(users[0], INVITE)  # duplicate of the automatic invite
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                User.objects.create_user(email="gone@example.com")
+                raise RuntimeError
+
+    assert len(callbacks) == 1
+    (job,) = Task.objects.filter(name="users.send_invites")
+    assert sorted(job.payload["user_ids"]) == sorted(u.pk for u in users)
+
+
+@pytest.mark.django_db
+@override_settings(TASKS_EAGER=False)
+def test_invite_job_is_written_in_the_callers_transaction():
+    """
+    GIVEN a user created inside a transaction
+    WHEN the transaction is still open, and after it rolls back
+    THEN the invite job already exists inside it, and is gone with it.
+    """
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            user = User.objects.create_user(email="durable@example.com")
+            (job,) = Task.objects.filter(name="users.send_invites")
+            assert job.payload["user_ids"] == [user.pk]
+            raise RuntimeError
+
+    assert not Task.objects.exists()
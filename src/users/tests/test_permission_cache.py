@@ -0,0 +1,121 @@
+# src/users/tests/test_permission_cache.py
+#
+# Purpose: PermissionCacheBackend shares permission sets across requests (and across
+# users with the same groups) and drops them when memberships change.
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache(settings):
+    settings.AUTHENTICATION_BACKENDS = ["users.backends.PermissionCacheBackend"]
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _fresh(user):
+    # A new instance per "request": nothing cached on the object itself
+    return User.objects.get(pk=user.pk)
+
+
+@pytest.mark.django_db
+def test_group_permissions_are_shared_across_requests_and_users():
+    """
+    GIVEN two teachers in the same group
+    WHEN the first teacher's permissions are loaded, then both are checked
+    THEN the first teacher's next request runs no queries and the second teacher
+         reuses the cached group permissions.
+    """
+    group = Group.objects.create(name="Editors")
+    group.permissions.add(*Permission.objects.filter(codename__startswith="view_"))
+    a, b = (
+        User.objects.create_user(email=f"{n}@ex.com", password="x", role="teacher")
+        for n in ("a", "b")
+    )
+    a.groups.add(group)
+    b.groups.add(group)
+
+    assert _fresh(a).has_perm("users.view_user")
+    a2, b2 = _fresh(a), _fresh(b)
+    with CaptureQueriesContext(connection) as again:
+        assert a2.has_perm("users.view_user")
+    with CaptureQueriesContext(connection) as other:
+        assert b2.has_perm("users.view_user")
+
+    assert again.captured_queries == []
+    # b only loads its own direct perms + group ids; the group set is shared
+    assert not any("auth_group_permissions" in q["sql"] for q in other.captured_queries)
+
+
+@pytest.mark.django_db
+def test_membership_change_invalidates_cached_permissions():
+    """
+    GIVEN a user whose group permissions are cached
+    WHEN they are removed from the group
+    THEN the next request no longer sees the group's permissions.
+    """
+    group = Group.objects.create(name="Editors")
+    group.permissions.add(Permission.objects.get(codename="view_user"))
+    user = User.objects.create_user(email="m@ex.com", password="x", role="teacher")
+    user.groups.add(group)
+    assert _fresh(user).has_perm("users.view_user")
+
+    user.groups.remove(group)
+
+    assert not _fresh(user).has_perm("users.view_user")
+
+
+def test_check_warns_for_per_process_cache(settings):
+    """
+    GIVEN the permission cache backend
+    WHEN the default cache is per-process (LocMem)
+    THEN system check users.W002 warns; the plain ModelBackend gets no warning.
+    """
+    from users.backends import check_shared_cache
+
+    assert [w.id for w in check_shared_cache()] == ["users.W002"]
+    settings.AUTHENTICATION_BACKENDS = ["django.contrib.auth.backends.ModelBackend"]
+    assert check_shared_cache() == []
+
+
+@pytest.mark.django_db
+def test_superuser_permissions_are_not_shared_with_group_members():
+    """
+    GIVEN a superuser and a plain user in the same group
+    WHEN the superuser's permissions are loaded first
+    THEN the plain user still gets only the group's permissions.
+    """
+    group = Group.objects.create(name="Readers")
+    group.permissions.add(Permission.objects.get(codename="view_group"))
+    boss = User.objects.create_superuser(email="boss@ex.com", password="x")
+    plain = User.objects.create_user(email="plain@ex.com", password="x", role="teacher")
+    for user in (boss, plain):
+        user.groups.add(group)
+
+    assert "auth.delete_group" in _fresh(boss).get_all_permissions()
+    assert _fresh(plain).get_all_permissions() == {"auth.view_group"}
+    assert not _fresh(plain).has_perm("auth.delete_group")
+
+
+@pytest.mark.django_db
+def test_demoted_superuser_loses_permissions():
+    """
+    GIVEN a superuser whose permissions have been loaded
+    WHEN they are saved as a plain user
+    THEN their next request sees only their own (empty) permission set.
+    """
+    boss = User.objects.create_superuser(email="demoted@ex.com", password="x")
+    assert "auth.delete_group" in _fresh(boss).get_all_permissions()
+
+    boss.is_superuser = False
+    boss.save()
+
+    assert _fresh(boss).get_all_permissions() == set()
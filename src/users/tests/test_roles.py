@@ -0,0 +1,42 @@
+# src/users/tests/test_roles.py
+#
+# Purpose: the role-routing registry reverses URL names once, rebuilds on
+# override_settings, and its system check reports unknown URL names.
+
+from django.test import override_settings
+
+from users import roles
+
+
+def test_role_urls_are_reversed_once_and_rebuilt_on_setting_change(monkeypatch):
+    """
+    GIVEN the role registry
+    WHEN home URLs are looked up repeatedly, then USERS_ROLE_REDIRECTS is overridden
+    THEN reverse() runs only while building the map, and the override takes effect.
+    """
+    calls = []
+    real_reverse = roles.reverse
+    monkeypatch.setattr(roles, "reverse", lambda name: calls.append(name) or real_reverse(name))
+    roles._routes = None
+
+    for _ in range(5):
+        assert roles.role_home_url("teacher") == real_reverse("users:teacher_home")
+    assert roles.role_home_url("unknown") == real_reverse("users:student_home")
+    assert len(calls) == len(roles.DEFAULT_ROLE_HOMES)
+
+    with override_settings(USERS_ROLE_REDIRECTS={"teacher": "users:admin_home"}):
+        assert roles.role_home_url("teacher") == real_reverse("users:admin_home")
+    assert roles.role_home_url("teacher") == real_reverse("users:teacher_home")
+
+
+@override_settings(USERS_ROLE_REDIRECTS={"teacher": "users:no_such_page"})
+def test_system_check_flags_unknown_url_names():
+    """
+    GIVEN a role mapped to a URL name that does not exist
+    WHEN system checks run
+    THEN users.E001 names the role and the URL name.
+    """
+    errors = roles.check_role_homes()
+
+    assert [e.id for e in errors] == ["users.E001"]
+    assert "'teacher'" in errors[0].msg and "users:no_such_page" in errors[0].msg
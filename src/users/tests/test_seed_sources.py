@@ -0,0 +1,112 @@
+# src/users/tests/test_seed_sources.py
+#
+# Purpose: every supported input format feeds the same seed_students pipeline.
+#   - gzipped CSV, NDJSON (plain and gzipped), XLSX and stdin
+#   - positions reported by a source can be used to resume mid-file
+
+import gzip
+import io
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+import pytest
+
+from users.seed_sources import open_source
+
+User = get_user_model()
+
+ROWS = [
+    {"email": "gz1@example.com", "first_name": "Gee", "last_name": "Zed"},
+    {"email": "gz2@example.com", "first_name": "Gee", "last_name": "Two"},
+]
+
+
+def _csv_bytes(rows) -> bytes:
+    lines = ["email,first_name,last_name"]
+    lines += [f"{r['email']},{r['first_name']},{r['last_name']}" for r in rows]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _ndjson_bytes(rows) -> bytes:
+    return "".join(json.dumps(r) + "\n" for r in rows).encode("utf-8")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "name,payload",
+    [
+        ("students.csv.gz", gzip.compress(_csv_bytes(ROWS))),
+        ("students.ndjson", _ndjson_bytes(ROWS)),
+        ("students.jsonl.gz", gzip.compress(_ndjson_bytes(ROWS))),
+    ],
+)
+def test_seed_students_reads_compressed_and_ndjson(tmp_path, name, payload):
+    """
+    GIVEN the same two students exported as .csv.gz / .ndjson / .jsonl.gz
+    WHEN we seed from that file
+    THEN both students are created with their names.
+    """
+    path = tmp_path / name
+    path.write_bytes(payload)
+
+    call_command("seed_students", str(path), "--bulk")
+
+    assert set(User.objects.values_list("email", "last_name")) == {
+        ("gz1@example.com", "Zed"),
+        ("gz2@example.com", "Two"),
+    }
+
+
+@pytest.mark.django_db
+def test_seed_students_reads_stdin(monkeypatch):
+    """
+    GIVEN an NDJSON export piped on stdin
+    WHEN we pass '-' with --format=ndjson
+    THEN rows are streamed into the same pipeline.
+    """
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(_ndjson_bytes(ROWS))))
+
+    call_command("seed_students", "-", "--format=ndjson")
+
+    assert User.objects.filter(email__startswith="gz").count() == 2
+
+
+@pytest.mark.django_db
+def test_seed_students_reads_xlsx(tmp_path):
+    """
+    GIVEN a workbook whose first sheet has a header row and two students
+    WHEN we seed from the .xlsx
+    THEN both students are created (blank rows are skipped).
+    """
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["email", "first_name", "last_name"])
+    ws.append([ROWS[0]["email"], ROWS[0]["first_name"], ROWS[0]["last_name"]])
+    ws.append([None, None, None])
+    ws.append([ROWS[1]["email"], ROWS[1]["first_name"], ROWS[1]["last_name"]])
+    path = tmp_path / "students.xlsx"
+    wb.save(path)
+
+    call_command("seed_students", str(path), "--bulk")
+
+    assert User.objects.filter(email__startswith="gz").count() == 2
+
+
+def test_gzip_source_positions_resume_mid_file(tmp_path):
+    """
+    GIVEN a gzipped CSV
+    WHEN we reopen it and seek to the position reported after the first row
+    THEN iteration continues with the second row.
+    """
+    path = tmp_path / "resume.csv.gz"
+    path.write_bytes(gzip.compress(_csv_bytes(ROWS)))
+
+    with open_source(str(path)) as source:
+        (_first, position), *_ = list(source)
+
+    with open_source(str(path)) as source:
+        source.seek(position)
+        assert [row["email"] for row, _ in source] == ["gz2@example.com"]
@@ -16,9 +16,13 @@ from pathlib import Path
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.management import call_command
+from django.core import mail
+from django.core.management import call_command, CommandError
+from django.test import override_settings
 import pytest
 
+from profiles.models import Profile
+
 User = get_user_model()
 
 
@@ -136,3 +140,216 @@ def test_seed_students_update_changes_names_and_password(tmp_path):
     assert u.first_name == "NewFirst"
     assert u.last_name == "NewLast"
     assert u.check_password("NewPass!2")
+
+
+def _write_csv(path: Path, rows: list[dict]) -> Path:
+    fieldnames = ["email", "first_name", "last_name", "password"]
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fieldnames)
+        w.writeheader()
+        w.writerows(rows)
+    return path
+
+
+@pytest.mark.django_db
+def test_seed_students_bulk_matches_row_by_row_semantics(tmp_path, capsys):
+    """
+    GIVEN one existing user and a CSV with a new user, an update and an in-file duplicate
+    WHEN we run with --bulk --update
+    THEN creates/updates follow the same password rules and counters as the default path.
+    """
+    User.objects.create_user(
+        email="existing@example.com",
+        password="KeepMe!1",
+        role=User.Roles.STUDENT,
+        first_name="Old",
+    )
+    csv_path = _write_csv(
+        tmp_path / "bulk.csv",
+        [
+            {"email": "New@Example.com", "first_name": "New", "last_name": "", "password": ""},
+            # names change, no password → password must be kept (default is ignored on update)
+            {
+                "email": "existing@example.com",
+                "first_name": "Fresh",
+                "last_name": "",
+                "password": "",
+            },
+            # duplicate of the row above acts on the same user
+            {"email": "existing@example.com", "first_name": "", "last_name": "", "password": ""},
+            {"email": "not-an-email", "first_name": "", "last_name": "", "password": ""},
+        ],
+    )
+
+    call_command(
+        "seed_students",
+        str(csv_path),
+        "--bulk",
+        "--update",
+        "--default-password=Default!1",
+    )
+
+    new = User.objects.get(email="new@example.com")
+    assert new.role == User.Roles.STUDENT
+    assert new.check_password("Default!1")
+
+    existing = User.objects.get(email="existing@example.com")
+    assert existing.first_name == "Fresh"
+    assert existing.check_password("KeepMe!1")
+
+    out = capsys.readouterr().out
+    assert "rows=4 created=1 updated=1 skipped=1 invalid_email=1" in out
+
+
+@pytest.mark.django_db
+def test_seed_students_bulk_uses_constant_queries_per_chunk(
+    tmp_path, django_assert_max_num_queries
+):
+    """
+    GIVEN a CSV of 40 new students (no passwords → unusable, no hashing cost)
+    WHEN we run --bulk with one chunk
+    THEN the number of queries does not grow with the number of rows (profiles included).
+    """
+    rows = [
+        {"email": f"s{i}@example.com", "first_name": f"S{i}", "last_name": "", "password": ""}
+        for i in range(40)
+    ]
+    csv_path = _write_csv(tmp_path / "many.csv", rows)
+
+    with django_assert_max_num_queries(12):
+        call_command("seed_students", str(csv_path), "--bulk", "--batch-size=100")
+
+    assert User.objects.filter(email__startswith="s").count() == 40
+    assert Profile.objects.filter(user__email__startswith="s").count() == 40
+    assert not User.objects.get(email="s0@example.com").has_usable_password()
+
+
+@pytest.mark.django_db
+def test_seed_students_bulk_resumes_from_checkpoint(tmp_path, monkeypatch, capsys):
+    """
+    GIVEN a --bulk run that crashes while processing its second chunk
+    WHEN we rerun with --resume and the same --checkpoint
+    THEN the first chunk is not reprocessed, the rest is applied and the checkpoint is removed.
+    """
+    from users.seeding import BulkSeeder
+
+    rows = [
+        {"email": f"r{i}@example.com", "first_name": f"R{i}", "last_name": "", "password": ""}
+        for i in range(5)
+    ]
+    csv_path = _write_csv(tmp_path / "resume.csv", rows)
+    ckpt = tmp_path / "resume.ckpt.json"
+
+    original = BulkSeeder.process_chunk
+    calls = {"n": 0}
+
+    def crash_on_second_chunk(self, chunk):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("boom")
+        return original(self, chunk)
+
+    monkeypatch.setattr(BulkSeeder, "process_chunk", crash_on_second_chunk)
+    with pytest.raises(RuntimeError):
+        call_command(
+            "seed_students", str(csv_path), "--bulk", "--batch-size=2", f"--checkpoint={ckpt}"
+        )
+    assert User.objects.count() == 2
+    assert ckpt.exists()
+
+    monkeypatch.setattr(BulkSeeder, "process_chunk", original)
+    capsys.readouterr()
+    call_command(
+        "seed_students",
+        str(csv_path),
+        "--bulk",
+        "--batch-size=2",
+        f"--checkpoint={ckpt}",
+        "--resume",
+        "--progress",
+    )
+
+    assert User.objects.count() == 5
+    assert not ckpt.exists()
+    out = capsys.readouterr().out
+    assert "Resuming after row 2" in out
+    assert "rows/s" in out
+    assert "[row " not in out  # --progress suppresses per-row lines
+    assert "rows=5 created=5 updated=0 skipped=0 invalid_email=0" in out
+
+
+@pytest.mark.django_db
+def test_seed_students_plan_then_apply(tmp_path):
+    """
+    GIVEN an existing user and a CSV with a create, a name change, a duplicate and a bad email
+    WHEN we write a --plan and then --apply it (after deleting the CSV)
+    THEN the plan lists every category and apply executes exactly it.
+    """
+    import json
+
+    User.objects.create_user(email="planned@example.com", password="Keep!1", first_name="Old")
+    csv_path = _write_csv(
+        tmp_path / "plan.csv",
+        [
+            {"email": "fresh@example.com", "first_name": "Fresh", "last_name": "", "password": ""},
+            {"email": "planned@example.com", "first_name": "New", "last_name": "", "password": ""},
+            {"email": "FRESH@example.com", "first_name": "Dup", "last_name": "", "password": ""},
+            {"email": "nope", "first_name": "", "last_name": "", "password": ""},
+        ],
+    )
+    plan_path = tmp_path / "intake.plan.json"
+
+    call_command("seed_students", str(csv_path), "--update", f"--plan={plan_path}")
+
+    assert User.objects.count() == 1  # planning writes nothing
+    plan = json.loads(plan_path.read_text())
+    assert [c["email"] for c in plan["create"]] == ["fresh@example.com"]
+    assert plan["update"][0]["changes"] == {"first_name": {"from": "Old", "to": "New"}}
+    assert plan["duplicates"] == [
+        {"row": 3, "email": "fresh@example.com", "first_row": 1, "merged": True}
+    ]
+    assert plan["invalid"][0]["email"] == "nope"
+    assert "Fresh" not in plan["create"][0]["password"]  # hashes only
+    assert plan_path.stat().st_mode & 0o777 == 0o600
+
+    csv_path.unlink()
+    call_command("seed_students", f"--apply={plan_path}")
+
+    # The duplicate row wins, as it would in a direct --update run
+    assert User.objects.get(email="fresh@example.com").first_name == "Dup"
+    planned = User.objects.get(email="planned@example.com")
+    assert planned.first_name == "New"
+    assert planned.check_password("Keep!1")
+
+    # Re-applying the same plan is refused: its create now exists
+    with pytest.raises(CommandError, match="Stale plan"):
+        call_command("seed_students", f"--apply={plan_path}")
+
+
+@pytest.mark.django_db
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend", EMAIL_BATCH_SIZE=2
+)
+def test_seed_students_send_welcome_batches_emails(tmp_path, capsys):
+    """
+    GIVEN 3 new students and --send-welcome
+    WHEN we seed them in bulk
+    THEN each gets one welcome email with a reset link, and the run reports the totals.
+    """
+    rows = [
+        {"email": f"w{i}@example.com", "first_name": "", "last_name": "", "password": "Pw!12345"}
+        for i in range(3)
+    ]
+    csv_path = _write_csv(tmp_path / "welcome.csv", rows)
+
+    call_command(
+        "seed_students", str(csv_path), "--bulk", "--send-welcome", "--site-domain=example.org"
+    )
+
+    assert sorted(m.to[0] for m in mail.outbox) == [
+        "w0@example.com",
+        "w1@example.com",
+        "w2@example.com",
+    ]
+    assert all("http://example.org/" in m.body for m in mail.outbox)
+    assert "emails sent=3 failed=0" in capsys.readouterr().out
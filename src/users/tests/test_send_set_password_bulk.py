@@ -0,0 +1,124 @@
+# src/users/tests/test_send_set_password_bulk.py
+#
+# Purpose: `send_set_password_bulk` selects users by filters, and a resumed run
+# after a crash does not email anyone twice (or skip anyone whose invite failed).
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import override_settings
+import pytest
+
+from users.emails import compile_invite
+from users.management.commands import send_set_password_bulk as command
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend", EMAIL_RATE_PER_SECOND=0
+)
+def test_bulk_invites_resume_without_double_send(tmp_path, monkeypatch):
+    """
+    GIVEN four students without passwords, one teacher and one student with a password
+    WHEN a --role=student --unusable-only run crashes while preparing the 3rd invite
+         and is then rerun with --resume
+    THEN each matching student is invited exactly once and nobody else is emailed.
+    """
+    for i in range(4):
+        User.objects.create_user(email=f"inv{i}@example.com", role="student")
+    User.objects.create_user(email="teach@example.com", role="teacher")
+    User.objects.create_user(email="haspw@example.com", password="x", role="student")
+    mail.outbox.clear()  # creation-time invites (eager task queue) are not under test
+
+    def crash_on_third(**kwargs):
+        invite = compile_invite(**kwargs)
+        build = invite.message
+
+        def message(user, **values):
+            if user.email == "inv2@example.com":
+                raise KeyboardInterrupt
+            return build(user, **values)
+
+        invite.message = message
+        return invite
+
+    ckpt = tmp_path / "invites.json"
+    args = ["send_set_password_bulk", "--role=student", "--unusable-only", f"--checkpoint={ckpt}"]
+
+    monkeypatch.setattr(command, "compile_invite", crash_on_third)
+    with pytest.raises(KeyboardInterrupt):
+        call_command(*args)
+    assert sorted(m.to[0] for m in mail.outbox) == ["inv0@example.com", "inv1@example.com"]
+    assert ckpt.exists()
+
+    monkeypatch.setattr(command, "compile_invite", compile_invite)
+    call_command(*args, "--resume")
+
+    assert sorted(m.to[0] for m in mail.outbox) == [f"inv{i}@example.com" for i in range(4)]
+    assert not ckpt.exists()
+
+
+@pytest.mark.django_db
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend", EMAIL_RATE_PER_SECOND=0
+)
+def test_failed_invites_are_kept_and_retried(tmp_path, monkeypatch):
+    """
+    GIVEN three students and an SMTP server that rejects the first one once
+    WHEN a run finishes with that failure and is rerun with --resume
+    THEN the checkpoint survives the first run, only the failed student is emailed
+         on the rerun, and the checkpoint is removed once the run is clean.
+    """
+    for i in range(3):
+        User.objects.create_user(email=f"fail{i}@example.com", role="student")
+    mail.outbox.clear()
+
+    original = EmailBackend.send_messages
+    rejected = []
+
+    def reject_first_once(self, messages):
+        if not rejected and messages[0].to == ["fail0@example.com"]:
+            rejected.append(messages[0].to[0])
+            raise OSError("451 try again later")
+        return original(self, messages)
+
+    monkeypatch.setattr(EmailBackend, "send_messages", reject_first_once)
+    ckpt = tmp_path / "invites.json"
+    args = ["send_set_password_bulk", "--role=student", f"--checkpoint={ckpt}"]
+
+    call_command(*args, stderr=StringIO())
+    assert sorted(m.to[0] for m in mail.outbox) == ["fail1@example.com", "fail2@example.com"]
+    assert ckpt.exists()
+
+    mail.outbox.clear()
+    call_command(*args, "--resume")
+    assert [m.to[0] for m in mail.outbox] == ["fail0@example.com"]
+    assert not ckpt.exists()
+
+
+@pytest.mark.django_db
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend", EMAIL_RATE_PER_SECOND=0
+)
+@pytest.mark.parametrize("max_in", [1000, 0])
+def test_file_emails_match_case_insensitively(tmp_path, monkeypatch, max_in):
+    """
+    GIVEN a user stored as Mixed.Case@example.com and a file listing it in another case
+    WHEN the command runs with --file, matching in the query or (longer lists) in Python
+    THEN that user is invited either way, and nobody else.
+    """
+    monkeypatch.setattr(command, "MAX_EMAIL_IN", max_in)
+    User.objects.create_user(email="Mixed.Case@example.com", role="student")
+    User.objects.create_user(email="other@example.com", role="student")
+    mail.outbox.clear()
+    listed = tmp_path / "emails.csv"
+    listed.write_text("email\nmixed.CASE@example.com\n")
+
+    call_command("send_set_password_bulk", f"--file={listed}", stdout=StringIO())
+
+    assert [m.to[0] for m in mail.outbox] == ["Mixed.Case@example.com"]
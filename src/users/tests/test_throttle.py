@@ -0,0 +1,98 @@
+# src/users/tests/test_throttle.py
+#
+# Purpose: login and password-reset attempts are throttled per IP/account in the
+# cache, and a locked request is refused before any password hashing or email.
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+import pytest
+
+from users.throttle import Throttle
+
+User = get_user_model()
+
+LIMITS = {
+    "login_ip": (100, 300),
+    "login_account": (3, 900),
+    "reset_ip": (100, 3600),
+    "reset_account": (2, 3600),
+}
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_lockout_escalates_and_sliding_window_decays():
+    """
+    GIVEN a throttle of 2 attempts per 100s with a 10s base lockout
+    WHEN the limit is reached twice
+    THEN the first lock lasts 10s and the second 20s,
+         and old attempts stop counting as the window slides.
+    """
+    now = [1000.0]
+    throttle = Throttle("t", 2, 100, lockout=10, lockout_max=3600, clock=lambda: now[0])
+
+    assert throttle.hit("a@example.com") == 0
+    assert throttle.hit("a@example.com") == 10
+    assert throttle.retry_after("A@example.com ") > 0  # identifiers are normalised
+    now[0] += 11
+    assert throttle.retry_after("a@example.com") == 0
+    throttle.hit("a@example.com")
+    assert throttle.hit("a@example.com") == 20
+
+    now[0] = 5000.0  # both windows passed
+    throttle.hit("b@example.com")
+    now[0] += 190  # previous window now overlaps 10%: 1 + 0.1 < 2
+    assert throttle.hit("b@example.com") == 0
+
+
+@pytest.mark.django_db
+@override_settings(USERS_THROTTLE=LIMITS)
+def test_locked_login_is_refused_before_hashing(client, monkeypatch):
+    """
+    GIVEN an account that has had 3 failed logins
+    WHEN the correct password is then submitted
+    THEN the response is 429 with Retry-After and no password check runs.
+    """
+    User.objects.create_user(email="victim@ex.com", password="pass1234", role="student")
+    url = reverse("users:login")
+    for _ in range(3):
+        resp = client.post(url, {"username": "victim@ex.com", "password": "guess"})
+        assert resp.status_code == 200
+
+    checks = []
+    monkeypatch.setattr(User, "check_password", lambda self, raw: checks.append(raw))
+    resp = client.post(url, {"username": "victim@ex.com", "password": "pass1234"})
+
+    assert resp.status_code == 429
+    assert int(resp["Retry-After"]) > 0
+    assert b"Too many attempts" in resp.content
+    assert checks == []
+
+
+@pytest.mark.django_db
+@override_settings(
+    USERS_THROTTLE=LIMITS, EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend"
+)
+def test_password_reset_is_throttled_per_account(client):
+    """
+    GIVEN an account allowed 2 reset submissions
+    WHEN a third is posted
+    THEN it is refused with 429 and no further email is sent.
+    """
+    User.objects.create_user(email="reset@ex.com", password="pass1234", role="student")
+    url = reverse("users:password_reset")
+    for _ in range(2):
+        assert client.post(url, {"email": "reset@ex.com"}).status_code == 302
+
+    resp = client.post(url, {"email": "reset@ex.com"})
+
+    assert resp.status_code == 429
+    assert len(mail.outbox) == 2
@@ -0,0 +1,122 @@
+# src/users/throttle.py
+#
+# Attempt counters for login and password-reset, checked BEFORE any password hashing.
+#
+# A PBKDF2 check costs tens of milliseconds of CPU by design, so a credential-stuffing
+# burst against the login form can pin every core. Each POST first asks the cache
+# whether the client IP or the target account is locked (one cache read each); only
+# then does the form authenticate. Locked requests get a 429 and never touch the
+# password hasher, the database or the mail server.
+#
+#   - Counters use a sliding window: this window's count plus the previous window's,
+#     weighted by how much of it still overlaps (no burst allowance at window edges).
+#   - Reaching the limit locks the key for USERS_THROTTLE_LOCKOUT seconds, doubling on
+#     each repeat ("strike") up to USERS_THROTTLE_LOCKOUT_MAX; strikes are forgotten
+#     after a quiet USERS_THROTTLE_LOCKOUT_MAX.
+#   - Requests are rejected rather than delayed: a sleeping request still holds a
+#     worker, which is the resource the attacker is trying to exhaust.
+#
+# Counters live in the default cache, so every app process must share it (see
+# CACHE_URL in settings). Identifiers are hashed before they become cache keys.
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+from django.forms.utils import ErrorDict
+
+LOCKED_MESSAGE = "Too many attempts. Please wait {minutes} minute(s) and try again."
+
+
+class Throttle:
+    def __init__(
+        self,
+        scope: str,
+        limit: int,
+        window: int,
+        *,
+        lockout: int = 60,
+        lockout_max: int = 86400,
+        cache=None,
+        clock=time.time,
+    ):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+        self.lockout = lockout
+        self.lockout_max = lockout_max
+        self.cache = cache or default_cache
+        self._clock = clock
+
+    def _key(self, ident: str, suffix) -> str:
+        digest = hashlib.sha256(ident.strip().lower().encode()).hexdigest()[:32]
+        return f"throttle:{self.scope}:{digest}:{suffix}"
+
+    def _incr(self, key: str, timeout: int) -> int:
+        # add + incr is atomic on shared caches (Redis/Memcached)
+        self.cache.add(key, 0, timeout=timeout)
+        try:
+            return self.cache.incr(key)
+        except ValueError:  # expired in between
+            self.cache.set(key, 1, timeout=timeout)
+            return 1
+
+    def retry_after(self, ident: str) -> int:
+        """Seconds left on a lock for `ident` (0 = allowed)."""
+        until = self.cache.get(self._key(ident, "lock"))
+        return max(0, int(until - self._clock()) + 1) if until else 0
+
+    def hit(self, ident: str) -> int:
+        """Count one attempt; returns the lock duration if this attempt caused one, else 0."""
+        now = self._clock()
+        slot, offset = divmod(now, self.window)
+        current, previous = self._key(ident, int(slot)), self._key(ident, int(slot) - 1)
+
+        count = self._incr(current, self.window * 2)
+        overlap = 1 - offset / self.window
+        if count + self.cache.get(previous, 0) * overlap < self.limit:
+            return 0
+
+        strikes_key = self._key(ident, "strikes")
+        strikes = self._incr(strikes_key, self.lockout_max)
+        duration = min(self.lockout * 2 ** (strikes - 1), self.lockout_max)
+        self.cache.set(self._key(ident, "lock"), now + duration, timeout=duration)
+        # A fresh allowance after the lock; reaching the limit again escalates
+        self.cache.delete_many([current, previous])
+        return duration
+
+    def reset(self, ident: str) -> None:
+        """Forget counters, strikes and lock (e.g. after a successful login)."""
+        slot = int(self._clock() // self.window)
+        self.cache.delete_many([self._key(ident, s) for s in (slot, slot - 1, "strikes", "lock")])
+
+
+def get_throttle(name: str) -> Throttle:
+    """The throttle configured as settings.USERS_THROTTLE[name]."""
+    limit, window = settings.USERS_THROTTLE[name]
+    return Throttle(
+        name,
+        limit,
+        window,
+        lockout=settings.USERS_THROTTLE_LOCKOUT,
+        lockout_max=settings.USERS_THROTTLE_LOCKOUT_MAX,
+    )
+
+
+def client_ip(request) -> str:
+    """Client address; behind a proxy, set USERS_THROTTLE_IP_HEADER (e.g. HTTP_X_REAL_IP)."""
+    header = getattr(settings, "USERS_THROTTLE_IP_HEADER", "")
+    value = request.META.get(header, "") if header else ""
+    return value.split(",")[0].strip() or request.META.get("REMOTE_ADDR", "")
+
+
+def mark_throttled(form, seconds: int):
+    """
+    Make a bound form invalid with the lockout message WITHOUT validating it
+    (validating an AuthenticationForm is exactly the password check being avoided).
+    """
+    form._errors = ErrorDict()
+    form.cleaned_data = {}
+    form.add_error(None, LOCKED_MESSAGE.format(minutes=max(1, -(-seconds // 60))))
+    return form
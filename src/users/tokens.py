@@ -0,0 +1,27 @@
+# src/users/tokens.py
+#
+# Password-reset/invite tokens that stay correct with deferred last_login writes.
+#
+# Django's token hashes user.last_login so that logging in invalidates outstanding
+# reset links. With USERS_DEFER_LAST_LOGIN the column can lag behind the real last
+# login (users.last_login), which would both keep old links alive and break links
+# issued in between once the buffer is flushed. This generator hashes the effective
+# value instead. Use it wherever tokens are made or checked.
+
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+
+from .last_login import effective_last_login
+
+
+class LastLoginAwareTokenGenerator(PasswordResetTokenGenerator):
+    def _make_hash_value(self, user, timestamp):
+        # Same value as Django's, with the effective last_login
+        last_login = effective_last_login(user)
+        login_timestamp = (
+            "" if last_login is None else last_login.replace(microsecond=0, tzinfo=None)
+        )
+        email = getattr(user, user.get_email_field_name(), "") or ""
+        return f"{user.pk}{user.password}{login_timestamp}{timestamp}{email}"
+
+
+default_token_generator = LastLoginAwareTokenGenerator()
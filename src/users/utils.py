@@ -1,14 +1,10 @@
 # users/utils.py
 from django.conf import settings
-from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.urls import reverse
-from django.utils.encoding import force_bytes
-from django.utils.http import urlsafe_base64_encode
 
 from .constants import PWD_RESET_TPLS
+from .emails import compile_invite
 from .forms_invite import InvitePasswordResetForm
+from .tokens import default_token_generator
 
 
 def send_set_password(email, *, domain="localhost:8000", use_https=False, from_email=None):
@@ -21,6 +17,7 @@ def send_set_password(email, *, domain="localhost:8000", use_https=False, from_e
             email_template_name=PWD_RESET_TPLS["email_txt"],
             subject_template_name=PWD_RESET_TPLS["subject"],
             html_email_template_name=PWD_RESET_TPLS.get("email_html"),
+            token_generator=default_token_generator,
         )
         # Return True only if at least one user matched
         return True
@@ -43,42 +40,19 @@ def get_domain_and_scheme(request=None):
     return domain, False
 
 
-def send_invite_email(user, *, domain: str, use_https: bool):
+def send_invite_email(user, *, domain: str, use_https: bool, connection=None):
     """
     Build a password-set (reset) link for the user and send an invite email.
-    Uses your existing HTML template; falls back to plain text body.
+    Pass an open `connection` to reuse one SMTP session across many invites.
     """
-    uidb64 = urlsafe_base64_encode(force_bytes(user.pk))
-    token = default_token_generator.make_token(user)
+    build_invite_message(user, domain=domain, use_https=use_https, connection=connection).send()
 
-    path = reverse("users:password_reset_confirm", kwargs={"uidb64": uidb64, "token": token})
-    scheme = "https" if use_https else "http"
-    reset_url = f"{scheme}://{domain}{path}"
 
-    context = {
-        "user": user,
-        "reset_url": reset_url,
-        "site_name": getattr(settings, "SITE_NAME", "LangCon"),
-        "domain": domain,
-        "protocol": scheme,
-        "uidb64": uidb64,
-        "uid": uidb64,
-        "token": token,
-    }
-
-    subject = "Set your password"
-    # Plain-text fallback (kept short)
-    text_body = (
-        f"You’ve been invited to join {context['site_name']}.\nSet your password: {reset_url}\n"
-    )
-
-    html_body = render_to_string("users/registration/password_reset_email.html", context)
-
-    msg = EmailMultiAlternatives(
-        subject=subject,
-        body=text_body,
-        from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com"),
-        to=[user.email],
-    )
-    msg.attach_alternative(html_body, "text/html")
-    msg.send()
+def build_invite_message(user, *, domain: str, use_https: bool, connection=None):
+    """
+    The invite email (not sent): a password-set (reset) link for the user.
+    Compiles the templates for this one message; bulk senders should call
+    users.emails.compile_invite() once and reuse it.
+    """
+    invite = compile_invite(domain=domain, use_https=use_https)
+    return invite.message(user, connection=connection)
@@ -1,7 +1,6 @@
 # users/views.py
 
 # Django imports
-from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractBaseUser
@@ -15,55 +14,74 @@ from django.contrib.auth.views import (
 )
 from django.db import transaction
 from django.shortcuts import redirect, render
-from django.urls import reverse, reverse_lazy
+from django.urls import reverse_lazy
 from django.views.generic import CreateView
 
 # Local imports
 from .constants import PWD_RESET_TPLS  # ← centralised template names
 from .decorators import role_required
 from .forms import RegisterForm
+from .groups import teacher_group_id
 from .mixins import AdminRequiredMixin
+from .roles import role_home_url
+from .throttle import client_ip, get_throttle, mark_throttled
+from .tokens import default_token_generator
 
 User = get_user_model()
 
 
 def _redirect_for_role(user: AbstractBaseUser) -> str:
+    """Home path for user.role (see users.roles; honours USERS_ROLE_REDIRECTS)."""
+    return role_home_url(getattr(user, "role", None))
+
+
+# --------------------------
+# Auth: login / logout
+# --------------------------
+class ThrottledFormMixin:
     """
-    Map user.role → URL name, with sane fallbacks and support for @override_settings.
-    Priority:
-      1) settings.USERS_ROLE_REDIRECTS (if provided in runtime/tests)
-      2) sensible defaults for known roles (admin/teacher/student)
+    Check per-IP and per-account throttles (users.throttle) before the form is
+    validated; a locked request gets the form back with an error and HTTP 429.
     """
-    role = getattr(user, "role", None)
 
-    # 1) Honor dynamic settings (override_settings in tests will work here)
-    mapping = getattr(settings, "USERS_ROLE_REDIRECTS", {}) or {}
-    url_name = mapping.get(role)
-    if url_name:
-        return reverse(url_name)
+    throttle_names: tuple[str, str]  # (per-IP, per-account) keys of USERS_THROTTLE
+    account_field: str
 
-    # 2) Sane defaults if the mapping is missing/incomplete
-    try:
-        # Use your project enum if present
-        teacher_val = getattr(User.Roles, "TEACHER", "teacher")
-        admin_val = getattr(User.Roles, "ADMIN", "admin")
-    except Exception:
-        teacher_val, admin_val = "teacher", "admin"
+    def _throttle_keys(self):
+        ip_name, account_name = self.throttle_names
+        account = self.request.POST.get(self.account_field, "")
+        return [
+            (get_throttle(ip_name), client_ip(self.request)),
+            (get_throttle(account_name), account),
+        ]
 
-    if role == admin_val:
-        return reverse("users:admin_home")
-    if role == teacher_val:
-        return reverse("users:teacher_home")
+    def post(self, request, *args, **kwargs):
+        wait = max(throttle.retry_after(ident) for throttle, ident in self._throttle_keys())
+        if wait:
+            form = mark_throttled(self.get_form(), wait)
+            response = self.render_to_response(self.get_context_data(form=form), status=429)
+            response["Retry-After"] = str(wait)
+            return response
+        return super().post(request, *args, **kwargs)
 
-    # default (student or unknown)
-    return reverse("users:student_home")
+    def count_attempt(self):
+        for throttle, ident in self._throttle_keys():
+            throttle.hit(ident)
 
 
-# --------------------------
-# Auth: login / logout
-# --------------------------
-class EmailLoginView(LoginView):
+class EmailLoginView(ThrottledFormMixin, LoginView):
     template_name = "users/registration/login.html"
+    # Only failures count, so a classroom behind one NAT can still sign in
+    throttle_names = ("login_ip", "login_account")
+    account_field = "username"
+
+    def form_invalid(self, form):
+        self.count_attempt()
+        return super().form_invalid(form)
+
+    def form_valid(self, form):
+        get_throttle("login_account").reset(form.get_user().email)
+        return super().form_valid(form)
 
     def get_success_url(self):
         return _redirect_for_role(self.request.user)
@@ -101,10 +119,7 @@ class RegisterView(AdminRequiredMixin, CreateView):
 
         # add group only after save
         if user.role == User.Roles.TEACHER:
-            from django.contrib.auth.models import Group
-
-            teacher_group, _ = Group.objects.get_or_create(name="Teacher Admin")
-            user.groups.add(teacher_group)
+            user.groups.add(teacher_group_id())
 
         messages.success(
             self.request,
@@ -118,13 +133,23 @@ class RegisterView(AdminRequiredMixin, CreateView):
 # --------------------------
 # Password reset flow (centralised via PWD_RESET_TPLS)
 # --------------------------
-class PasswordResetStartView(PasswordResetView):
+class PasswordResetStartView(ThrottledFormMixin, PasswordResetView):
+    # Every submission costs a lookup and possibly an email, so every one counts
+    throttle_names = ("reset_ip", "reset_account")
+    account_field = "email"
     template_name = PWD_RESET_TPLS["form"]
     email_template_name = PWD_RESET_TPLS["email_txt"]
     subject_template_name = PWD_RESET_TPLS["subject"]
     html_email_template_name = PWD_RESET_TPLS.get("email_html")
+    token_generator = default_token_generator  # aware of deferred last_login writes
     success_url = reverse_lazy("users:password_reset_done")
 
+    def post(self, request, *args, **kwargs):
+        response = super().post(request, *args, **kwargs)
+        if response.status_code != 429:
+            self.count_attempt()
+        return response
+
 
 class PasswordResetDoneView(PasswordResetDoneView):
     template_name = PWD_RESET_TPLS["done"]
@@ -132,6 +157,7 @@ class PasswordResetDoneView(PasswordResetDoneView):
 
 class PasswordResetConfirmView(PasswordResetConfirmView):
     template_name = PWD_RESET_TPLS["confirm"]
+    token_generator = default_token_generator
     success_url = reverse_lazy("users:password_reset_complete")
 
 